@@ -1,7 +1,11 @@
+import os
+import sys
+import json
+import time
 import typer
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from rich.console import Console
 from rich.logging import RichHandler
 from rich.table import Table
@@ -9,13 +13,19 @@ from rich.tree import Tree
 from prompt_toolkit import prompt as pt_prompt
 from prompt_toolkit.completion import WordCompleter, PathCompleter
 from .core import HPMCore
+from .daemon import DaemonClient, RegistryDaemon
+from .matrix import matrix_report
+from .payload import CODECS, read_payload
+from .wheelhouse import parse_age, parse_size
+from .models import ManifestHeader, RegistryGroup
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(message)s",
     datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True)]
+    # Logs go to stderr so commands can write lock files and JSON to stdout
+    handlers=[RichHandler(rich_tracebacks=True, console=Console(stderr=True))]
 )
 
 logger = logging.getLogger("hpm")
@@ -111,21 +121,51 @@ def init(
 def install(
     manifest: Path = typer.Option(Path("hpm.yaml"), help="Path to hpm.yaml"),
     mode: str = typer.Option("prod", help="Run mode (prod or dev)"),
+    reinstall: bool = typer.Option(False, "--reinstall", help="Redo editable installs even if their metadata is unchanged"),
 ):
     """Installs a plugin and its dependencies."""
     hpm = HPMCore()
     try:
-        hpm.install_plugin(manifest, mode=mode)
+        hpm.install_plugin(manifest, mode=mode, reinstall=reinstall)
         console.print(f"[green]Successfully installed plugin from {manifest}[/green]")
     except Exception as e:
         console.print(f"[red]Error during installation: {e}[/red]")
         raise typer.Exit(code=1)
 
+@app.command()
+def lock(
+    plugins: List[str] = typer.Option(..., "--plugins", "-p", help="Registry plugins to lock (repeatable or comma-separated)"),
+    mode: str = typer.Option("prod", "--mode", help="Source mode (prod or dev)"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write uv.lock here instead of stdout"),
+    payload: bool = typer.Option(False, "--payload", help="Emit a compressed, checksummed base64 payload for HPM_LOCK_B64"),
+    codec: Optional[str] = typer.Option(None, "--codec", help=f"Payload compression: {', '.join(CODECS)} (default: zstd if available)"),
+    refresh: bool = typer.Option(False, "--refresh", help="Re-resolve even if the lock is cached"),
+    registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
+):
+    """Generates the uv.lock for a set of registry plugins."""
+    hpm = HPMCore(registry_path=registry)
+    names = [name.strip() for value in plugins for name in value.split(",") if name.strip()]
+    try:
+        if payload:
+            content = (hpm.generate_lock_payload(names, mode=mode, codec=codec, refresh=refresh) + "\n").encode()
+        else:
+            content = hpm.generate_lock(names, mode=mode, refresh=refresh)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    if output is None:
+        sys.stdout.buffer.write(content)
+        sys.stdout.flush()
+    else:
+        output.write_bytes(content)
+        console.print(f"[green]{'Lock payload' if payload else 'Lock'} written to {output}[/green]")
+
 @app.command(name="group")
 def group_cmd(
     action: str = typer.Argument(..., help="Action to perform: add"),
     group_name: str = typer.Argument(..., help="Name of the group"),
-    option: str = typer.Option(..., "--option", "-o", help="Option to add to the group"),
+    option: Optional[str] = typer.Option(None, "--option", "-o", help="Option to add to the group (optional for meta-groups)"),
     registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
 ):
     """Manages package groups."""
@@ -133,7 +173,10 @@ def group_cmd(
     try:
         if action == "add":
             hpm.add_group_option(group_name, option)
-            console.print(f"[green]Successfully added option '{option}' to group '{group_name}'[/green]")
+            if option is None:
+                console.print(f"[green]Successfully added meta-group '{group_name}'[/green]")
+            else:
+                console.print(f"[green]Successfully added option '{option}' to group '{group_name}'[/green]")
         else:
             console.print(f"[red]Unknown action: {action}[/red]")
             raise typer.Exit(code=1)
@@ -141,19 +184,90 @@ def group_cmd(
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(code=1)
 
+def _check_matrix(
+    hpm: HPMCore,
+    groups: Optional[List[str]],
+    pins: Optional[List[str]],
+    sample: Optional[int],
+    seed: Optional[int],
+    jobs: Optional[int],
+    output: Optional[Path],
+    tmpfs: bool,
+    refresh: bool,
+):
+    try:
+        pinned = {}
+        for pin in pins or []:
+            group_name, sep, option = pin.partition("=")
+            if not sep or not group_name or not option:
+                raise ValueError(f"Invalid pin '{pin}', expected group=option")
+            pinned[group_name] = option
+        entries = hpm.check_matrix(
+            groups=groups, pins=pinned, sample=sample, seed=seed, jobs=jobs, tmpfs=tmpfs, refresh=refresh
+        )
+    except Exception as e:
+        console.print(f"[red]Check failed: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    report = matrix_report(entries)
+    if output is not None:
+        text = json.dumps(report, indent=2) + "\n"
+        if str(output) == "-":
+            typer.echo(text, nl=False)
+            return
+        output.write_text(text)
+        console.print(f"[green]Compatibility matrix written to {output}[/green]")
+
+    passed = sum(entry.ok for entry in entries)
+    table = Table(title=f"Compatibility Matrix ({passed}/{len(entries)} resolvable)")
+    for group_name in report["groups"]:
+        table.add_column(group_name, style="cyan")
+    table.add_column("Result")
+    for entry in entries:
+        if entry.ok:
+            result = "[green]ok[/green]"
+        else:
+            # Combinations rejected before uv (unknown options, registry rules) have no key
+            result = "[red]conflict[/red]" if entry.key else "[red]rejected[/red]"
+        if entry.cached:
+            result += " [dim](cached)[/dim]"
+        table.add_row(*[entry.options.get(g, "") for g in report["groups"]], result)
+    console.print(table)
+
 @app.command()
 def check(
+    matrix: bool = typer.Option(False, "--matrix", help="Check every option combination across groups"),
+    groups: Optional[List[str]] = typer.Option(None, "--group", "-g", help="Group to include in the matrix (repeatable; default: all)"),
+    pins: Optional[List[str]] = typer.Option(None, "--pin", help="Fix a group to one option in the matrix, as group=option (repeatable)"),
+    sample: Optional[int] = typer.Option(None, "--sample", help="Check a random sample of this many combinations"),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Random seed for --sample"),
+    jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Parallel uv lock processes (default: CPU count)"),
+    output: Optional[Path] = typer.Option(None, "--output", "-O", help="Write the matrix as JSON to this file ('-' for stdout)"),
+    tmpfs: bool = typer.Option(False, "--tmpfs", help="Run the throwaway resolution on tmpfs (/dev/shm)"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached check results"),
     registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
 ):
     """Validates dependency resolution for configured groups."""
     hpm = HPMCore(registry_path=registry)
+    if matrix:
+        _check_matrix(hpm, groups, pins, sample, seed, jobs, output, tmpfs, refresh)
+        return
     try:
-        hpm.check()
-        console.print("[green]Check passed: Dependencies are resolvable[/green]")
+        result = hpm.check(tmpfs=tmpfs, refresh=refresh)
     except Exception as e:
         console.print(f"[red]Check failed: {e}[/red]")
         raise typer.Exit(code=1)
 
+    if result is None:
+        console.print("[yellow]No HPM groups configured[/yellow]")
+        return
+    suffix = " [dim](cached)[/dim]" if result.cached else ""
+    if not result.ok:
+        console.print(f"[red]Check failed: dependencies are not resolvable[/red]{suffix}")
+        console.print(result.output.rstrip(), markup=False, highlight=False)
+        raise typer.Exit(code=1)
+    console.print(f"[green]Check passed: Dependencies are resolvable[/green]{suffix}")
+
 @app.command()
 def list(
     registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
@@ -161,7 +275,11 @@ def list(
     """Lists all groups and current project configuration."""
     hpm = HPMCore(registry_path=registry)
     try:
-        groups = hpm.list_groups()
+        client = DaemonClient.for_core(hpm)
+        if client is not None:
+            groups = [RegistryGroup.model_validate(g) for g in client.request("list")]
+        else:
+            groups = hpm.list_groups()
         
         # Project config
         pyproject_path = hpm.project_root / "pyproject.toml"
@@ -188,26 +306,56 @@ def list(
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(code=1)
 
+def _show_group(group):
+    console.print(f"[bold blue]Group:[/bold blue] {group.name}")
+    console.print(f"[bold blue]Strategy:[/bold blue] {group.strategy}")
+    
+    table = Table(title="Available Options")
+    table.add_column("Option Name", style="cyan")
+    table.add_column("Description", style="magenta")
+    
+    for opt in group.options:
+        table.add_row(opt.name, opt.description or "")
+    
+    console.print(table)
+
+def _show_package(package, rdeps):
+    # Header fields only: the manifest body is never validated here
+    console.print(f"[bold blue]Package:[/bold blue] {package.name}")
+    console.print(f"[bold blue]Version:[/bold blue] {package.version}")
+    console.print(f"[bold blue]Type:[/bold blue] {package.type}")
+    if package.description:
+        console.print(f"[bold blue]Description:[/bold blue] {package.description}")
+    console.print(f"[bold blue]Offered by groups:[/bold blue] {', '.join(rdeps['groups']) or '-'}")
+    console.print(f"[bold blue]Required by:[/bold blue] {', '.join(rdeps['dependents']) or '-'}")
+
 @app.command()
 def show(
-    group_name: str = typer.Argument(..., help="Name of the group to show"),
+    group_name: str = typer.Argument(..., help="Name of the group or package to show"),
     registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
 ):
-    """Shows details for a specific group."""
+    """Shows details for a specific group or package."""
     hpm = HPMCore(registry_path=registry)
     try:
-        group = hpm.load_group(group_name)
-        console.print(f"[bold blue]Group:[/bold blue] {group.name}")
-        console.print(f"[bold blue]Strategy:[/bold blue] {group.strategy}")
-        
-        table = Table(title="Available Options")
-        table.add_column("Option Name", style="cyan")
-        table.add_column("Description", style="magenta")
-        
-        for opt in group.options:
-            table.add_row(opt.name, opt.description or "")
-        
-        console.print(table)
+        client = DaemonClient.for_core(hpm)
+        if client is not None:
+            result = client.request("show", name=group_name)
+            if "group" in result:
+                _show_group(RegistryGroup.model_validate(result["group"]))
+            else:
+                _show_package(ManifestHeader.model_validate(result["package"]), result["rdeps"])
+            return
+
+        group = hpm.find_group(group_name)
+        if group is not None:
+            _show_group(group)
+            return
+
+        package = hpm.find_package(group_name)
+        if package is None:
+            # Raises with "did you mean" suggestions
+            hpm.load_group(group_name)
+        _show_package(package, hpm.reverse_dependencies(group_name))
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(code=1)
@@ -220,7 +368,13 @@ def search(
     """Searches the registry for groups and packages."""
     hpm = HPMCore(registry_path=registry)
     try:
-        results = hpm.search_registry(query)
+        client = DaemonClient.for_core(hpm)
+        if client is not None:
+            results = client.request("search", query=query)
+            headers = {name: ManifestHeader.model_validate(h) for name, h in results.pop("headers").items()}
+        else:
+            results = hpm.search_registry(query)
+            headers = hpm.list_packages(results["packages"])
         
         if results["groups"]:
             console.print("[bold green]Found Groups:[/bold green]")
@@ -230,7 +384,12 @@ def search(
         if results["packages"]:
             console.print("[bold green]Found Packages:[/bold green]")
             for p in results["packages"]:
-                console.print(f"  - {p}")
+                pkg = headers.get(p)
+                if pkg is None:
+                    console.print(f"  - {p}")
+                else:
+                    description = f" - {pkg.description}" if pkg.description else ""
+                    console.print(f"  - {p} [dim]({pkg.version})[/dim]{description}")
         
         if not results["groups"] and not results["packages"]:
             console.print(f"[yellow]No results found for '{query}'[/yellow]")
@@ -238,6 +397,96 @@ def search(
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(code=1)
 
+@app.command()
+def rdeps(
+    name: str = typer.Argument(..., help="Package (or, with --entrypoint, entrypoint) name"),
+    entrypoint: bool = typer.Option(False, "--entrypoint", "-e", help="Find packages defining this entrypoint"),
+    registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
+):
+    """Shows which groups offer a package and which packages depend on it."""
+    hpm = HPMCore(registry_path=registry)
+    try:
+        client = DaemonClient.for_core(hpm)
+        if entrypoint:
+            if client is not None:
+                packages = client.request("rdeps", name=name, entrypoint=True)
+            else:
+                packages = hpm.packages_with_entrypoint(name)
+            if not packages:
+                console.print(f"[yellow]No packages define entrypoint '{name}'[/yellow]")
+            for p in packages:
+                console.print(f"  - {p}")
+            return
+
+        if client is not None:
+            result = client.request("rdeps", name=name)
+        else:
+            result = hpm.reverse_dependencies(name)
+
+        tree = Tree(f"[bold blue]{name}[/bold blue]")
+        groups_node = tree.add("Offered by groups")
+        for g in result["groups"]:
+            groups_node.add(g)
+        dependents_node = tree.add("Required by")
+        for p in result["dependents"]:
+            dependents_node.add(p)
+        console.print(tree)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+
+@app.command()
+def resolve(
+    package: str = typer.Argument(..., help="Registry package (group option) to resolve"),
+    mode: str = typer.Option("prod", help="Source mode (prod or dev)"),
+    as_json: bool = typer.Option(False, "--json", help="Print a JSON object (package, mode, requirement)"),
+    registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
+):
+    """Prints the uv requirement a registry package resolves to."""
+    hpm = HPMCore(registry_path=registry)
+    try:
+        client = DaemonClient.for_core(hpm)
+        if client is not None:
+            requirement = client.request("resolve", name=package, mode=mode)
+        else:
+            requirement = hpm.resolve_option(package, mode=mode)
+        if requirement is None:
+            console.print(f"[red]Error: package '{package}' has no usable '{mode}' source[/red]")
+            raise typer.Exit(code=1)
+        if as_json:
+            typer.echo(json.dumps({"package": package, "mode": mode, "requirement": requirement}))
+        else:
+            # Requirements are data: no markup ("pkg[extra]"), highlighting or wrapping
+            console.print(requirement, markup=False, highlight=False, soft_wrap=True)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+
+@app.command()
+def daemon(
+    stop: bool = typer.Option(False, "--stop", help="Stop the running daemon"),
+    registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
+):
+    """Runs a registry daemon that serves list/show/search/resolve over a unix socket."""
+    hpm = HPMCore(registry_path=registry)
+    try:
+        if stop:
+            client = DaemonClient.for_core(hpm)
+            if client is None:
+                console.print("[yellow]No hpm daemon is running[/yellow]")
+                return
+            client.request("shutdown")
+            console.print("[green]hpm daemon stopped[/green]")
+            return
+        RegistryDaemon(hpm).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+
 registry_app = typer.Typer(help="Manage the HPM registry")
 app.add_typer(registry_app, name="registry")
 
@@ -287,31 +536,198 @@ def registry_add(
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(code=1)
 
+@registry_app.command(name="validate")
+def registry_validate(
+    registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
+):
+    """Validates manifests, group option references, names and local source paths."""
+    hpm = HPMCore(registry_path=registry)
+    try:
+        issues = hpm.validate_registry()
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    if not issues:
+        console.print("[green]Registry is valid[/green]")
+        return
+
+    table = Table(title=f"Registry Issues ({len(issues)})")
+    table.add_column("File", style="cyan")
+    table.add_column("Issue", style="red")
+    for issue in issues:
+        table.add_row(issue.file, issue.message)
+    console.print(table)
+    raise typer.Exit(code=1)
+
+@registry_app.command(name="pack")
+def registry_pack(
+    prune: bool = typer.Option(False, "--prune", help="Remove loose YAML files after packing"),
+    registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
+):
+    """Compiles the registry into a single packed file for fast lookups."""
+    hpm = HPMCore(registry_path=registry)
+    try:
+        pack_path = hpm.pack_registry(prune=prune)
+        console.print(f"[green]Registry packed into {pack_path}[/green]")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+
+wheels_app = typer.Typer(help="Manage the wheel caches (.hpm/wheels and the shared git wheelhouse)")
+app.add_typer(wheels_app, name="wheels")
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "K", "M", "G"):
+        if size < 1024 or unit == "G":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+def _format_age(seconds: float) -> str:
+    for unit, length in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= length:
+            return f"{seconds / length:.0f}{unit}"
+    return f"{seconds:.0f}s"
+
+def _wheels_table(title: str, entries) -> Table:
+    now = time.time()
+    table = Table(title=title)
+    table.add_column("Wheel", style="cyan")
+    table.add_column("Source", style="dim")
+    table.add_column("Size", justify="right")
+    table.add_column("Last used", justify="right")
+    for entry in entries:
+        table.add_row(entry.wheel, entry.source, _format_size(entry.size), f"{_format_age(now - entry.last_used)} ago")
+    return table
+
+@wheels_app.command(name="list")
+def wheels_list(
+    shared: bool = typer.Option(False, "--shared", help="Show the shared wheelhouse of git sources instead"),
+    registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
+):
+    """Lists cached wheels, most recently used first."""
+    hpm = HPMCore(registry_path=registry)
+    try:
+        entries = hpm.list_wheels(shared=shared)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    if not entries:
+        console.print("[yellow]Wheel cache is empty[/yellow]")
+        return
+    total = _format_size(sum(entry.size for entry in entries))
+    console.print(_wheels_table(f"Cached Wheels ({len(entries)}, {total})", entries))
+
+@wheels_app.command(name="evict")
+def wheels_evict(
+    older_than: Optional[str] = typer.Option(None, "--older-than", help="Evict wheels unused for this long (e.g. 12h, 30d, 2w)"),
+    max_size: Optional[str] = typer.Option(None, "--max-size", help="Then evict least recently used wheels until the cache fits (e.g. 500M, 2G)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what would be evicted without removing anything"),
+    shared: bool = typer.Option(False, "--shared", help="Evict from the shared wheelhouse of git sources instead"),
+    registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
+):
+    """Evicts cached wheels by age and total size."""
+    if older_than is None and max_size is None:
+        console.print("[red]Error: specify --older-than and/or --max-size[/red]")
+        raise typer.Exit(code=1)
+    hpm = HPMCore(registry_path=registry)
+    try:
+        evicted = hpm.evict_wheels(
+            max_age=parse_age(older_than) if older_than else None,
+            max_size=parse_size(max_size) if max_size else None,
+            dry_run=dry_run,
+            shared=shared,
+        )
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    if not evicted:
+        console.print("[green]Nothing to evict[/green]")
+        return
+    verb = "Would evict" if dry_run else "Evicted"
+    total = _format_size(sum(entry.size for entry in evicted))
+    console.print(_wheels_table(f"{verb} {len(evicted)} wheels ({total})", evicted))
+
 @app.command()
 def sync(
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the sync plan without running uv"),
+    force: bool = typer.Option(False, "--force", help="Ignore the sync fingerprint and re-plan from the registry"),
+    refresh: bool = typer.Option(False, "--refresh", help="Re-resolve git branches and tags to their current commits"),
     registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Path to the registry"),
 ):
     """Syncs configured groups with uv dependencies."""
     hpm = HPMCore(registry_path=registry)
     try:
-        hpm.sync()
-        console.print("[green]Successfully synced groups[/green]")
+        plan = hpm.sync(dry_run=dry_run, force=force, refresh=refresh)
+        if dry_run:
+            if plan.is_noop:
+                console.print("[green]Nothing to do[/green]")
+            for name in plan.removals:
+                console.print(f"[red]- {name}[/red]")
+            for name, requirement in plan.additions.items():
+                console.print(f"[green]+ {name}[/green] [dim]{requirement}[/dim]")
+        else:
+            console.print("[green]Successfully synced groups[/green]")
     except Exception as e:
         console.print(f"[red]Error during sync: {e}[/red]")
         raise typer.Exit(code=1)
 
+def _in_container() -> bool:
+    """True when running inside a Docker/Podman container (or HPM_RUN_EXEC=1 says so)."""
+    override = os.getenv("HPM_RUN_EXEC")
+    if override is not None:
+        return override == "1"
+    return os.getpid() == 1 or Path("/.dockerenv").exists() or Path("/run/.containerenv").exists()
+
 @app.command()
 def run(
     manifest: Path = typer.Option(Path("hpm.yaml"), help="Path to hpm.yaml"),
     entrypoint: str = typer.Option(..., "--entrypoint", "-e", help="Entrypoint name to run"),
+    exec_mode: Optional[bool] = typer.Option(
+        None, "--exec/--no-exec", help="Replace hpm with the entrypoint process (default: on in containers)"
+    ),
 ):
     """Runs a plugin entrypoint."""
     hpm = HPMCore()
     try:
-        hpm.run_entrypoint(manifest, entrypoint)
+        hpm.run_entrypoint(manifest, entrypoint, exec_mode=_in_container() if exec_mode is None else exec_mode)
     except Exception as e:
         console.print(f"[red]Error running entrypoint: {e}[/red]")
         raise typer.Exit(code=1)
 
+@app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
+def bootstrap(
+    ctx: typer.Context,
+    file: Optional[Path] = typer.Option(None, "--file", "-f", help="Lock payload file, raw or base64 (default: $HPM_LOCK_B64)"),
+    entrypoint: Optional[str] = typer.Option(None, "--entrypoint", "-e", help="Manifest entrypoint to exec afterwards"),
+    manifest: Path = typer.Option(Path("hpm.yaml"), help="Path to hpm.yaml"),
+    force: bool = typer.Option(False, "--force", help="Overwrite the project's own pyproject.toml and uv.lock"),
+):
+    """Restores the environment from a lock payload, then execs an entrypoint (or the command after --)."""
+    started = time.perf_counter()
+    hpm = HPMCore()
+    try:
+        if file is not None:
+            raw = file.read_bytes()
+        else:
+            raw = os.environ.get("HPM_LOCK_B64", "").encode()
+            if not raw:
+                raise ValueError("No lock payload: set HPM_LOCK_B64 or pass --file")
+        skipped = hpm.bootstrap(read_payload(raw), force=force)
+
+        command = hpm.resolve_command(ctx.args) if ctx.args else []
+        if entrypoint is not None:
+            command = hpm.entrypoint_command(manifest, entrypoint)
+    except Exception as e:
+        console.print(f"[red]Bootstrap failed: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Environment ready in {elapsed_ms:.0f} ms ({'warm, sync skipped' if skipped else 'cold'})")
+    if command:
+        hpm.exec_command(command)
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
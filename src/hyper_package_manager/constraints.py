@@ -0,0 +1,57 @@
+from typing import Dict, List, Mapping, Optional, Union
+from .models import GroupOption, LazyManifest, Manifest, RegistryGroup, normalize_name
+
+
+class ConstraintError(ValueError):
+    """Raised when a group selection breaks declared `conflicts`/`requires` rules."""
+
+    def __init__(self, violations: List[str]):
+        self.violations = violations
+        super().__init__("Selection violates registry rules: " + "; ".join(violations))
+
+
+def check_constraints(
+    selection: Mapping[str, List[str]],
+    groups: Mapping[str, RegistryGroup],
+    manifests: Mapping[str, Union[Manifest, LazyManifest]],
+    packages: Optional[List[str]] = None,
+) -> List[str]:
+    """Returns the rule violations of an effective group -> options selection.
+
+    `packages` is what the selection installs (options plus their HPM
+    dependencies; the options alone if omitted): a rule is satisfied or
+    broken by anything installed, not only by what was selected. Rules come
+    from the selected GroupOption entries and from the manifests of every
+    installed package; names are compared PEP 503-normalized.
+    """
+    if packages is None:
+        packages = [opt for options in selection.values() for opt in options]
+    installed: Dict[str, str] = {}
+    for name in packages:
+        installed.setdefault(normalize_name(name), name)
+
+    # (package, origin, rule holder), group rules first
+    rules = []
+    for group_name, options in selection.items():
+        group = groups.get(group_name)
+        group_options: Dict[str, GroupOption] = {opt.name: opt for opt in group.options} if group else {}
+        rules.extend((opt_name, f"group '{group_name}'", group_options[opt_name]) for opt_name in options if opt_name in group_options)
+    for name in installed.values():
+        manifest = manifests.get(name)
+        if manifest is not None:
+            rules.append((name, f"manifest '{manifest.name}'", manifest))
+
+    violations: Dict[str, None] = {}
+    reported_pairs = set()
+    for name, origin, rule in rules:
+        key = normalize_name(name)
+        for other in rule.conflicts:
+            other_key = normalize_name(other)
+            pair = frozenset((key, other_key))
+            if other_key in installed and other_key != key and pair not in reported_pairs:
+                reported_pairs.add(pair)
+                violations[f"'{name}' conflicts with '{installed[other_key]}' (declared by {origin})"] = None
+        for required in rule.requires:
+            if normalize_name(required) not in installed:
+                violations[f"'{name}' requires '{required}', which is not installed (declared by {origin})"] = None
+    return list(violations)
@@ -1,4 +1,10 @@
+import os
+import json
 import yaml
+import shlex
+import subprocess
+import base64
+import hashlib
 import logging
 try:
     import tomllib
@@ -6,12 +12,31 @@ except ImportError:
     import tomli as tomllib
 import tomli_w
 from pathlib import Path
-from typing import List, Dict, Optional
-from .models import Manifest, Source, RegistryGroup
-from .uv_manager import UVManager
+from urllib.parse import parse_qs
+from typing import List, Dict, Optional, Set, Tuple
+from .models import CheckResult, InstallTarget, LazyManifest, Manifest, MatrixEntry, Source, RegistryGroup, SyncPlan, WheelEntry, normalize_name
+from .uv_manager import UVManager, project_venv
+from .registry_index import RegistryIndex, model_header
+from .pack import PACK_FILE, write_pack
+from .validation import RegistryValidator, ValidationIssue
+from .search_index import SearchIndex
+from .groups import expand_includes
+from .sync_state import SyncState
+from .dry_run import DryRunResolver, absolute_requirement, lock_requirements, scratch_root
+from .lock import LockCache
+from .payload import ENV_PROJECT_NAME, PAYLOAD_FILES, decode_payload, default_codec, encode_payload, payload_digest
+from .matrix import enumerate_combinations
+from .constraints import ConstraintError, check_constraints
+from .resolver import DependencyResolver, ResolutionError, hpm_dependencies
+from .git_mirror import SHA_RE, GitMirrorStore, GitPins, lock_git_sources, split_git_requirement
+from .wheelhouse import Wheelhouse, interpreter_tag
+from .editable import EditableInstalls
+from . import fuzzy
 
 logger = logging.getLogger(__name__)
 
+VENV_BIN = "Scripts" if os.name == "nt" else "bin"
+
 class HPMCore:
     """Core logic for HyperPackageManager."""
 
@@ -27,16 +52,71 @@ class HPMCore:
         if not self.registry_path:
             self.registry_path = self.project_root / "registry"
 
-    def _get_registry_path_from_config(self) -> Optional[Path]:
+        self.cache_dir = self.project_root / ".hpm" / "cache"
+        self.index = RegistryIndex(self.registry_path, self.cache_dir)
+        self.search_index = SearchIndex(self.cache_dir)
+        self.git_pins = GitPins(self.project_root / ".hpm" / "state")
+        self.wheelhouse = Wheelhouse(self.project_root / ".hpm" / "wheels", self._build_wheel)
+        self._wheel_tag: Optional[str] = None
+        self._git_mirrors: Optional[GitMirrorStore] = None
+        self._git_wheelhouse: Optional[Wheelhouse] = None
+
+    def _get_config_value(self, key: str) -> Optional[str]:
         pyproject_path = self.project_root / "pyproject.toml"
         if pyproject_path.exists():
             with open(pyproject_path, "rb") as f:
                 config = tomllib.load(f)
-            path_str = config.get("tool", {}).get("hpm", {}).get("registry")
-            if path_str:
-                return self.project_root / path_str
+            return config.get("tool", {}).get("hpm", {}).get(key)
+        return None
+
+    def _get_registry_path_from_config(self) -> Optional[Path]:
+        path_str = self._get_config_value("registry")
+        if path_str:
+            return self.project_root / path_str
         return None
 
+    def _shared_cache_dir(self, env_var: str, config_key: str, name: str) -> Path:
+        """A cache that may be shared between projects: $<env_var>, [tool.hpm] <config_key>, or the per-user cache directory."""
+        path_str = os.environ.get(env_var) or self._get_config_value(config_key)
+        if path_str:
+            return self.project_root / Path(path_str).expanduser()
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(cache_home) / "hpm" / name
+
+    @property
+    def git_mirrors(self) -> GitMirrorStore:
+        if self._git_mirrors is None:
+            self._git_mirrors = GitMirrorStore(self._shared_cache_dir("HPM_GIT_CACHE", "git-cache", "git"))
+        return self._git_mirrors
+
+    @property
+    def git_wheelhouse(self) -> Wheelhouse:
+        """Wheels of git sources; point HPM_WHEELHOUSE at a shared (e.g. NFS) directory to share builds."""
+        if self._git_wheelhouse is None:
+            root = self._shared_cache_dir("HPM_WHEELHOUSE", "wheelhouse", "wheels")
+            self._git_wheelhouse = Wheelhouse(root, self._build_wheel)
+        return self._git_wheelhouse
+
+    def _target_python(self) -> Optional[Path]:
+        """The project environment's interpreter, if the environment exists."""
+        python = self.venv_dir() / VENV_BIN / ("python.exe" if os.name == "nt" else "python")
+        return python if python.exists() else None
+
+    def wheel_tag(self) -> str:
+        """Interpreter tag of the environment wheels are installed into (the running one if there is no venv)."""
+        if self._wheel_tag is None:
+            python = self._target_python()
+            try:
+                self._wheel_tag = interpreter_tag(python)
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.debug(f"Could not query {python}, using the running interpreter's tag: {e}")
+                self._wheel_tag = interpreter_tag()
+        return self._wheel_tag
+
+    def _build_wheel(self, source_dir: Path, out_dir: Path):
+        # Build for the interpreter the wheel is keyed (and installed) for
+        self.uv.build_wheel(source_dir, out_dir, python=self._target_python())
+
     def init_project(self, name: Optional[str] = None, version: Optional[str] = None, description: Optional[str] = None, python_version: Optional[str] = None, registry_dir: str = "hpm-registry"):
         """Initializes a new project with HPM support."""
         pyproject_path = self.project_root / "pyproject.toml"
@@ -120,51 +200,88 @@ class HPMCore:
         
         logger.info(f"HPM project '{name}' initialized successfully.")
 
+    def find_group(self, group_name: str) -> Optional[RegistryGroup]:
+        """Returns a group definition from the registry, or None if it does not exist."""
+        return self.index.get("groups", group_name)
+
     def load_group(self, group_name: str) -> RegistryGroup:
         """Loads a group definition from the registry."""
-        group_file = self.registry_path / "groups" / f"{group_name}.yaml"
-        if not group_file.exists():
-            raise FileNotFoundError(f"Group definition not found: {group_file}")
-        
-        with open(group_file, "r") as f:
-            data = yaml.safe_load(f)
-        
-        return RegistryGroup(**data)
+        group = self.find_group(group_name)
+        if group is None:
+            group_file = self.registry_path / "groups" / f"{group_name}.yaml"
+            message = f"Group definition not found: {group_file}"
+            suggestions = self.suggest_names(group_name, kind="groups")
+            if suggestions:
+                message += f". Did you mean: {', '.join(suggestions)}?"
+            raise FileNotFoundError(message)
+        return group
+
+    def load_all_groups(self) -> Dict[str, RegistryGroup]:
+        """Loads every group in the registry, keyed by registry name."""
+        return self.index.all("groups")
+
+    def load_all_manifests(self, names: Optional[List[str]] = None) -> Dict[str, Manifest]:
+        """Loads every package manifest in the registry (or only `names`), keyed by registry name."""
+        if names is not None:
+            return self.index.get_many("packages", names)
+        return self.index.all("packages")
+
+    def list_packages(self, names: Optional[List[str]] = None) -> Dict[str, LazyManifest]:
+        """Returns header-only views of registry packages for listing and display."""
+        return self.index.lazy_manifests(names)
+
+    def find_package(self, name: str) -> Optional[LazyManifest]:
+        """Returns a header-only view of a registry package, or None if it does not exist."""
+        return self.list_packages([name]).get(name)
 
     def list_groups(self) -> List[RegistryGroup]:
         """Lists all groups in the registry."""
-        groups_dir = self.registry_path / "groups"
-        if not groups_dir.exists():
-            return []
-        
-        groups = []
-        for f in groups_dir.glob("*.yaml"):
-            with open(f, "r") as file:
-                data = yaml.safe_load(file)
-                groups.append(RegistryGroup(**data))
-        return groups
+        return list(self.load_all_groups().values())
 
-    def search_registry(self, query: str) -> Dict[str, List[str]]:
-        """Searches for groups and packages in the registry."""
-        results = {"groups": [], "packages": []}
-        query = query.lower()
+    def update_search_index(self):
+        """Brings the search index in line with the registry files."""
+        for kind in ("groups", "packages"):
+            self.search_index.update(kind, self.index.digests(kind), lambda names, kind=kind: self.index.get_many(kind, names))
 
-        # Search groups
-        groups_dir = self.registry_path / "groups"
-        if groups_dir.exists():
-            for f in groups_dir.glob("*.yaml"):
-                if query in f.stem.lower():
-                    results["groups"].append(f.stem)
+    def search_registry(self, query: str, limit: int = 50, refresh: bool = True) -> Dict[str, List[str]]:
+        """Searches groups and packages in the registry, best matches first.
 
-        # Search packages
-        packages_dir = self.registry_path / "packages"
-        if packages_dir.exists():
-            for f in packages_dir.glob("*.yaml"):
-                if query in f.stem.lower():
-                    results["packages"].append(f.stem)
-        
+        Full-text matches come first, followed by typo-tolerant name matches.
+        refresh=False skips re-checking registry files (used by the daemon,
+        which is notified of changes instead).
+        """
+        if refresh:
+            self.update_search_index()
+        results = self.search_index.search(query, limit=limit)
+        for kind, name, _ in self.search_index.fuzzy_search(query, limit=limit):
+            if name not in results[kind]:
+                results[kind].append(name)
         return results
 
+    def reverse_dependencies(self, package_name: str, refresh: bool = True) -> Dict[str, List[str]]:
+        """Returns the groups offering a package and the packages depending on it."""
+        if refresh:
+            self.update_search_index()
+        return {
+            "groups": self.search_index.referrers("option", package_name),
+            "dependents": self.search_index.referrers("depends", package_name),
+        }
+
+    def packages_with_entrypoint(self, entrypoint_name: str, refresh: bool = True) -> List[str]:
+        """Returns the packages that define an entrypoint with the given name."""
+        if refresh:
+            self.update_search_index()
+        return self.search_index.referrers("entrypoint", entrypoint_name)
+
+    def suggest_names(self, name: str, kind: Optional[str] = None, limit: int = 5) -> List[str]:
+        """Returns registry names that closely resemble a possibly misspelled name."""
+        self.update_search_index()
+        suggestions: List[str] = []
+        for _, _, matched in self.search_index.fuzzy_search(name, kind=kind, limit=limit):
+            if matched not in suggestions:
+                suggestions.append(matched)
+        return suggestions
+
     def add_package_to_registry(self, name: str, source_type: str, url_or_path: str, version: str = "0.1.0"):
         """Adds a package manifest to the registry."""
         packages_dir = self.registry_path / "packages"
@@ -191,6 +308,37 @@ class HPMCore:
         
         logger.info(f"Package '{name}' added to registry at {manifest_file}")
 
+    def pack_registry(self, prune: bool = False) -> Path:
+        """Compiles the registry (pack plus loose files) into a single packed file.
+
+        With prune=True the loose YAML files that went into the pack are removed.
+        """
+        records = []
+        loose = []
+        for kind in ("groups", "packages"):
+            models = self.index.all(kind)
+            digests = self.index.digests(kind)
+            for name, model in models.items():
+                data = model.model_dump(mode="json")
+                records.append((kind, name, digests[name], model_header(kind, data), data))
+                if (self.registry_path / kind / f"{name}.yaml").exists():
+                    loose.append((kind, name))
+
+        pack_path = self.registry_path / PACK_FILE
+        # Kept loose files stay authoritative: deleting one removes the entry
+        count = write_pack(pack_path, records, loose=[] if prune else loose)
+        logger.info(f"Packed {count} registry entries into {pack_path}")
+
+        if prune:
+            for kind, name in loose:
+                (self.registry_path / kind / f"{name}.yaml").unlink()
+            logger.info(f"Removed {len(loose)} loose registry files")
+        return pack_path
+
+    def validate_registry(self) -> List[ValidationIssue]:
+        """Checks registry integrity; only files changed since the last run are re-validated."""
+        return RegistryValidator(self.registry_path, self.cache_dir, self.index.loader).validate()
+
     def load_manifest(self, path: Path) -> Manifest:
         """Loads and parses an hpm.yaml manifest."""
         if not path.exists():
@@ -201,13 +349,23 @@ class HPMCore:
         
         return Manifest(**data)
 
-    def add_group_option(self, group_name: str, option_name: str):
-        """Adds a group option to the project configuration in pyproject.toml."""
+    def add_group_option(self, group_name: str, option_name: Optional[str] = None):
+        """Adds a group option to the project configuration in pyproject.toml.
+
+        Meta-groups may be added without an option; their includes are then
+        expanded at sync time.
+        """
         group = self.load_group(group_name)
         
         # Validate option
         valid_options = [opt.name for opt in group.options]
-        if option_name not in valid_options:
+        if option_name is None:
+            if not group.includes:
+                raise ValueError(f"Group '{group_name}' is not a meta-group; an option is required. Valid options: {valid_options}")
+        elif option_name not in valid_options:
+            suggestions = fuzzy.closest(option_name, valid_options)
+            if suggestions:
+                raise ValueError(f"Invalid option '{option_name}' for group '{group_name}'. Did you mean: {', '.join(suggestions)}?")
             raise ValueError(f"Invalid option '{option_name}' for group '{group_name}'. Valid options: {valid_options}")
 
         pyproject_path = self.project_root / "pyproject.toml"
@@ -225,7 +383,9 @@ class HPMCore:
         if "groups" not in config["tool"]["hpm"]:
             config["tool"]["hpm"]["groups"] = {}
 
-        if group.strategy == "1-of-N":
+        if option_name is None:
+            config["tool"]["hpm"]["groups"].setdefault(group_name, [])
+        elif group.strategy == "1-of-N":
             config["tool"]["hpm"]["groups"][group_name] = option_name
         else:
             current = config["tool"]["hpm"]["groups"].get(group_name, [])
@@ -235,88 +395,729 @@ class HPMCore:
                 current.append(option_name)
             config["tool"]["hpm"]["groups"][group_name] = current
 
+        # Reject known-bad combinations before they reach pyproject.toml
+        self.check_selection(self.resolve_selection(config["tool"]["hpm"]["groups"]))
+
         with open(pyproject_path, "wb") as f:
             tomli_w.dump(config, f)
         
-        logger.info(f"Added option '{option_name}' to group '{group_name}' in pyproject.toml")
+        if option_name is None:
+            logger.info(f"Added meta-group '{group_name}' to pyproject.toml")
+        else:
+            logger.info(f"Added option '{option_name}' to group '{group_name}' in pyproject.toml")
 
-    def check(self):
-        """Validates if current group configuration is resolvable using uv lock --dry-run."""
-        pyproject_path = self.project_root / "pyproject.toml"
-        if not pyproject_path.exists():
-            raise FileNotFoundError(f"pyproject.toml not found at {pyproject_path}")
+    def _load_included_groups(self, roots: List[str]) -> Dict[str, RegistryGroup]:
+        """Loads `roots` and every group they (transitively) include, one layer at a time."""
+        groups: Dict[str, RegistryGroup] = {}
+        layer = list(dict.fromkeys(roots))
+        while layer:
+            loaded = self.index.get_many("groups", layer)
+            groups.update(loaded)
+            # Unknown includes are left out here and reported by expand_includes
+            layer = list(dict.fromkeys(
+                inc.group for group in loaded.values() for inc in group.includes if inc.group not in groups
+            ))
+        return groups
 
-        with open(pyproject_path, "rb") as f:
-            config = tomllib.load(f)
+    def expand_groups(self, roots: Optional[List[str]] = None) -> Dict[str, Dict[str, List[str]]]:
+        """Returns the options each group pulls in through meta-group includes.
 
-        hpm_config = config.get("tool", {}).get("hpm", {})
-        groups_config = hpm_config.get("groups", {})
+        Only `roots` (every group if None) and the groups they include are
+        loaded and expanded. Expansions are cached per group in .hpm/cache
+        for the registry version (the hashes of all group files), so a sync
+        of the same selection loads no group at all.
+        """
+        digests = self.index.digests("groups")
+        version = hashlib.sha256(json.dumps(sorted(digests.items())).encode()).hexdigest()
+        names = list(digests) if roots is None else [name for name in roots if name in digests]
+        cache_file = self.cache_dir / "group-expansion.json"
+        cached: Dict[str, Dict[str, List[str]]] = {}
+        try:
+            with open(cache_file, "r") as f:
+                data = json.load(f)
+            if data["version"] == version:
+                cached = data["expansions"]
+        except (OSError, ValueError, KeyError):
+            pass
+        missing = [name for name in names if name not in cached]
+        if not missing:
+            return {name: cached[name] for name in names}
+
+        groups = self.load_all_groups() if roots is None else self._load_included_groups(missing)
+        cached.update(expand_includes(groups))
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                f.write(json.dumps({"version": version, "expansions": cached}))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.debug(f"Could not write group expansion cache {cache_file}: {e}")
+        return {name: cached[name] for name in names}
+
+    def resolve_selection(self, groups_config: Dict) -> Dict[str, List[str]]:
+        """Turns [tool.hpm.groups] into the effective group -> options map.
+
+        Meta-group includes are expanded; groups configured explicitly keep
+        their configured options.
+        """
+        selected = {
+            group_name: [options] if isinstance(options, str) else list(options)
+            for group_name, options in groups_config.items()
+        }
+        expansions = self.expand_groups(list(selected))
+
+        effective = {group_name: list(options) for group_name, options in selected.items()}
+        for group_name in selected:
+            for target, options in expansions.get(group_name, {}).items():
+                if target in selected:
+                    continue
+                bucket = effective.setdefault(target, [])
+                bucket.extend(opt for opt in options if opt not in bucket)
+        return effective
+
+    def check_selection(self, selection: Dict[str, List[str]]) -> List[str]:
+        """Returns the install set of an effective selection (see _install_set).
+
+        Raises ConstraintError if it breaks registry conflicts/requires rules,
+        checked against everything installed, HPM dependencies included.
+        """
+        packages = self._install_set(selection)
+        groups = self.index.get_many("groups", list(selection))
+        violations = check_constraints(selection, groups, self.load_all_manifests(packages), packages)
+        if violations:
+            raise ConstraintError(violations)
+        return packages
+
+    def check(self, tmpfs: bool = False, refresh: bool = False) -> Optional[CheckResult]:
+        """Checks that the configured groups resolve, without touching the project.
+
+        The resolved group sources are locked in a throwaway project under
+        .hpm/tmp (or tmpfs); results are cached by a hash of the inputs.
+        Returns None when no groups are configured.
+        """
+        config = self._load_pyproject()
+        groups_config = config.get("tool", {}).get("hpm", {}).get("groups", {})
 
         if not groups_config:
             logger.info("No HPM groups to check")
-            return
+            return None
+
+        # Fails fast on cyclic or unknown meta-group includes and on rule violations
+        selection = self.resolve_selection(groups_config)
+        packages = self.check_selection(selection)
+        # Results are cached by requirement, so git refs must name the commit
+        # they point at now; a moved branch must not hit the old result
+        manifests = self.load_all_manifests(packages)
+        self.pin_git_sources([m.sources.prod for m in manifests.values() if m.sources.prod], mirror=False)
+        requirements = list(self._desired_requirements(packages).values())
 
         logger.info("Checking dependency resolution (Dry Run)...")
-        # uv lock --dry-run checks if dependencies can be resolved without changing the lockfile
-        # Note: In some uv versions it might be just 'uv lock' if it's already fast or 'uv sync --dry-run'
-        # According to ADR, we use 'uv lock' for validation.
-        self.uv.run_command(["uv", "lock"])
-        logger.info("Resolution check successful")
-
-    def sync(self):
-        """Materializes groups into uv dependencies."""
+        resolver = DryRunResolver(self.project_root, self.cache_dir, tmpfs=tmpfs)
+        result = resolver.check(requirements, config.get("project", {}).get("requires-python"), refresh=refresh)
+        if result.ok:
+            logger.info("Resolution check successful")
+        return result
+
+    def check_matrix(
+        self,
+        groups: Optional[List[str]] = None,
+        pins: Optional[Dict[str, str]] = None,
+        sample: Optional[int] = None,
+        seed: Optional[int] = None,
+        jobs: Optional[int] = None,
+        tmpfs: bool = False,
+        refresh: bool = False,
+    ) -> List[MatrixEntry]:
+        """Checks which option combinations across groups resolve.
+
+        Every combination picks one option per group (M-of-N groups are
+        tried one option at a time). `groups` defaults to every registry group
+        with options; `pins` fixes groups to a single option and `sample`
+        checks a random subset of the combinations. Combinations that break
+        registry conflicts/requires rules are rejected without running uv;
+        uncached ones are locked in isolation on up to `jobs` processes.
+        """
+        registry_groups = self.load_all_groups()
+        names = list(groups) if groups else sorted(name for name, group in registry_groups.items() if group.options)
+        names.extend(name for name in (pins or {}) if name not in names)
+
+        candidates = {}
+        for name in names:
+            group = registry_groups.get(name) or self.load_group(name)  # raises with suggestions
+            options = [opt.name for opt in group.options]
+            pinned = (pins or {}).get(name)
+            if pinned is not None:
+                if pinned not in options:
+                    raise ValueError(f"Option '{pinned}' not found in group '{name}'. Available: {options}")
+                options = [pinned]
+            candidates[name] = options
+
+        combinations = enumerate_combinations(candidates, sample=sample, seed=seed)
+        logger.info(f"Checking {len(combinations)} option combinations")
+
+        # Unknown options, registry rule violations and unsatisfiable HPM
+        # dependencies reject a combination without a uv resolution
+        dependency_resolver = self.dependency_resolver()
+        manifests: Dict[str, Manifest] = {}
+        rejections: List[Optional[str]] = []
+        accepted: List[List[str]] = []
+        for combination in combinations:
+            selection = {group_name: [opt] for group_name, opt in combination.items()}
+            try:
+                packages = self.resolve_dependencies([(opt, "*") for opt in combination.values()], dependency_resolver)
+            except ResolutionError as e:
+                rejections.append(str(e))
+                continue
+            manifests.update(self.load_all_manifests([name for name in packages if name not in manifests]))
+            violations = check_constraints(selection, registry_groups, manifests, packages)
+            if not violations:
+                accepted.append(packages)
+            rejections.append("\n".join(violations) or None)
+        # As in check(): requirements name the commits git refs point at now
+        self.pin_git_sources([m.sources.prod for m in manifests.values() if m.sources.prod], mirror=False)
+        requirement_sets = [list(self._desired_requirements(packages).values()) for packages in accepted]
+
+        try:
+            requires_python = self._load_pyproject().get("project", {}).get("requires-python")
+        except FileNotFoundError:
+            requires_python = None
+        resolver = DryRunResolver(self.project_root, self.cache_dir, tmpfs=tmpfs)
+        results = iter(resolver.check_many(requirement_sets, requires_python, refresh=refresh, jobs=jobs))
+
+        entries = []
+        for combination, rejection in zip(combinations, rejections):
+            if rejection is not None:
+                entries.append(MatrixEntry(options=combination, ok=False, output=rejection))
+                continue
+            result = next(results)
+            entries.append(
+                MatrixEntry(options=combination, ok=result.ok, output=result.output, key=result.key, cached=result.cached)
+            )
+        return entries
+
+    def _source_requirement(self, manifest_dir: Path, source: Source) -> Optional[str]:
+        """Builds the uv requirement string for a manifest source."""
+        if source.type == "local":
+            # Path relative to registry or absolute?
+            # Usually relative to the manifest file
+            return str(manifest_dir / source.path)
+        if source.type == "git":
+            git_url = f"git+{source.url}"
+            ref = self.git_pins.get(source.url, source.ref) or source.ref
+            if ref:
+                git_url += f"@{ref}"
+            if source.subdirectory:
+                git_url += f"#subdirectory={source.subdirectory.strip('/')}"
+            return git_url
+        return None
+
+    def pin_git_sources(self, sources: List[Source], mirror: bool = True, refresh: bool = True) -> bool:
+        """Resolves the refs of git sources to commit SHAs through the mirror store and records them.
+
+        Sources already pinned to a full SHA are skipped, and so are refs
+        with a recorded pin unless `refresh`. Refs of sources with a
+        subdirectory, or all refs if not `mirror`, are looked up with
+        `git ls-remote` instead, without fetching anything. Returns True if
+        any recorded pin changed.
+        """
+        refs = list(dict.fromkeys(
+            (source.url, source.ref, bool(source.subdirectory) or not mirror) for source in sources
+            if source.type == "git" and source.url and not (source.ref and SHA_RE.match(source.ref))
+            and (refresh or self.git_pins.get(source.url, source.ref) is None)
+        ))
+        if not refs:
+            return False
+        mirrors = self.git_mirrors.prefetch(url for url, _, sparse in refs if not sparse)
+        changed = False
+        for url, ref, sparse in refs:
+            if not sparse and url not in mirrors:
+                continue
+            try:
+                sha = self.git_mirrors.ls_remote(url, ref) if sparse else self.git_mirrors.resolve(url, ref)
+            except (RuntimeError, OSError) as e:
+                logger.warning(f"Could not pin {url}@{ref or 'HEAD'}: {e}")
+                continue
+            if self.git_pins.set(url, ref, sha):
+                logger.info(f"Pinned {url}@{ref or 'HEAD'} to {sha[:12]}")
+                changed = True
+        if changed:
+            self.git_pins.save()
+        return changed
+
+    def resolve_option(self, option_name: str, mode: str = "prod") -> Optional[str]:
+        """Returns the uv requirement a registry package resolves to in the given mode."""
+        manifest = self.index.get("packages", option_name)
+        if manifest is None:
+            raise FileNotFoundError(f"Package manifest not found: {self.registry_path / 'packages' / f'{option_name}.yaml'}")
+        source = getattr(manifest.sources, mode)
+        if not source:
+            return None
+        return self._source_requirement(self.registry_path / "packages", source)
+
+    def _load_pyproject(self) -> Dict:
         pyproject_path = self.project_root / "pyproject.toml"
         if not pyproject_path.exists():
             raise FileNotFoundError(f"pyproject.toml not found at {pyproject_path}")
 
         with open(pyproject_path, "rb") as f:
-            config = tomllib.load(f)
+            return tomllib.load(f)
 
-        hpm_config = config.get("tool", {}).get("hpm", {})
+    def _write_managed(self, managed: Dict[str, str], dists: Dict[str, str]):
+        """Records the packages hpm materialized in [tool.hpm.managed] and their uv names in [tool.hpm.dists]."""
+        # Re-read: uv add/remove rewrite pyproject.toml
+        config = self._load_pyproject()
+        hpm_config = config.setdefault("tool", {}).setdefault("hpm", {})
+        hpm_config["managed"] = dict(sorted(managed.items()))
+        hpm_config["dists"] = dict(sorted(dists.items()))
+        with open(self.project_root / "pyproject.toml", "wb") as f:
+            tomli_w.dump(config, f)
+
+    def _uv_dependency_names(self, requirements: Dict[str, str]) -> Dict[str, str]:
+        """Returns package name -> the dependency name `uv add` recorded for its requirement.
+
+        Path and git requirements are named after the distribution they
+        build, which need not match the registry name; the [tool.uv.sources]
+        entry uv wrote for each of them tells which dependency it became.
+        """
+        uv_sources = self._load_pyproject().get("tool", {}).get("uv", {}).get("sources", {})
+        dists = {}
+        for dist, entry in uv_sources.items():
+            if isinstance(entry, dict):
+                dists[self._uv_source_key(entry)] = normalize_name(dist)
+        names = {}
+        for name, requirement in requirements.items():
+            dist = dists.get(self._requirement_source_key(requirement))
+            if dist is None:
+                logger.warning(f"Could not find the dependency uv added for '{name}' ({requirement}), assuming '{normalize_name(name)}'")
+                dist = normalize_name(name)
+            names[name] = dist
+        return names
+
+    def _uv_source_key(self, entry: Dict) -> Optional[Tuple]:
+        """Identifies a [tool.uv.sources] entry the way `_requirement_source_key` does a requirement."""
+        if "git" in entry:
+            return ("git", entry["git"], entry.get("subdirectory"))
+        if "path" in entry:
+            return ("path", str((self.project_root / entry["path"]).resolve()))
+        return None
+
+    def _requirement_source_key(self, requirement: str) -> Tuple:
+        """Identifies the source of a path or git requirement built by `_source_requirement`."""
+        parsed = split_git_requirement(requirement)
+        if parsed:
+            subdirectory = parse_qs(requirement.partition("#")[2]).get("subdirectory", [None])[0]
+            return ("git", parsed[0], subdirectory)
+        return ("path", str(Path(requirement).resolve()))
+
+    def dependency_resolver(self) -> DependencyResolver:
+        """Returns a resolver for HPM-to-HPM dependencies backed by this registry."""
+        return DependencyResolver(
+            lambda names: self.load_all_manifests(names), lambda: self.index.digests("packages"), self.cache_dir
+        )
+
+    def resolve_dependencies(self, roots: List[Tuple[str, str]], resolver: Optional[DependencyResolver] = None) -> List[str]:
+        """Returns the registry packages `roots` ((name, constraint) pairs) need, dependencies first."""
+        return (resolver or self.dependency_resolver()).resolve(roots)
+
+    def _install_set(self, selection: Dict[str, List[str]]) -> List[str]:
+        """Returns the selected options plus their HPM dependencies, dependencies first."""
+        options = list(dict.fromkeys(opt for options in selection.values() for opt in options))
+        found = self.load_all_manifests(options)
+        for group_name, group_options in selection.items():
+            for opt_name in group_options:
+                if opt_name not in found:
+                    logger.warning(f"Package manifest not found for option '{opt_name}' in group '{group_name}'")
+        return self.resolve_dependencies([(opt, "*") for opt in options if opt in found])
+
+    def _desired_requirements(self, packages: List[str]) -> Dict[str, str]:
+        """Resolves registry packages to package name -> uv requirement, keeping their order."""
+        manifests = self.load_all_manifests(packages)
+
+        desired = {}
+        for name in packages:
+            manifest = manifests[name]
+            # For now, we assume 'prod' source and 'local' or 'git'
+            source = manifest.sources.prod
+            if not source:
+                continue
+
+            requirement = self._source_requirement(self.registry_path / "packages", source)
+            if requirement:
+                desired[manifest.name] = requirement
+        return desired
+
+    def plan_sync(self, hpm_config: Optional[Dict] = None) -> SyncPlan:
+        """Computes which packages sync has to add or remove."""
+        if hpm_config is None:
+            hpm_config = self._load_pyproject().get("tool", {}).get("hpm", {})
         groups_config = hpm_config.get("groups", {})
+        managed = dict(hpm_config.get("managed", {}))
 
-        if not groups_config:
+        selection = self.resolve_selection(groups_config) if groups_config else {}
+        packages = self.check_selection(selection)
+        desired = self._desired_requirements(packages)
+        return SyncPlan(
+            selection=selection,
+            packages=packages,
+            desired=desired,
+            managed=managed,
+            additions={name: req for name, req in desired.items() if managed.get(name) != req},
+            removals=sorted(name for name in managed if name not in desired),
+        )
+
+    def _sync_inputs(self, selection: Dict[str, List[str]], packages: List[str]) -> List[str]:
+        """Registry files (relative paths) a sync of `selection` depends on."""
+        inputs = [PACK_FILE]
+        for group_name, options in selection.items():
+            inputs.append(f"groups/{group_name}.yaml")
+            inputs.extend(f"packages/{opt_name}.yaml" for opt_name in options)
+        inputs.extend(f"packages/{name}.yaml" for name in packages)
+        return inputs
+
+    def sync(self, dry_run: bool = False, force: bool = False, refresh: bool = False) -> SyncPlan:
+        """Materializes groups into uv dependencies with the minimal uv add/remove calls.
+
+        Returns without touching the registry, the network or uv when the
+        sync fingerprint in .hpm/state is unchanged and uv.lock/.venv are as
+        the last sync left them; `force` skips that check. Git sources are
+        installed at the commit SHA pinned for their ref in
+        .hpm/state/git-pins.json, which is part of the fingerprint. Refs are
+        pinned once and only re-resolved with `refresh` (or `force`), so a
+        moved branch is picked up then.
+        """
+        hpm_config = self._load_pyproject().get("tool", {}).get("hpm", {})
+        groups_config = hpm_config.get("groups", {})
+        managed = dict(hpm_config.get("managed", {}))
+        state = SyncState(self.project_root, self.registry_path)
+        if refresh:
+            self.pin_git_sources([Source(type="git", url=url, ref=ref) for url, ref in state.git_refs()], mirror=False)
+        pins = {GitPins.key(url, ref): self.git_pins.get(url, ref) for url, ref in state.git_refs()}
+        if not force and state.is_fresh(groups_config, extra={"managed": managed, "git": pins}):
+            logger.info("Sync fingerprint unchanged, nothing to do")
+            return SyncPlan(desired=managed, managed=managed)
+
+        plan = self.plan_sync(hpm_config)
+        if not plan.desired and not plan.managed:
             logger.info("No HPM groups configured in pyproject.toml")
-            return
+            return plan
+        if dry_run:
+            return plan
 
-        packages_to_add = []
-        for group_name, options in groups_config.items():
-            if isinstance(options, str):
-                options = [options]
-            
-            for opt_name in options:
-                # Find package in registry
-                pkg_manifest_path = self.registry_path / "packages" / f"{opt_name}.yaml"
-                if not pkg_manifest_path.exists():
-                    logger.warning(f"Package manifest not found for option '{opt_name}' in group '{group_name}'")
-                    continue
-                
-                manifest = self.load_manifest(pkg_manifest_path)
-                # For now, we assume 'prod' source and 'local' or 'git'
-                source = manifest.sources.prod
-                if not source:
-                    continue
+        # Re-resolve git refs; a moved branch or tag changes the pinned requirement
+        manifests = self.load_all_manifests(plan.packages)
+        sources = [m.sources.prod for m in manifests.values() if m.sources.prod]
+        if self.pin_git_sources(sources, refresh=force):
+            plan = self.plan_sync(hpm_config)
+        git_refs = [
+            (source.url, source.ref) for source in sources
+            if source.type == "git" and source.url and not (source.ref and SHA_RE.match(source.ref))
+        ]
 
-                if source.type == "local":
-                    # Path relative to registry or absolute?
-                    # Usually relative to the manifest file
-                    abs_path = pkg_manifest_path.parent / source.path
-                    packages_to_add.append(str(abs_path))
-                elif source.type == "git":
-                    git_url = f"git+{source.url}"
-                    if source.ref:
-                        git_url += f"@{source.ref}"
-                    packages_to_add.append(git_url)
-
-        if packages_to_add:
-            logger.info(f"Syncing packages: {packages_to_add}")
-            # Use uv add to update pyproject.toml dependencies and lock file
-            self.uv.run_command(["uv", "add"] + packages_to_add)
+        if plan.is_noop:
+            if state.environment_consistent():
+                logger.info("Dependencies already in sync with HPM groups")
+            else:
+                # uv.lock or .venv changed behind hpm's back
+                logger.info("Dependencies already in sync, re-syncing the environment with uv.lock")
+                self.sync_environment()
         else:
-            logger.info("No packages to sync")
+            dists = {name: dist for name, dist in hpm_config.get("dists", {}).items() if name in plan.desired}
+            if plan.removals:
+                logger.info(f"Removing packages: {plan.removals}")
+                # uv knows the packages by the name `uv add` recorded, not the registry one
+                removals = [hpm_config.get("dists", {}).get(name, normalize_name(name)) for name in plan.removals]
+                self.uv.run_command(["uv", "remove", "--no-sync"] + removals)
+            if plan.additions:
+                logger.info(f"Syncing packages: {list(plan.additions.values())}")
+                env = self._git_env(list(plan.additions.values()))
+                # Use uv add to update pyproject.toml dependencies and lock file; the
+                # environment is synced separately so git packages can come from wheels
+                self.uv.run_command(["uv", "add", "--no-sync"] + list(plan.additions.values()), env=env)
+                dists.update(self._uv_dependency_names(plan.additions))
+            self._write_managed(plan.desired, dists)
+            self.sync_environment(frozen=True)
+
+        pins = {GitPins.key(url, ref): self.git_pins.get(url, ref) for url, ref in git_refs}
+        state.record(
+            groups_config,
+            self._sync_inputs(plan.selection, plan.packages),
+            extra={"managed": plan.desired, "git": pins},
+            git_refs=git_refs,
+        )
+        return plan
+
+    def lock_environment(
+        self,
+        plugins: List[str],
+        mode: str = "prod",
+        requires_python: Optional[str] = None,
+        refresh: bool = False,
+        tmpfs: bool = False,
+    ) -> Path:
+        """Locks registry plugins (and their HPM dependencies) into a standalone environment.
+
+        Returns the directory holding the generated pyproject.toml and uv.lock,
+        taken from the content-addressed lock cache when the same closure was
+        locked before. Local sources are recorded relative to the project
+        root, so the lock is valid wherever the project is checked out.
+        `requires_python` defaults to the project's.
+        """
+        if mode not in ("prod", "dev"):
+            raise ValueError(f"Invalid mode '{mode}', expected 'prod' or 'dev'")
+        if not plugins:
+            raise ValueError("No plugins to lock")
+
+        packages = self.resolve_dependencies([(name, "*") for name in plugins])
+        manifests = self.load_all_manifests(packages)
+        sources = {}
+        for name in packages:
+            sources[name] = getattr(manifests[name].sources, mode) or manifests[name].sources.prod
+            if sources[name] is None:
+                raise ValueError(f"Package '{name}' defines no source")
+        # Requirements (and so the cache key) name the commit a git ref points at
+        # now; a moved branch must not hit the lock of its old commit
+        self.pin_git_sources(list(sources.values()), mirror=False)
+        requirements = []
+        for name, source in sources.items():
+            requirement = self._source_requirement(self.registry_path / "packages", source)
+            if requirement is None:
+                raise NotImplementedError(f"Source type '{source.type}' not yet supported in HPM Lite")
+            requirements.append(absolute_requirement(requirement))
+
+        if requires_python is None and (self.project_root / "pyproject.toml").exists():
+            requires_python = self._load_pyproject().get("project", {}).get("requires-python")
+
+        digests = self.index.digests("packages")
+        cache = LockCache(self.cache_dir)
+        key = cache.key(mode, {name: digests[name] for name in packages}, requirements, requires_python)
+        path = None if refresh else cache.get(key)
+        if path is not None:
+            logger.info(f"Using cached lock {key[:12]} for {packages}")
+            return path
+
+        logger.info(f"Locking {packages} ({mode})...")
+        tmp_root = scratch_root(self.project_root, tmpfs)
+        return cache.put(
+            key,
+            lambda output_dir: lock_requirements(
+                requirements, requires_python, tmp_root, output_dir, name=ENV_PROJECT_NAME, project_dir=self.project_root
+            ),
+        )
+
+    def generate_lock(self, plugins: List[str], mode: str = "prod", refresh: bool = False) -> bytes:
+        """Returns the uv.lock content for a set of registry plugins (see lock_environment)."""
+        return (self.lock_environment(plugins, mode=mode, refresh=refresh) / "uv.lock").read_bytes()
+
+    def generate_lock_payload(
+        self, plugins: List[str], mode: str = "prod", codec: Optional[str] = None, refresh: bool = False
+    ) -> str:
+        """Returns the compressed, checksummed lock payload for HPM_LOCK_B64 (base64 text)."""
+        path = self.lock_environment(plugins, mode=mode, refresh=refresh)
+        files = {name: (path / name).read_bytes() for name in PAYLOAD_FILES if (path / name).exists()}
+        return base64.b64encode(encode_payload(files, codec or default_codec())).decode()
+
+    def _generated_project(self) -> bool:
+        """True if the project's pyproject.toml is a generated environment (or missing)."""
+        if not (self.project_root / "pyproject.toml").exists():
+            return True
+        try:
+            return self._load_pyproject().get("project", {}).get("name") == ENV_PROJECT_NAME
+        except (OSError, ValueError):
+            return False
+
+    def bootstrap(self, payload: bytes, force: bool = False) -> bool:
+        """Restores the environment described by a lock payload into the project.
+
+        The payload's files are written to the project root and `uv sync
+        --frozen` is run, unless the environment already carries a marker
+        with the same lock digest. Git packages come from the wheelhouse.
+        A project's own pyproject.toml and uv.lock are only replaced with
+        `force`; those of an earlier bootstrap always are. Returns True if
+        the sync was skipped.
+        """
+        files = decode_payload(payload)
+        if "uv.lock" not in files:
+            raise ValueError("The lock payload contains no uv.lock")
+        if "pyproject.toml" not in files and not (self.project_root / "pyproject.toml").exists():
+            raise FileNotFoundError("The lock payload has no pyproject.toml and none exists in the project")
+
+        changed = [
+            name for name, content in files.items()
+            if not (self.project_root / name).exists() or (self.project_root / name).read_bytes() != content
+        ]
+        existing = [name for name in changed if (self.project_root / name).exists()]
+        if existing and not force and not self._generated_project():
+            raise FileExistsError(
+                f"The lock payload would overwrite the project's {' and '.join(existing)}; "
+                f"run it in an empty directory or pass --force"
+            )
+        for name in changed:
+            (self.project_root / name).write_bytes(files[name])
 
-    def install_plugin(self, manifest_path: Path, mode: str = "prod"):
-        """Installs a plugin based on its manifest and mode."""
+        digest = payload_digest({name: (self.project_root / name).read_bytes() for name in PAYLOAD_FILES})
+        marker = self.venv_dir() / ".hpm-lock-digest"
+        try:
+            if marker.read_text().strip() == digest:
+                logger.info(f"Environment already matches lock {digest[:12]}")
+                return True
+        except OSError:
+            pass
+
+        logger.info(f"Restoring environment for lock {digest[:12]}...")
+        self.sync_environment(frozen=True)
+        try:
+            marker.write_text(digest + "\n")
+        except OSError as e:
+            logger.debug(f"Could not write lock marker {marker}: {e}")
+        return False
+
+    def _git_env(self, requirements: List[str]) -> Optional[Dict[str, str]]:
+        """Prefetches the git repositories among `requirements` concurrently.
+
+        Returns the environment that makes uv fetch them from the local
+        mirrors, or None if there is nothing to redirect. Requirements with a
+        subdirectory are mirrored too: uv clones the whole repository to
+        read a subdirectory's metadata, and a clone of the shared,
+        incrementally fetched mirror is local.
+        """
+        urls = [parsed[0] for parsed in map(split_git_requirement, requirements) if parsed]
+        mirrors = self.git_mirrors.prefetch(urls)
+        return GitMirrorStore.redirect_env(mirrors) if mirrors else None
+
+    def git_wheel(self, url: str, sha: str, subdirectory: Optional[str] = None) -> Optional[Path]:
+        """Returns a wheel of a git source at commit `sha` from the shared wheelhouse.
+
+        On a miss, only `subdirectory` of the commit is checked out (from the
+        local mirror when there is one) and built. Returns None if it cannot
+        be built; uv then builds the source itself.
+        """
+        tag = self.wheel_tag()
+        key = Wheelhouse.git_key(url, sha, subdirectory)
+        wheel = self.git_wheelhouse.get(key, tag)
+        if wheel is not None:
+            logger.debug(f"Using cached wheel {wheel.name} for {url}@{sha[:12]}")
+        else:
+            label = f"{url}@{sha}" + (f"#subdirectory={subdirectory}" if subdirectory else "")
+            mirror = self.git_mirrors.mirror_path(url)
+            try:
+                try:
+                    checkout = self.git_mirrors.checkout(url, sha, subdirectory, remote=mirror.as_uri() if mirror.exists() else None)
+                except RuntimeError:
+                    if not mirror.exists():
+                        raise
+                    # The mirror may predate the commit
+                    checkout = self.git_mirrors.checkout(url, sha, subdirectory)
+                wheel = self.git_wheelhouse.put(key, checkout / (subdirectory or "").strip("/"), label, tag)
+            except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+                logger.warning(f"Could not build a wheel for {label}, leaving it to uv: {e}")
+                return None
+        return wheel
+
+    def _installed_wheels(self) -> Set[str]:
+        """URLs of the wheel files the project environment's packages were installed from (PEP 610)."""
+        urls = set()
+        for direct_url in self.venv_dir().glob("[Ll]ib/python*/site-packages/*.dist-info/direct_url.json"):
+            try:
+                with open(direct_url, "r") as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if "archive_info" in info:
+                urls.add(info.get("url", ""))
+        return urls
+
+    def _install_git_wheels(self, wheels: List[Path]):
+        """Installs git wheels into the project environment without their dependencies (uv sync installs those).
+
+        Wheels the environment already has installed, by wheel file URL, are skipped.
+        """
+        installed = self._installed_wheels()
+        wheels = [wheel for wheel in wheels if wheel.as_uri() not in installed]
+        if not wheels:
+            return
+        env = {**os.environ, "VIRTUAL_ENV": str(self.venv_dir())}
+        self.uv.pip_install(["--no-deps", "--reinstall"] + [str(wheel) for wheel in wheels], env=env)
+
+    def sync_environment(self, frozen: bool = False):
+        """Runs `uv sync`, installing git packages of uv.lock from the wheelhouse instead of building them.
+
+        Wheels are looked up for (and built with) the environment's
+        interpreter, so the environment is created first if needed. The git
+        packages that have a wheel are left out of the single `uv sync` and
+        installed from their wheels; uv installs the others from git itself.
+        Later hpm syncs leave them out again, while a plain `uv sync`
+        reinstalls them from git, as their metadata says where they came from.
+        """
+        try:
+            git_sources = lock_git_sources((self.project_root / "uv.lock").read_bytes())
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not read git sources from uv.lock: {e}")
+            git_sources = {}
+        if git_sources and self._target_python() is None:
+            self.uv.create_venv(self.venv_dir())
+            self._wheel_tag = None
+        wheels = {}
+        for name, (url, sha, subdirectory) in git_sources.items():
+            wheel = self.git_wheel(url, sha, subdirectory)
+            if wheel is not None:
+                wheels[name] = wheel
+        self.uv.sync(frozen=frozen, no_install=list(wheels))
+        self._install_git_wheels(list(wheels.values()))
+
+    def local_wheel(self, source_dir: Path) -> Optional[Path]:
+        """Returns a wheel of a local package from the wheelhouse, building it on first use; None if it cannot be built."""
+        source_dir = source_dir.resolve()
+        try:
+            tag = self.wheel_tag()
+            key = Wheelhouse.local_key(source_dir)
+            wheel = self.wheelhouse.get(key, tag)
+            if wheel is None:
+                wheel = self.wheelhouse.put(key, source_dir, str(source_dir), tag)
+            else:
+                logger.debug(f"Using cached wheel {wheel.name} for {source_dir}")
+            return wheel
+        except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"Could not build a wheel for {source_dir}, installing from source: {e}")
+            return None
+
+    def list_wheels(self, shared: bool = False) -> List[WheelEntry]:
+        """Returns the entries of the local (or shared git) wheelhouse, most recently used first."""
+        return (self.git_wheelhouse if shared else self.wheelhouse).entries()
+
+    def evict_wheels(
+        self, max_age: Optional[float] = None, max_size: Optional[int] = None, dry_run: bool = False, shared: bool = False
+    ) -> List[WheelEntry]:
+        """Removes wheelhouse entries unused for `max_age` seconds, then the least recently used beyond `max_size` bytes."""
+        wheelhouse = self.git_wheelhouse if shared else self.wheelhouse
+        return wheelhouse.evict(max_age=max_age, max_size=max_size, dry_run=dry_run)
+
+    def _install_target(self, manifest_dir: Path, source: Source) -> InstallTarget:
+        """Returns what `uv pip install` gets for a manifest source."""
+        if source.type == "local" and source.editable:
+            return InstallTarget(editable=manifest_dir / source.path)
+        if source.type == "local":
+            wheel = self.local_wheel(manifest_dir / source.path)
+            if wheel is not None:
+                return InstallTarget(requirement=str(wheel))
+        if source.type == "git" and source.url:
+            sha = source.ref if source.ref and SHA_RE.match(source.ref) else self.git_pins.get(source.url, source.ref)
+            wheel = self.git_wheel(source.url, sha, source.subdirectory) if sha else None
+            if wheel is not None:
+                return InstallTarget(requirement=str(wheel))
+        requirement = self._source_requirement(manifest_dir, source)
+        if requirement is None:
+            raise NotImplementedError(f"Source type '{source.type}' not yet supported in HPM Lite")
+        return InstallTarget(requirement=requirement)
+
+    def install_plugin(self, manifest_path: Path, mode: str = "prod", reinstall: bool = False):
+        """Installs a plugin based on its manifest and mode.
+
+        HPM dependencies of the plugin are resolved from the registry and
+        installed in the same uv call, dependencies first. Editable installs
+        whose build files and installed metadata are unchanged since hpm
+        installed them are skipped unless `reinstall`.
+        """
         manifest = self.load_manifest(manifest_path)
         logger.info(f"Installing plugin: {manifest.name} (version: {manifest.version}) in {mode} mode")
 
@@ -324,28 +1125,87 @@ class HPMCore:
         if not source:
             raise ValueError(f"Source for mode '{mode}' not defined in manifest for {manifest.name}")
 
-        if source.type == "local":
-            plugin_path = manifest_path.parent / source.path
-            if source.editable:
-                self.uv.pip_install_editable(plugin_path)
-            else:
-                # Basic implementation: just use uv pip install
-                self.uv.run_command(["uv", "pip", "install", str(plugin_path)])
-        elif source.type == "git":
-            # uv supports git urls directly
-            git_url = f"git+{source.url}"
-            if source.ref:
-                git_url += f"@{source.ref}"
-            self.uv.run_command(["uv", "pip", "install", git_url])
+        roots = [(dep.name, dep.version) for dep in hpm_dependencies(manifest)]
+        packages = [name for name in self.resolve_dependencies(roots) if name != manifest.name]
+        dependencies = self.load_all_manifests(packages)
+        dep_sources = []
+        for name in packages:
+            dep_source = getattr(dependencies[name].sources, mode) or dependencies[name].sources.prod
+            if dep_source is None:
+                raise ValueError(f"Dependency '{name}' of {manifest.name} defines no source")
+            dep_sources.append(dep_source)
+        self.pin_git_sources(dep_sources + [source])
+        targets = [self._install_target(self.registry_path / "packages", dep_source) for dep_source in dep_sources]
+        targets.append(self._install_target(manifest_path.parent, source))
+        if packages:
+            logger.info(f"Including HPM dependencies: {packages}")
+
+        editables = EditableInstalls(self.project_root, self.venv_dir())
+        if not reinstall:
+            targets = editables.outdated(targets)
+        if not targets:
+            logger.info("Editable installs are up to date, nothing to install")
+            return
+        if len(targets) == 1 and targets[0].editable is not None:
+            self.uv.pip_install_editable(targets[0].editable)
         else:
-            raise NotImplementedError(f"Source type '{source.type}' not yet supported in HPM Lite")
+            args = [arg for target in targets for arg in target.args]
+            self.uv.pip_install(args, env=self._git_env([t.requirement for t in targets if t.requirement]))
+        editables.record(targets)
 
-    def run_entrypoint(self, manifest_path: Path, entrypoint_name: str):
-        """Runs a command defined in the manifest entrypoints."""
+    def venv_dir(self) -> Path:
+        """The project's environment directory (honours UV_PROJECT_ENVIRONMENT, like uv)."""
+        return project_venv(self.project_root)
+
+    def resolve_command(self, command: List[str]) -> List[str]:
+        """Points a bare program name at the venv's interpreter or console script, if it has one."""
+        if not command:
+            raise ValueError("Empty command")
+        program = command[0]
+        if os.sep not in program:
+            candidate = self.venv_dir() / VENV_BIN / program
+            if candidate.exists():
+                return [str(candidate)] + command[1:]
+        return list(command)
+
+    def command_env(self) -> Dict[str, str]:
+        """Environment for commands run inside the project venv (as if it were activated)."""
+        env = dict(os.environ)
+        venv = self.venv_dir()
+        if venv.is_dir():
+            env["VIRTUAL_ENV"] = str(venv)
+            env["PATH"] = os.pathsep.join([str(venv / VENV_BIN), env.get("PATH", "")])
+            env.pop("PYTHONHOME", None)
+        return env
+
+    def entrypoint_command(self, manifest_path: Path, entrypoint_name: str) -> List[str]:
+        """Returns the argv of a manifest entrypoint, resolved against the project venv."""
         manifest = self.load_manifest(manifest_path)
         if entrypoint_name not in manifest.entrypoints:
             raise KeyError(f"Entrypoint '{entrypoint_name}' not found in manifest for {manifest.name}")
-        
-        command_str = manifest.entrypoints[entrypoint_name]
-        command = command_str.split()
-        self.uv.run_command(command)
\ No newline at end of file
+        return self.resolve_command(shlex.split(manifest.entrypoints[entrypoint_name]))
+
+    def exec_command(self, command: List[str]):
+        """Replaces the current process with `command` (os.execvpe); never returns.
+
+        The service becomes the process itself (PID 1 in a container), so it
+        receives signals directly and no hpm interpreter stays resident.
+        """
+        logger.info(f"Executing: {shlex.join(command)}")
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        os.chdir(self.project_root)
+        os.execvpe(command[0], command, self.command_env())
+
+    def run_entrypoint(self, manifest_path: Path, entrypoint_name: str, exec_mode: bool = False):
+        """Runs a command defined in the manifest entrypoints.
+
+        With exec_mode the hpm process is replaced by the command instead of
+        waiting for it as a child; either way it runs in the project root with
+        the venv activated (see command_env).
+        """
+        command = self.entrypoint_command(manifest_path, entrypoint_name)
+        if exec_mode:
+            self.exec_command(command)
+        else:
+            self.uv.run_command(command, env=self.command_env())
@@ -0,0 +1,227 @@
+import os
+import json
+import socket
+import struct
+import logging
+import threading
+import socketserver
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from .core import HPMCore
+
+logger = logging.getLogger(__name__)
+
+SOCKET_NAME = "daemon.sock"
+CONNECT_TIMEOUT = 0.2
+
+# inotify(7) event masks
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def socket_path(project_root: Path) -> Path:
+    """Returns the daemon socket path for a project (overridable via HPM_DAEMON_SOCKET)."""
+    override = os.getenv("HPM_DAEMON_SOCKET")
+    if override:
+        return Path(override)
+    return project_root / ".hpm" / SOCKET_NAME
+
+
+class InotifyWatcher(threading.Thread):
+    """Calls on_change whenever anything inside the watched directories changes."""
+
+    def __init__(self, directories: List[Path], on_change: Callable[[], None]):
+        super().__init__(daemon=True, name="hpm-inotify")
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = directories
+        self.on_change = on_change
+        self._watched: set = set()
+        self._add_watches()
+
+    def _add_watches(self):
+        for directory in self.directories:
+            if directory in self._watched or not directory.is_dir():
+                continue
+            if self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK) >= 0:
+                self._watched.add(directory)
+
+    def run(self):
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except OSError:
+                return
+            offset = 0
+            while offset < len(buf):
+                _, mask, _, name_len = INOTIFY_EVENT.unpack_from(buf, offset)
+                if mask & IN_DELETE_SELF:
+                    self._watched.clear()
+                offset += INOTIFY_EVENT.size + name_len
+            # Directories created after start-up (or re-created) get watched too
+            self._add_watches()
+            self.on_change()
+
+
+class RegistryDaemon:
+    """Keeps the registry parsed in memory and answers queries over a unix socket.
+
+    Requests and responses are single JSON lines. Registry files are only
+    re-checked after inotify reports a change (or on every request when
+    inotify is unavailable).
+    """
+
+    OPS = ("ping", "list", "show", "search", "resolve", "rdeps", "shutdown")
+
+    def __init__(self, hpm: HPMCore):
+        self.hpm = hpm
+        self.socket_path = socket_path(hpm.project_root)
+        self._lock = threading.Lock()
+        self._stale = True
+        self._watching = False
+        self._groups: Dict[str, Any] = {}
+        self._server: Optional[socketserver.UnixStreamServer] = None
+
+    def _mark_stale(self):
+        self._stale = True
+
+    def _refresh(self) -> bool:
+        """Reloads changed registry files if needed; returns True if it did."""
+        if not self._stale:
+            return False
+        self._stale = not self._watching
+        self._groups = self.hpm.load_all_groups()
+        self.hpm.update_search_index()
+        return True
+
+    def handle(self, request: dict) -> Any:
+        op = request.get("op")
+        if op not in self.OPS:
+            raise ValueError(f"Unknown daemon operation: {op}")
+
+        with self._lock:
+            if op == "ping":
+                return {"registry": str(self.hpm.registry_path.resolve()), "pid": os.getpid()}
+            if op == "shutdown":
+                threading.Thread(target=self._server.shutdown, daemon=True).start()
+                return None
+
+            self._refresh()
+            if op == "list":
+                return [group.model_dump(mode="json") for group in self._groups.values()]
+            if op == "show":
+                name = request["name"]
+                if name in self._groups:
+                    return {"group": self._groups[name].model_dump(mode="json")}
+                package = self.hpm.find_package(name)
+                if package is None:
+                    self.hpm.load_group(name)  # raises with suggestions
+                return {
+                    "package": package.header.model_dump(mode="json"),
+                    "rdeps": self.hpm.reverse_dependencies(name, refresh=False),
+                }
+            if op == "search":
+                results = self.hpm.search_registry(request["query"], limit=request.get("limit", 50), refresh=False)
+                headers = self.hpm.list_packages(results["packages"])
+                results["headers"] = {name: pkg.header.model_dump(mode="json") for name, pkg in headers.items()}
+                return results
+            if op == "rdeps":
+                if request.get("entrypoint"):
+                    return self.hpm.packages_with_entrypoint(request["name"], refresh=False)
+                return self.hpm.reverse_dependencies(request["name"], refresh=False)
+            if op == "resolve":
+                return self.hpm.resolve_option(request["name"], mode=request.get("mode", "prod"))
+
+    def serve_forever(self):
+        """Serves requests until a shutdown request or KeyboardInterrupt."""
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        response = {"ok": True, "result": daemon.handle(json.loads(line))}
+                    except Exception as e:
+                        response = {"ok": False, "error": str(e), "type": type(e).__name__}
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        if DaemonClient(self.socket_path).ping() is not None:
+            raise RuntimeError(f"An hpm daemon is already listening on {self.socket_path}")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        try:
+            directories = [self.hpm.registry_path, self.hpm.registry_path / "groups", self.hpm.registry_path / "packages"]
+            InotifyWatcher(directories, self._mark_stale).start()
+            self._watching = True
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable, registry will be re-checked on every request: {e}")
+
+        with self._lock:
+            self._refresh()
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        self._server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"hpm daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+
+class DaemonError(Exception):
+    """An error raised by the daemon while handling a request."""
+
+
+class DaemonClient:
+    """Client for RegistryDaemon; every call fails fast if no daemon is listening."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @classmethod
+    def for_core(cls, hpm: HPMCore) -> Optional["DaemonClient"]:
+        """Returns a client if a daemon is serving this core's registry, else None."""
+        path = socket_path(hpm.project_root)
+        if not path.exists():
+            return None
+        client = cls(path)
+        info = client.ping()
+        if info is None or info["registry"] != str(hpm.registry_path.resolve()):
+            return None
+        return client
+
+    def request(self, op: str, **args) -> Any:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(self.path))
+            sock.settimeout(None)
+            sock.sendall(json.dumps({"op": op, **args}).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline())
+        if not response["ok"]:
+            raise DaemonError(response["error"])
+        return response["result"]
+
+    def ping(self) -> Optional[dict]:
+        try:
+            return self.request("ping")
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,223 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+import tomli_w
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from .models import CheckResult
+from .uv_manager import UVManager
+
+logger = logging.getLogger(__name__)
+
+CHECK_VERSION = 1
+TMPFS_ROOT = Path("/dev/shm")
+# Files of a local package that can change what it depends on
+BUILD_FILES = ("pyproject.toml", "setup.cfg", "setup.py")
+LOCK_FILES = ("pyproject.toml", "uv.lock")
+# Keys of uv source tables that hold a local path
+PATH_KEYS = ("path", "directory", "editable", "virtual")
+
+
+def _is_url(requirement: str) -> bool:
+    return requirement.startswith("git+") or "://" in requirement
+
+
+def absolute_requirement(requirement: str) -> str:
+    """Makes local path requirements absolute so they resolve from any directory."""
+    if _is_url(requirement):
+        return requirement
+    return str(Path(requirement).resolve())
+
+
+def scratch_root(project_root: Path, tmpfs: bool = False) -> Path:
+    """Directory for throwaway projects: .hpm/tmp, or a per-user directory on tmpfs."""
+    default = project_root / ".hpm" / "tmp"
+    if not tmpfs:
+        return default
+    if TMPFS_ROOT.is_dir():
+        return TMPFS_ROOT / f"hpm-{os.getuid()}"
+    logger.warning(f"{TMPFS_ROOT} is not available, using {default}")
+    return default
+
+
+def build_file_digests(requirements: List[str]) -> Dict[str, Dict[str, str]]:
+    """Hashes the build files of local path requirements (they decide what a package depends on)."""
+    build_files: Dict[str, Dict[str, str]] = {}
+    for requirement in requirements:
+        if _is_url(requirement):
+            continue
+        digests = {}
+        for name in BUILD_FILES:
+            try:
+                digests[name] = hashlib.sha256((Path(requirement) / name).read_bytes()).hexdigest()
+            except OSError:
+                pass
+        build_files[requirement] = digests
+    return build_files
+
+
+def _path_values(data: dict, file_name: str) -> Iterator[str]:
+    """Local path values of the uv sources in a parsed pyproject.toml or uv.lock."""
+    tables = []
+    if file_name == "pyproject.toml":
+        for source in data.get("tool", {}).get("uv", {}).get("sources", {}).values():
+            tables.extend(source if isinstance(source, list) else [source])
+    else:
+        for package in data.get("package", []):
+            tables.append(package.get("source", {}))
+            metadata = package.get("metadata", {})
+            tables.extend(metadata.get("requires-dist", []))
+            for requirements in metadata.get("requires-dev", {}).values():
+                tables.extend(requirements)
+    for table in tables:
+        for key in PATH_KEYS:
+            if isinstance(table.get(key), str):
+                yield table[key]
+
+
+def relocate_lock_file(content: str, file_name: str, workdir: Path, project_dir: Path) -> str:
+    """Rewrites the local paths in a pyproject.toml or uv.lock locked in `workdir` relative to `project_dir`.
+
+    uv writes paths as given or relative to the project it locked, so a lock
+    made in a throwaway directory would otherwise only work on this host.
+    Only the quoted values are replaced, uv's formatting is kept.
+    """
+    for value in set(_path_values(tomllib.loads(content), file_name)):
+        path = os.path.normpath(workdir / value)
+        # The locked project itself becomes the project it is restored into
+        relocated = "." if path == os.path.normpath(workdir) else Path(os.path.relpath(path, project_dir)).as_posix()
+        content = content.replace(json.dumps(value, ensure_ascii=False), json.dumps(relocated, ensure_ascii=False))
+    return content
+
+
+def lock_requirements(
+    requirements: List[str],
+    requires_python: Optional[str],
+    tmp_root: Path,
+    output_dir: Optional[Path] = None,
+    name: str = "hpm-dry-run",
+    project_dir: Optional[Path] = None,
+) -> Tuple[bool, str]:
+    """Locks `requirements` in a throwaway project under tmp_root; returns (ok, uv output).
+
+    `uv add --no-sync` resolves and writes uv.lock without creating a venv or
+    installing anything, and accepts the same path and git requirements as sync.
+    On success, the project's pyproject.toml and uv.lock are copied to
+    `output_dir` if one is given, with local paths made relative to
+    `project_dir` if one is given.
+    """
+    tmp_root.mkdir(parents=True, exist_ok=True)
+    workdir = Path(tempfile.mkdtemp(prefix="check-", dir=tmp_root))
+    try:
+        project = {"name": name, "version": "0.0.0", "dependencies": []}
+        if requires_python:
+            project["requires-python"] = requires_python
+        with open(workdir / "pyproject.toml", "wb") as f:
+            tomli_w.dump({"project": project}, f)
+        ok, output = True, ""
+        if requirements:
+            result = UVManager(workdir).capture(["uv", "add", "--no-sync"] + requirements)
+            ok, output = result.returncode == 0, result.stdout
+        if ok and output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for file_name in LOCK_FILES:
+                if not (workdir / file_name).exists():
+                    continue
+                if project_dir is None:
+                    shutil.copyfile(workdir / file_name, output_dir / file_name)
+                else:
+                    content = (workdir / file_name).read_text()
+                    (output_dir / file_name).write_text(relocate_lock_file(content, file_name, workdir, project_dir))
+        return ok, output
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+class DryRunResolver:
+    """Checks requirement sets with `uv lock` in isolated throwaway projects.
+
+    The real project's pyproject.toml and uv.lock are never touched. Results,
+    failures included, are cached in .hpm/cache/check by a hash of the
+    requirements, requires-python and the build files of local packages.
+    """
+
+    def __init__(self, project_root: Path, cache_dir: Path, tmpfs: bool = False):
+        self.cache_dir = cache_dir / "check"
+        self.tmp_root = scratch_root(project_root, tmpfs)
+
+    def key(self, requirements: List[str], requires_python: Optional[str] = None) -> str:
+        payload = {
+            "version": CHECK_VERSION,
+            "requires_python": requires_python,
+            "requirements": sorted(requirements),
+            "build_files": build_file_digests(requirements),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def cached(self, key: str) -> Optional[CheckResult]:
+        try:
+            with open(self.cache_dir / f"{key}.json", "r") as f:
+                return CheckResult.model_validate_json(f.read()).model_copy(update={"cached": True})
+        except (OSError, ValueError):
+            return None
+
+    def store(self, result: CheckResult):
+        cache_file = self.cache_dir / f"{result.key}.json"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                f.write(result.model_dump_json())
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.debug(f"Could not write check cache {cache_file}: {e}")
+
+    def check(self, requirements: List[str], requires_python: Optional[str] = None, refresh: bool = False) -> CheckResult:
+        """Resolves `requirements` in isolation, reusing a cached result unless `refresh`."""
+        return self.check_many([requirements], requires_python, refresh=refresh, jobs=1)[0]
+
+    def check_many(
+        self,
+        requirement_sets: List[List[str]],
+        requires_python: Optional[str] = None,
+        refresh: bool = False,
+        jobs: Optional[int] = None,
+    ) -> List[CheckResult]:
+        """Resolves several requirement sets, running uncached ones on at most `jobs` processes."""
+        requirement_sets = [[absolute_requirement(req) for req in reqs] for reqs in requirement_sets]
+        keys = [self.key(reqs, requires_python) for reqs in requirement_sets]
+        results: List[Optional[CheckResult]] = [None if refresh else self.cached(key) for key in keys]
+        logger.debug(f"{sum(r is not None for r in results)} of {len(results)} check results cached")
+
+        # Identical sets (e.g. two options sharing a source) are resolved once
+        pending: Dict[str, List[int]] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                pending.setdefault(keys[i], []).append(i)
+        if not pending:
+            return results
+
+        jobs = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+        logger.info(f"Resolving {len(pending)} requirement sets on {jobs} processes in {self.tmp_root}...")
+        firsts = [indices[0] for indices in pending.values()]
+        args = [requirement_sets[i] for i in firsts]
+        if jobs == 1:
+            outcomes = [lock_requirements(reqs, requires_python, self.tmp_root) for reqs in args]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                outcomes = list(pool.map(lock_requirements, args, [requires_python] * len(args), [self.tmp_root] * len(args)))
+
+        for (key, indices), first, (ok, output) in zip(pending.items(), firsts, outcomes):
+            result = CheckResult(ok=ok, requirements=requirement_sets[first], output=output, key=key)
+            self.store(result)
+            for i in indices:
+                results[i] = result
+        return results
@@ -0,0 +1,112 @@
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+from .dry_run import BUILD_FILES
+from .models import InstallTarget
+
+logger = logging.getLogger(__name__)
+
+EDITABLE_STATE_VERSION = 1
+# Installed metadata that changes when an editable install is redone or replaced
+INSTALLED_FILES = ("direct_url.json", "entry_points.txt")
+
+
+def _digest_files(directory: Path, names: tuple) -> str:
+    sha = hashlib.sha256()
+    for name in names:
+        try:
+            content = (directory / name).read_bytes()
+        except OSError:
+            continue
+        sha.update(name.encode() + b"\0" + hashlib.sha256(content).digest())
+    return sha.hexdigest()
+
+
+class EditableInstalls:
+    """Tracks editable installs so unchanged ones are not redone.
+
+    An editable install only has to be redone when the package's build files
+    (pyproject.toml, setup.cfg, setup.py: dependencies, entry points,
+    package layout) change. Stored in .hpm/state/editable.json is, per
+    source path, a digest of those files and of the installed
+    direct_url.json and entry_points.txt, so a package that was uninstalled,
+    reinstalled from elsewhere or installed into another environment is
+    installed again.
+    """
+
+    def __init__(self, project_root: Path, venv_dir: Path):
+        self.venv_dir = venv_dir
+        self.state_file = project_root / ".hpm" / "state" / "editable.json"
+        self._state: Optional[Dict[str, Dict[str, str]]] = None
+        self._dist_infos: Optional[Dict[str, Path]] = None
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if self._state is None:
+            try:
+                with open(self.state_file, "r") as f:
+                    data = json.load(f)
+                self._state = data["installs"] if data.get("version") == EDITABLE_STATE_VERSION else {}
+            except (OSError, ValueError, KeyError):
+                self._state = {}
+        return self._state
+
+    def _installed(self) -> Dict[str, Path]:
+        """Source URL -> dist-info directory of the editable installs in the environment."""
+        if self._dist_infos is None:
+            self._dist_infos = {}
+            for direct_url in self.venv_dir.glob("[Ll]ib/python*/site-packages/*.dist-info/direct_url.json"):
+                try:
+                    with open(direct_url, "r") as f:
+                        info = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if info.get("dir_info", {}).get("editable"):
+                    self._dist_infos[info.get("url", "")] = direct_url.parent
+        return self._dist_infos
+
+    def _stamp(self, path: Path) -> Optional[Dict[str, str]]:
+        dist_info = self._installed().get(path.as_uri())
+        if dist_info is None:
+            return None
+        return {"source": _digest_files(path, BUILD_FILES), "installed": _digest_files(dist_info, INSTALLED_FILES)}
+
+    def is_current(self, path: Path) -> bool:
+        """True if `path` is installed in editable mode and nothing that would change the install did."""
+        path = path.resolve()
+        stamp = self._stamp(path)
+        return stamp is not None and self._load().get(str(path)) == stamp
+
+    def outdated(self, targets: List[InstallTarget]) -> List[InstallTarget]:
+        """Drops the editable targets that are current; other targets are kept."""
+        kept = []
+        for target in targets:
+            if target.editable is not None and self.is_current(target.editable):
+                logger.debug(f"Editable install of {target.editable} is up to date")
+            else:
+                kept.append(target)
+        return kept
+
+    def record(self, targets: List[InstallTarget]):
+        """Stores stamps for the editable targets after they were installed."""
+        paths = [target.editable.resolve() for target in targets if target.editable is not None]
+        if not paths:
+            return
+        self._dist_infos = None
+        state = self._load()
+        for path in paths:
+            stamp = self._stamp(path)
+            if stamp is None:
+                state.pop(str(path), None)
+            else:
+                state[str(path)] = stamp
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                json.dump({"version": EDITABLE_STATE_VERSION, "installs": state}, f)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            logger.debug(f"Could not write editable state {self.state_file}: {e}")
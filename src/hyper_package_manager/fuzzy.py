@@ -0,0 +1,49 @@
+import re
+from difflib import SequenceMatcher
+from typing import Iterable, List, Set
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+# Minimum similarity for a name to be offered as a suggestion.
+DEFAULT_CUTOFF = 0.7
+
+
+def words(text: str) -> List[str]:
+    """Splits a name like 'vlm-adapter_qwen' into lowercase words."""
+    return WORD_RE.findall(text.lower())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Returns the padded trigrams of every word in text (pg_trgm style)."""
+    result = set()
+    for word in words(text):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def _ratio(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def similarity(query: str, candidate: str) -> float:
+    """Scores how well query matches candidate, tolerating typos and word order.
+
+    Each query word is matched against its closest candidate word, so
+    'qwn-adaptr' scores high against 'vlm-adapter-qwen'.
+    """
+    query_words = words(query)
+    candidate_words = words(candidate)
+    if not query_words or not candidate_words:
+        return 0.0
+
+    per_word = sum(max(_ratio(q, c) for c in candidate_words) for q in query_words) / len(query_words)
+    whole = _ratio("".join(query_words), "".join(candidate_words))
+    return max(per_word, whole)
+
+
+def closest(query: str, candidates: Iterable[str], limit: int = 5, cutoff: float = DEFAULT_CUTOFF) -> List[str]:
+    """Returns up to `limit` candidates most similar to query, best first."""
+    scored = [(similarity(query, c), c) for c in candidates]
+    scored = [item for item in scored if item[0] >= cutoff]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [c for _, c in scored[:limit]]
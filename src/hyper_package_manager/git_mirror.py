@@ -0,0 +1,300 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+try:
+    import fcntl
+except ImportError:  # Windows: mirrors are not locked across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_WORKERS = 8
+SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+# Seconds before a git command is given up on; a clone of a large repository
+# may take minutes, a ref lookup should not hang on an unreachable host
+GIT_TIMEOUT = 600
+LS_REMOTE_TIMEOUT = 30
+
+
+def _run_git(args: List[str], cwd: Optional[Path] = None, timeout: float = GIT_TIMEOUT) -> str:
+    try:
+        result = subprocess.run(
+            ["git"] + args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"git {' '.join(args)} timed out after {timeout:.0f}s")
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def split_git_requirement(requirement: str) -> Optional[Tuple[str, Optional[str]]]:
+    """Splits "git+<url>[@<ref>][#...]" into (url, ref); returns None for other requirements."""
+    if not requirement.startswith("git+"):
+        return None
+    parts = urlsplit(requirement[len("git+"):].split("#", 1)[0])
+    path, ref = parts.path, None
+    if "@" in path:
+        path, _, ref = path.rpartition("@")
+    return urlunsplit((parts.scheme, parts.netloc, path, parts.query, "")), ref
+
+
+def lock_git_sources(lock: bytes) -> Dict[str, Tuple[str, str, Optional[str]]]:
+    """Returns package name -> (url, commit SHA, subdirectory) for the git packages in a uv.lock."""
+    sources = {}
+    for package in tomllib.loads(lock.decode()).get("package", []):
+        git = package.get("source", {}).get("git")
+        if not git:
+            continue
+        # uv records git sources as <url>?subdirectory=..&rev=..#<sha>
+        parts = urlsplit(git)
+        if not SHA_RE.match(parts.fragment):
+            continue
+        subdirectory = parse_qs(parts.query).get("subdirectory", [None])[0]
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+        sources[package["name"]] = (url, parts.fragment, subdirectory)
+    return sources
+
+
+class GitMirrorStore:
+    """Local bare mirrors of the git repositories registry sources point at.
+
+    One mirror per URL lives under `root`, which may be shared between
+    projects and processes: fetches into a mirror are serialized with a lock
+    file next to it. Mirrors are created with `git clone --mirror` and
+    updated with an incremental fetch, at most once per store instance. uv is
+    then pointed at them through git's `url.<mirror>.insteadOf`
+    configuration, passed in the environment, so requirements, pyproject.toml
+    and uv.lock keep the original URLs.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        # URLs fetched by this instance (one hpm invocation)
+        self._fetched: Dict[str, Path] = {}
+        # URLs that could not be reached during this invocation -> error, not retried
+        self._failed: Dict[str, str] = {}
+
+    @staticmethod
+    def _repo_name(url: str) -> str:
+        return re.sub(r"[^A-Za-z0-9._-]+", "-", url.rstrip("/").rsplit("/", 1)[-1]).removesuffix(".git") or "repo"
+
+    def mirror_path(self, url: str) -> Path:
+        return self.root / f"{self._repo_name(url)}-{hashlib.sha256(url.encode()).hexdigest()[:12]}.git"
+
+    def checkout_path(self, url: str, sha: str, subdirectory: str) -> Path:
+        digest = hashlib.sha256(f"{url}#{subdirectory}".encode()).hexdigest()[:12]
+        return self.root / "checkouts" / f"{self._repo_name(url)}-{sha[:12]}-{digest}"
+
+    @contextmanager
+    def _locked(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_suffix(".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _check_reachable(self, url: str):
+        if url in self._failed:
+            raise RuntimeError(f"{url} could not be reached earlier in this run: {self._failed[url]}")
+
+    def fetch(self, url: str) -> Path:
+        """Creates or incrementally updates the mirror of `url`; returns its path.
+
+        A URL that failed once is not tried again by this instance.
+        """
+        if url not in self._fetched:
+            self._check_reachable(url)
+            path = self.mirror_path(url)
+            try:
+                with self._locked(path):
+                    self._fetch(url, path)
+            except RuntimeError as e:
+                self._failed[url] = str(e)
+                raise
+            self._fetched[url] = path
+        return self._fetched[url]
+
+    def _fetch(self, url: str, path: Path):
+        if path.exists():
+            logger.debug(f"Updating mirror of {url}")
+            _run_git(["fetch", "--prune", "--quiet", "origin"], cwd=path)
+            return
+
+        logger.debug(f"Mirroring {url}")
+        staging = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=self.root))
+        try:
+            _run_git(["clone", "--mirror", "--quiet", url, str(staging / "repo.git")])
+            try:
+                os.rename(staging / "repo.git", path)
+            except OSError:
+                # Mirrored concurrently by another process
+                if not path.exists():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def ls_remote(self, url: str, ref: Optional[str] = None) -> str:
+        """Returns the commit SHA `ref` points at on the remote, without fetching anything."""
+        self._check_reachable(url)
+        advertised = {}
+        patterns = [ref, f"{ref}^{{}}"] if ref else ["HEAD"]
+        try:
+            output = _run_git(["ls-remote", url] + patterns, timeout=LS_REMOTE_TIMEOUT)
+        except RuntimeError as e:
+            self._failed[url] = str(e)
+            raise
+        for line in output.splitlines():
+            sha, _, name = line.partition("\t")
+            advertised[name] = sha
+        names = ["HEAD"] if not ref else [ref, f"refs/heads/{ref}", f"refs/tags/{ref}", f"refs/{ref}"]
+        for name in names:
+            # Annotated tags are advertised twice; "^{}" is the commit they point at
+            sha = advertised.get(f"{name}^{{}}") or advertised.get(name)
+            if sha:
+                return sha
+        raise RuntimeError(f"Ref '{ref or 'HEAD'}' not found in {url}")
+
+    def checkout(self, url: str, sha: str, subdirectory: Optional[str] = None, remote: Optional[str] = None) -> Path:
+        """Checks out commit `sha` (only `subdirectory` of it, if given); returns the checkout root.
+
+        The fetch is shallow (depth 1) and blobless, and a sparse checkout
+        then downloads just the blobs under `subdirectory`, so the cost is
+        roughly the size of that directory rather than of the repository and
+        its history. `remote` overrides where to fetch from (e.g. the mirror).
+        Checkouts are immutable and shared under root/checkouts.
+        """
+        path = self.checkout_path(url, sha, subdirectory or "")
+        if path.exists():
+            return path
+        with self._locked(path):
+            if path.exists():
+                return path
+            logger.debug(f"Checking out {subdirectory or 'all'} of {url}@{sha[:12]}")
+            staging = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+            try:
+                _run_git(["init", "--quiet"], cwd=staging)
+                _run_git(["remote", "add", "origin", remote or url], cwd=staging)
+                if subdirectory:
+                    _run_git(["sparse-checkout", "set", subdirectory.strip("/")], cwd=staging)
+                _run_git(["fetch", "--quiet", "--depth", "1", "--filter=blob:none", "origin", sha], cwd=staging)
+                _run_git(["checkout", "--quiet", "FETCH_HEAD"], cwd=staging)
+                if subdirectory and not (staging / subdirectory).is_dir():
+                    raise RuntimeError(f"Subdirectory '{subdirectory}' not found in {url}@{sha[:12]}")
+                os.rename(staging, path)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        return path
+
+    def resolve(self, url: str, ref: Optional[str] = None) -> str:
+        """Returns the commit SHA `ref` (a branch, tag or commit; HEAD if None) points at in the mirror of `url`."""
+        path = self.fetch(url)
+        try:
+            return _run_git(["rev-parse", "--verify", "--quiet", f"{ref or 'HEAD'}^{{commit}}"], cwd=path).strip()
+        except RuntimeError:
+            raise RuntimeError(f"Ref '{ref or 'HEAD'}' not found in {url}")
+
+    def prefetch(self, urls: Iterable[str], jobs: int = PREFETCH_WORKERS) -> Dict[str, Path]:
+        """Fetches every URL concurrently on at most `jobs` threads.
+
+        Returns url -> mirror for the URLs that could be fetched; failures
+        are logged and left for uv to fetch directly.
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        if shutil.which("git") is None:
+            logger.warning("git is not installed, skipping git source prefetch")
+            return {}
+
+        def fetch_one(url: str) -> Optional[Path]:
+            try:
+                return self.fetch(url)
+            except (RuntimeError, OSError) as e:
+                logger.warning(f"Could not prefetch {url}: {e}")
+                return None
+
+        logger.info(f"Prefetching {len(urls)} git sources...")
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(urls)))) as pool:
+            mirrors = dict(zip(urls, pool.map(fetch_one, urls)))
+        return {url: path for url, path in mirrors.items() if path is not None}
+
+    @staticmethod
+    def redirect_env(mirrors: Dict[str, Path], base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Returns an environment in which git fetches each URL from its mirror."""
+        env = dict(os.environ if base is None else base)
+        count = int(env.get("GIT_CONFIG_COUNT", "0") or 0)
+        for url, path in mirrors.items():
+            env[f"GIT_CONFIG_KEY_{count}"] = f"url.{path.resolve().as_uri()}.insteadOf"
+            env[f"GIT_CONFIG_VALUE_{count}"] = url
+            count += 1
+        env["GIT_CONFIG_COUNT"] = str(count)
+        return env
+
+
+class GitPins:
+    """Commit SHAs the git refs of registry sources resolved to.
+
+    Stored in .hpm/state/git-pins.json as "<url>@<ref>" -> SHA. Installs use
+    the pinned SHA instead of a moving branch or tag, so uv can cache the
+    checkout and builds are reproducible until the pins are refreshed.
+    """
+
+    def __init__(self, state_dir: Path):
+        self.pins_file = state_dir / "git-pins.json"
+        self._pins: Optional[Dict[str, str]] = None
+
+    @staticmethod
+    def key(url: str, ref: Optional[str]) -> str:
+        return f"{url}@{ref or ''}"
+
+    def _load(self) -> Dict[str, str]:
+        if self._pins is None:
+            try:
+                with open(self.pins_file, "r") as f:
+                    self._pins = dict(json.load(f))
+            except (OSError, ValueError, TypeError):
+                self._pins = {}
+        return self._pins
+
+    def get(self, url: str, ref: Optional[str]) -> Optional[str]:
+        return self._load().get(self.key(url, ref))
+
+    def set(self, url: str, ref: Optional[str], sha: str) -> bool:
+        """Records a pin; returns True if it changed."""
+        pins = self._load()
+        key = self.key(url, ref)
+        if pins.get(key) == sha:
+            return False
+        pins[key] = sha
+        return True
+
+    def save(self):
+        try:
+            self.pins_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.pins_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(dict(sorted(self._load().items())), f, indent=2)
+            os.replace(tmp_file, self.pins_file)
+        except OSError as e:
+            logger.debug(f"Could not write git pins {self.pins_file}: {e}")
@@ -0,0 +1,131 @@
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional
+from .models import RegistryGroup
+
+
+def strongly_connected_components(graph: Mapping[str, Iterable[str]]) -> List[List[str]]:
+    """Tarjan's algorithm (iterative): returns SCCs in reverse topological order.
+
+    Edges to nodes that are not keys of `graph` are ignored.
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            node, successors = work[-1]
+            descended = False
+            for succ in successors:
+                if succ not in graph:
+                    continue
+                if succ not in index:
+                    index[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(graph[succ])))
+                    descended = True
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def _cycle_through(graph: Mapping[str, Iterable[str]], component: List[str]) -> List[str]:
+    """Returns one concrete cycle (start ... start) inside a strongly connected component."""
+    members = set(component)
+    start = min(component)
+    parents: Dict[str, Optional[str]] = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for succ in graph[node]:
+            if succ == start:
+                path = [node]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                return list(reversed(path)) + [start]
+            if succ in members and succ not in parents:
+                parents[succ] = node
+                queue.append(succ)
+    return [start, start]
+
+
+def find_cycles(graph: Mapping[str, Iterable[str]]) -> List[List[str]]:
+    """Returns one cycle per strongly connected component that contains a cycle."""
+    graph = {node: list(succs) for node, succs in graph.items()}
+    cycles = []
+    for component in strongly_connected_components(graph):
+        if len(component) > 1 or component[0] in graph[component[0]]:
+            cycles.append(_cycle_through(graph, component))
+    return sorted(cycles)
+
+
+def format_cycle(cycle: List[str]) -> str:
+    return " -> ".join(cycle)
+
+
+class GroupCycleError(ValueError):
+    """Raised when meta-group includes form one or more cycles."""
+
+    def __init__(self, cycles: List[List[str]]):
+        self.cycles = cycles
+        super().__init__("Cyclic group includes: " + "; ".join(format_cycle(c) for c in cycles))
+
+
+def expand_includes(groups: Mapping[str, RegistryGroup]) -> Dict[str, Dict[str, List[str]]]:
+    """Computes, for every group, the options contributed by its (transitive) includes.
+
+    An include contributes its `options` (or the included group's `default`)
+    for the included group, plus everything that group itself includes.
+    Groups are expanded once each, sinks first, so the whole registry is
+    expanded in time linear in the size of the include graph.
+    """
+    graph = {name: [inc.group for inc in group.includes] for name, group in groups.items()}
+    cycles = find_cycles(graph)
+    if cycles:
+        raise GroupCycleError(cycles)
+
+    expansions: Dict[str, Dict[str, List[str]]] = {}
+    for component in strongly_connected_components(graph):
+        name = component[0]
+        merged: Dict[str, List[str]] = {}
+        for inc in groups[name].includes:
+            included = groups.get(inc.group)
+            if included is None:
+                raise KeyError(f"Group '{name}' includes unknown group '{inc.group}'")
+            options = inc.options if inc.options is not None else (included.default or [])
+            for target, target_options in [(inc.group, options)] + list(expansions[inc.group].items()):
+                bucket = merged.setdefault(target, [])
+                bucket.extend(opt for opt in target_options if opt not in bucket)
+        expansions[name] = merged
+    return expansions
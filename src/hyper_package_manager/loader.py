@@ -0,0 +1,100 @@
+import os
+import hashlib
+import logging
+import yaml
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Parsing holds the GIL even with libyaml, so batches at least this large are
+# parsed in worker processes; smaller ones are not worth the process start-up.
+PROCESS_PARSE_THRESHOLD = 2000
+PARSE_CHUNK_SIZE = 256
+
+
+def parse_yaml(content: bytes) -> Any:
+    """Parses YAML with libyaml when available, falling back to pure Python."""
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def _parse_or_error(content: bytes) -> Any:
+    try:
+        return parse_yaml(content)
+    except yaml.YAMLError as e:
+        return e
+
+
+def _parse_chunk(chunk: List[bytes]) -> List[Any]:
+    return [_parse_or_error(content) for content in chunk]
+
+
+def _read(path: Path) -> Tuple[bytes, str]:
+    content = path.read_bytes()
+    return content, hashlib.sha256(content).hexdigest()
+
+
+class RegistryLoader:
+    """Bulk loader for registry YAML files.
+
+    Files are read and hashed on a thread pool (I/O bound, notably on network
+    filesystems), parsed with libyaml, and validated with one TypeAdapter call
+    per batch instead of one model construction per file.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._adapters: Dict[type, TypeAdapter] = {}
+
+    def read(self, paths: Sequence[Path]) -> List[Tuple[bytes, str]]:
+        """Returns (content, sha256) for every path, in order."""
+        if len(paths) <= 1:
+            return [_read(p) for p in paths]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(_read, paths))
+
+    def parse(self, contents: Sequence[bytes], paths: Sequence[Path], strict: bool = True) -> List[Any]:
+        """Parses raw YAML documents, using all cores for large batches.
+
+        With strict=False, documents that fail to parse are returned as their
+        yaml.YAMLError instead of raising.
+        """
+        cpus = os.cpu_count() or 1
+        if len(contents) < PROCESS_PARSE_THRESHOLD or cpus < 2:
+            results = _parse_chunk(list(contents))
+        else:
+            chunks = [list(contents[i:i + PARSE_CHUNK_SIZE]) for i in range(0, len(contents), PARSE_CHUNK_SIZE)]
+            logger.debug(f"Parsing {len(contents)} registry files on {cpus} processes")
+            with ProcessPoolExecutor(max_workers=cpus) as pool:
+                results = [data for chunk in pool.map(_parse_chunk, chunks) for data in chunk]
+
+        for path, data in zip(paths, results):
+            if strict and isinstance(data, yaml.YAMLError):
+                raise ValueError(f"Invalid YAML in registry file {path}: {data}")
+        return results
+
+    def validate(self, model: Type[ModelT], items: Sequence[Any], paths: Sequence[Path]) -> List[ModelT]:
+        """Validates parsed documents in a single batch call."""
+        adapter = self._adapters.get(model)
+        if adapter is None:
+            adapter = self._adapters[model] = TypeAdapter(List[model])
+        try:
+            return adapter.validate_python(items)
+        except ValidationError as e:
+            bad = sorted({err["loc"][0] for err in e.errors() if err["loc"]})
+            files = ", ".join(str(paths[i]) for i in bad if isinstance(i, int))
+            raise ValueError(f"Invalid registry file(s): {files}\n{e}") from e
+
+    def load(self, model: Type[ModelT], paths: Sequence[Path]) -> List[ModelT]:
+        """Reads, parses and validates a batch of files into models."""
+        contents = [content for content, _ in self.read(paths)]
+        return self.validate(model, self.parse(contents, paths), paths)
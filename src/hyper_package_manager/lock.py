@@ -0,0 +1,68 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from .dry_run import build_file_digests
+
+logger = logging.getLogger(__name__)
+
+LOCK_CACHE_VERSION = 2
+
+
+class LockCache:
+    """Content-addressed store of generated environments (pyproject.toml + uv.lock).
+
+    Entries live in .hpm/cache/locks/<key>/. The key hashes the mode, the
+    manifest hashes of the whole plugin closure, the uv requirements (git
+    sources pinned to commit SHAs) and the build files of local packages,
+    so every job asking for the same plugin set shares one resolution.
+    Entries are immutable once published.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.root = cache_dir / "locks"
+
+    def key(
+        self, mode: str, manifests: Dict[str, str], requirements: List[str], requires_python: Optional[str] = None
+    ) -> str:
+        payload = {
+            "version": LOCK_CACHE_VERSION,
+            "mode": mode,
+            "manifests": sorted(manifests.items()),
+            "requirements": requirements,
+            "requires_python": requires_python,
+            "build_files": build_file_digests(requirements),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Path]:
+        """Returns the directory of a cached environment, or None."""
+        path = self.root / key
+        return path if (path / "uv.lock").exists() else None
+
+    def put(self, key: str, build: Callable[[Path], Tuple[bool, str]]) -> Path:
+        """Builds an entry with `build(directory)` and publishes it atomically.
+
+        Raises RuntimeError with the uv output if the build fails; failures
+        are not cached.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.root))
+        try:
+            ok, output = build(staging)
+            if not ok or not (staging / "uv.lock").exists():
+                raise RuntimeError(f"Could not lock environment:\n{output.rstrip()}")
+            try:
+                os.rename(staging, self.root / key)
+            except OSError:
+                # Another process published the same key first; entries are identical
+                if self.get(key) is None:
+                    raise
+                logger.debug(f"Lock {key[:12]} was published concurrently")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return self.root / key
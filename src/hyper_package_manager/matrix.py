@@ -0,0 +1,44 @@
+import math
+import random
+from typing import Dict, List, Optional
+from .models import MatrixEntry
+
+MATRIX_VERSION = 1
+
+
+def enumerate_combinations(
+    candidates: Dict[str, List[str]], sample: Optional[int] = None, seed: Optional[int] = None
+) -> List[Dict[str, str]]:
+    """Returns one option per group for every combination (or a random sample of them).
+
+    Combinations are numbered in mixed radix over the sorted group names, so
+    sampling draws indices without materializing the full cross product.
+    """
+    names = sorted(name for name, options in candidates.items() if options)
+    sizes = [len(candidates[name]) for name in names]
+    total = math.prod(sizes) if names else 0
+    if sample is not None and sample < total:
+        indices = sorted(random.Random(seed).sample(range(total), sample))
+    else:
+        indices = range(total)
+
+    combinations = []
+    for index in indices:
+        combination = {}
+        for name, size in zip(reversed(names), reversed(sizes)):
+            index, position = divmod(index, size)
+            combination[name] = candidates[name][position]
+        combinations.append({name: combination[name] for name in names})
+    return combinations
+
+
+def matrix_report(entries: List[MatrixEntry]) -> dict:
+    """Builds the JSON compatibility table, stable enough to commit to the registry."""
+    groups = sorted({group for entry in entries for group in entry.options})
+    combinations = []
+    for entry in entries:
+        row = {"options": entry.options, "ok": entry.ok, "key": entry.key}
+        if not entry.ok:
+            row["error"] = entry.output.strip()
+        combinations.append(row)
+    return {"version": MATRIX_VERSION, "groups": groups, "combinations": combinations}
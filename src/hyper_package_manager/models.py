@@ -1,16 +1,35 @@
-from typing import Dict, List, Optional, Union, Literal
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union, Literal
 from pydantic import BaseModel, Field
 
+_NAME_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def normalize_name(name: str) -> str:
+    """Normalizes a package name as in PEP 503 (case and -_. insensitive)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
 class GroupOption(BaseModel):
     name: str
     description: Optional[str] = None
+    # Registry packages this option cannot be combined with / needs selected too
+    conflicts: List[str] = Field(default_factory=list)
+    requires: List[str] = Field(default_factory=list)
+
+class GroupInclude(BaseModel):
+    group: str
+    # Options selected in the included group; defaults to that group's `default`
+    options: Optional[List[str]] = None
 
 class RegistryGroup(BaseModel):
     name: str
     type: Literal["group"] = "group"
     strategy: Literal["1-of-N", "M-of-N"]
-    options: List[GroupOption]
+    options: List[GroupOption] = Field(default_factory=list)
     default: Optional[List[str]] = None
+    # Meta-groups pull in other groups when selected
+    includes: List[GroupInclude] = Field(default_factory=list)
 
 class Source(BaseModel):
     type: str  # "git", "local", "pypi"
@@ -28,6 +47,13 @@ class HPMDependency(BaseModel):
     name: str
     version: str = "*"
 
+def dependency_name(dep: Union[str, "HPMDependency"]) -> str:
+    """Returns the normalized package name of a dependency entry ("numpy>=1.20" -> "numpy")."""
+    if isinstance(dep, HPMDependency):
+        return normalize_name(dep.name)
+    match = _NAME_RE.match(dep)
+    return normalize_name(match.group(1) if match else dep)
+
 class Manifest(BaseModel):
     name: str
     version: str
@@ -35,4 +61,116 @@ class Manifest(BaseModel):
     type: str = "library"  # "library", "service", "virtual"
     sources: ManifestSources
     dependencies: List[Union[str, HPMDependency]] = Field(default_factory=list)
-    entrypoints: Dict[str, str] = Field(default_factory=dict)
\ No newline at end of file
+    entrypoints: Dict[str, str] = Field(default_factory=dict)
+    # Same rules as on GroupOption, applied wherever the package is selected
+    conflicts: List[str] = Field(default_factory=list)
+    requires: List[str] = Field(default_factory=list)
+
+class ManifestHeader(BaseModel):
+    name: str
+    version: str
+    description: Optional[str] = None
+    type: str = "library"
+    entrypoints: Dict[str, str] = Field(default_factory=dict)
+
+
+class LazyManifest:
+    """Read-only Manifest view over a manifest header.
+
+    Only the header fields are held; on first access to any other field
+    (`sources`, `dependencies`, ...) `load` reads the manifest body from its
+    YAML file or pack record and validates it into a full Manifest.
+    """
+
+    HEADER_FIELDS = frozenset(ManifestHeader.model_fields)
+    __slots__ = ("_data", "_header", "_load", "_manifest")
+
+    def __init__(self, data: dict, load: Callable[[], Manifest]):
+        self._data = data
+        self._header: Optional[ManifestHeader] = None
+        self._load = load
+        self._manifest: Optional[Manifest] = None
+
+    @property
+    def header(self) -> ManifestHeader:
+        if self._header is None:
+            self._header = ManifestHeader.model_validate(
+                {key: value for key, value in self._data.items() if key in self.HEADER_FIELDS}
+            )
+        return self._header
+
+    def materialize(self) -> Manifest:
+        """Returns the fully validated Manifest."""
+        if self._manifest is None:
+            self._manifest = self._load()
+        return self._manifest
+
+    def __getattr__(self, item: str):
+        if item in LazyManifest.HEADER_FIELDS:
+            return getattr(self.header, item)
+        return getattr(self.materialize(), item)
+
+    def __repr__(self) -> str:
+        return f"LazyManifest(name={self.header.name!r}, version={self.header.version!r})"
+
+
+class InstallTarget(BaseModel):
+    """What `uv pip install` gets for a manifest source: a requirement (or wheel) or a path to install in editable mode."""
+    requirement: Optional[str] = None
+    editable: Optional[Path] = None
+
+    @property
+    def args(self) -> List[str]:
+        return ["-e", str(self.editable)] if self.editable is not None else [self.requirement]
+
+
+class SyncPlan(BaseModel):
+    """Difference between the configured groups and what hpm last materialized.
+
+    All maps are package name -> uv requirement; `selection` is the
+    effective group -> options map the desired set was built from and
+    `packages` the registry packages it installs (HPM dependencies
+    included), dependencies first.
+    """
+    selection: Dict[str, List[str]] = Field(default_factory=dict)
+    packages: List[str] = Field(default_factory=list)
+    desired: Dict[str, str] = Field(default_factory=dict)
+    managed: Dict[str, str] = Field(default_factory=dict)
+    additions: Dict[str, str] = Field(default_factory=dict)
+    removals: List[str] = Field(default_factory=list)
+
+    @property
+    def is_noop(self) -> bool:
+        return not self.additions and not self.removals
+
+
+class CheckResult(BaseModel):
+    """Outcome of an isolated `uv lock` of a set of requirements."""
+    ok: bool
+    requirements: List[str] = Field(default_factory=list)
+    # uv's output; on failure this is the conflict report
+    output: str = ""
+    key: str = ""
+    cached: bool = False
+
+
+class WheelEntry(BaseModel):
+    """A wheel built once and cached in the wheelhouse."""
+    key: str
+    wheel: str
+    # What the wheel was built from (a local path or git URL)
+    source: str = ""
+    # Interpreter, ABI and platform the wheel was built for
+    tag: str = ""
+    size: int = 0
+    created: float = 0.0
+    last_used: float = 0.0
+
+
+class MatrixEntry(BaseModel):
+    """Resolution result for one option combination of `hpm check --matrix`."""
+    options: Dict[str, str]
+    ok: bool
+    output: str = ""
+    key: str = ""
+    cached: bool = False
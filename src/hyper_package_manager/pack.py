@@ -0,0 +1,171 @@
+import os
+import mmap
+import json
+import struct
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PACK_FILE = "registry.hpmpack"
+MAGIC = b"HPMPACK\x01"
+# magic, slot count, record count, slot table offset
+HEADER = struct.Struct("<8sIIQ")
+# key hash (0 = empty slot), record offset, record length
+SLOT = struct.Struct("<QQI")
+LENGTH = struct.Struct("<I")
+
+
+def _key_hash(kind: str, name: str) -> int:
+    digest = hashlib.blake2b(f"{kind}/{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") | 1
+
+
+def _entry(header: dict, data_offset: int) -> dict:
+    return {
+        "sha256": header["sha256"],
+        "header": header.get("header"),
+        "offset": data_offset,
+        "loose": header.get("loose", False),
+    }
+
+
+class RegistryPack:
+    """Read-only view of a packed registry file.
+
+    Layout: a fixed header, then one record per group/package, then an
+    open-addressing hash table keyed by "<kind>/<name>". Each record is a
+    length-prefixed JSON header ({kind, name, sha256, header, loose})
+    followed by the length-prefixed JSON model data, so names, hashes and
+    model headers can be listed without decoding the data, and a lookup by
+    name is a single seek. Packs written before model headers were recorded
+    have no `header`. `loose` marks entries whose YAML file was kept next to
+    the pack: that file stays authoritative, so once it is deleted or
+    renamed the packed entry is gone too.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.slot_count, self.record_count, self.table_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not an HPM registry pack: {path}")
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["RegistryPack"]:
+        """Opens the pack at path, or returns None if there is no usable pack."""
+        if not path.exists():
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable registry pack {path}: {e}")
+            return None
+
+    def close(self):
+        self._mm.close()
+
+    def _read_header(self, offset: int) -> Tuple[dict, int]:
+        (length,) = LENGTH.unpack_from(self._mm, offset)
+        start = offset + LENGTH.size
+        return json.loads(self._mm[start:start + length]), start + length
+
+    def read_data(self, offset: int) -> dict:
+        """Decodes the model data of the record whose data starts at offset."""
+        (length,) = LENGTH.unpack_from(self._mm, offset)
+        start = offset + LENGTH.size
+        return json.loads(self._mm[start:start + length])
+
+    def _records(self) -> Iterator[Tuple[dict, int]]:
+        offset = HEADER.size
+        while offset < self.table_offset:
+            header, data_offset = self._read_header(offset)
+            yield header, data_offset
+            (length,) = LENGTH.unpack_from(self._mm, data_offset)
+            offset = data_offset + LENGTH.size + length
+
+    def find(self, kind: str, name: str) -> Optional[dict]:
+        """Returns the entry ({sha256, header, offset, loose}) for a group or package without decoding its data."""
+        if not self.slot_count:
+            return None
+        key_hash = _key_hash(kind, name)
+        slot = key_hash & (self.slot_count - 1)
+        while True:
+            stored_hash, offset, _ = SLOT.unpack_from(self._mm, self.table_offset + slot * SLOT.size)
+            if stored_hash == 0:
+                return None
+            if stored_hash == key_hash:
+                header, data_offset = self._read_header(offset)
+                if header["kind"] == kind and header["name"] == name:
+                    return _entry(header, data_offset)
+            slot = (slot + 1) & (self.slot_count - 1)
+
+    def get(self, kind: str, name: str) -> Optional[dict]:
+        """Returns the entry ({sha256, data}) for a group or package, or None."""
+        entry = self.find(kind, name)
+        if entry is None:
+            return None
+        return {"sha256": entry["sha256"], "data": self.read_data(entry["offset"])}
+
+    def digests(self, kind: str) -> Dict[str, str]:
+        """Returns the content hash of every packed entry of a kind, without decoding data."""
+        return {header["name"]: header["sha256"] for header, _ in self._records() if header["kind"] == kind}
+
+    def headers(self, kind: str) -> Dict[str, dict]:
+        """Returns the entry ({sha256, header, offset, loose}) of every packed group or package of a kind."""
+        return {
+            header["name"]: _entry(header, data_offset)
+            for header, data_offset in self._records()
+            if header["kind"] == kind
+        }
+
+    def entries(self, kind: str) -> Dict[str, dict]:
+        """Returns every packed entry ({sha256, data, loose}) of a kind."""
+        return {
+            header["name"]: {"sha256": header["sha256"], "data": self.read_data(data_offset), "loose": header.get("loose", False)}
+            for header, data_offset in self._records()
+            if header["kind"] == kind
+        }
+
+
+def write_pack(path: Path, records: Iterable[Tuple[str, str, str, dict, dict]], loose: Iterable[Tuple[str, str]] = ()) -> int:
+    """Writes (kind, name, sha256, header, data) records to a new pack file atomically.
+
+    `loose` lists the (kind, name) records whose YAML file is kept next to
+    the pack. Returns the number of records written.
+    """
+    loose = set(loose)
+    body = bytearray()
+    slots = []
+    for kind, name, sha256, model_header, data in records:
+        offset = HEADER.size + len(body)
+        header = json.dumps({
+            "kind": kind, "name": name, "sha256": sha256, "header": model_header, "loose": (kind, name) in loose,
+        }).encode()
+        payload = json.dumps(data, separators=(",", ":")).encode()
+        body += LENGTH.pack(len(header)) + header + LENGTH.pack(len(payload)) + payload
+        slots.append((_key_hash(kind, name), offset, HEADER.size + len(body) - offset))
+
+    slot_count = 1
+    while slot_count < 2 * len(slots):
+        slot_count *= 2
+    table = [(0, 0, 0)] * slot_count
+    for key_hash, offset, length in slots:
+        slot = key_hash & (slot_count - 1)
+        while table[slot][0] != 0:
+            slot = (slot + 1) & (slot_count - 1)
+        table[slot] = (key_hash, offset, length)
+
+    table_offset = HEADER.size + len(body)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, slot_count, len(slots), table_offset))
+        f.write(body)
+        for entry in table:
+            f.write(SLOT.pack(*entry))
+    os.replace(tmp_path, path)
+    return len(slots)
@@ -0,0 +1,127 @@
+import gzip
+import base64
+import struct
+import hashlib
+import logging
+import binascii
+from typing import Dict
+
+try:
+    import zstandard
+except ImportError:  # zstd payloads need the optional zstandard package
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Lock payload layout (what HPM_LOCK_B64 carries, base64-encoded):
+#   header: magic, format version, codec id, sha256 of the uncompressed body
+#   body:   compressed sequence of (name length, name, content length, content)
+MAGIC = b"HPML"
+PAYLOAD_VERSION = 1
+HEADER = struct.Struct("<4sBB32s")
+ENTRY = struct.Struct("<HI")
+CODECS = {"none": 0, "gzip": 1, "zstd": 2}
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# Only these files can be restored from a payload
+PAYLOAD_FILES = ("pyproject.toml", "uv.lock")
+# Project name of generated environments; bootstrap may replace such a project
+ENV_PROJECT_NAME = "hpm-env"
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _compress(codec: str, body: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd payloads need the 'zstandard' package; use gzip instead")
+        return zstandard.ZstdCompressor(level=19).compress(body)
+    if codec == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    return body
+
+
+def _decompress(codec_id: int, data: bytes) -> bytes:
+    if codec_id == CODECS["zstd"]:
+        if zstandard is None:
+            raise RuntimeError("This payload is zstd-compressed but the 'zstandard' package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=1 << 30)
+    if codec_id == CODECS["gzip"]:
+        return gzip.decompress(data)
+    if codec_id == CODECS["none"]:
+        return data
+    raise ValueError(f"Unknown lock payload codec {codec_id}")
+
+
+def payload_digest(files: Dict[str, bytes]) -> str:
+    """Digest identifying the environment a set of lock files describes."""
+    sha = hashlib.sha256()
+    for name in sorted(files):
+        sha.update(name.encode() + b"\0" + hashlib.sha256(files[name]).digest())
+    return sha.hexdigest()
+
+
+def encode_payload(files: Dict[str, bytes], codec: str = "zstd") -> bytes:
+    """Packs lock files into a compressed, checksummed payload."""
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec '{codec}', expected one of {sorted(CODECS)}")
+    if codec == "zstd" and zstandard is None:
+        logger.debug("zstandard is not installed, compressing the lock payload with gzip")
+        codec = "gzip"
+
+    body = bytearray()
+    for name in sorted(files):
+        encoded = name.encode()
+        body += ENTRY.pack(len(encoded), len(files[name])) + encoded + files[name]
+    body = bytes(body)
+    header = HEADER.pack(MAGIC, PAYLOAD_VERSION, CODECS[codec], hashlib.sha256(body).digest())
+    return header + _compress(codec, body)
+
+
+def decode_payload(data: bytes) -> Dict[str, bytes]:
+    """Unpacks and verifies a payload; returns file name -> content.
+
+    Payloads without the hpm header are taken as a bare uv.lock, optionally
+    gzip- or zstd-compressed, as produced by plain `base64 uv.lock`.
+    """
+    if not data.startswith(MAGIC):
+        if data.startswith(GZIP_MAGIC):
+            data = _decompress(CODECS["gzip"], data)
+        elif data.startswith(ZSTD_MAGIC):
+            data = _decompress(CODECS["zstd"], data)
+        return {"uv.lock": data}
+
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated lock payload")
+    _, version, codec_id, checksum = HEADER.unpack_from(data)
+    if version != PAYLOAD_VERSION:
+        raise ValueError(f"Unsupported lock payload version {version}")
+    body = _decompress(codec_id, data[HEADER.size:])
+    if hashlib.sha256(body).digest() != checksum:
+        raise ValueError("Lock payload checksum mismatch (corrupted or truncated)")
+
+    files = {}
+    offset = 0
+    while offset < len(body):
+        name_len, size = ENTRY.unpack_from(body, offset)
+        offset += ENTRY.size
+        name = body[offset:offset + name_len].decode()
+        offset += name_len
+        if name not in PAYLOAD_FILES:
+            raise ValueError(f"Unexpected file '{name}' in lock payload")
+        files[name] = body[offset:offset + size]
+        offset += size
+    return files
+
+
+def read_payload(raw: bytes) -> bytes:
+    """Accepts a payload either raw or base64-encoded (as in HPM_LOCK_B64)."""
+    if raw.startswith((MAGIC, GZIP_MAGIC, ZSTD_MAGIC)):
+        return raw
+    try:
+        return base64.b64decode(b"".join(raw.split()), validate=True)
+    except binascii.Error:
+        # Not base64: a plain uv.lock file
+        return raw
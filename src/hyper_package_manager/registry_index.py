@@ -0,0 +1,300 @@
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+from pydantic import BaseModel
+from .models import LazyManifest, Manifest, ManifestHeader, RegistryGroup
+from .loader import RegistryLoader
+from .pack import PACK_FILE, RegistryPack
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+# Files modified this close to the moment the index was written may have been
+# changed again without a visible mtime/size change ("racy" entries), so their
+# stamps are not trusted and the content hash is compared instead.
+RACY_WINDOW_NS = 2_000_000_000
+# Kinds whose index entries only keep a header; their full models are built
+# from the YAML file or pack record when needed. Other kinds are small and
+# keep their whole data in the index.
+HEADERS: Dict[str, Type[BaseModel]] = {"packages": ManifestHeader}
+
+
+def model_header(kind: str, data: dict) -> dict:
+    """Returns what the index keeps of a group's or package's (validated) data."""
+    header = HEADERS.get(kind)
+    return data if header is None else header.model_validate(data).model_dump(mode="json")
+
+
+class RegistryIndex:
+    """Persistent index of parsed registry files stored under .hpm/cache.
+
+    Every entry keeps the mtime/size/sha256 stamp of its source YAML file, so
+    a warm lookup costs one stat() per file and files are only reparsed when
+    their content actually changed. Stale files are reloaded in bulk through
+    RegistryLoader. Package entries only keep the manifest header (see
+    HEADERS), so the index stays small and a refresh only validates headers;
+    full manifests are read from their file or pack record on demand.
+
+    If the registry has been packed (see pack.py), packed entries serve as the
+    base layer and loose YAML files present on disk override them. Entries
+    packed while their loose file was kept only exist as long as that file.
+    """
+
+    KINDS: Dict[str, Type[BaseModel]] = {"groups": RegistryGroup, "packages": Manifest}
+
+    def __init__(self, registry_path: Path, cache_dir: Path, loader: Optional[RegistryLoader] = None):
+        self.registry_path = registry_path
+        self.loader = loader or RegistryLoader()
+        self.index_file = cache_dir / "registry-index.json"
+        self._entries: Optional[Dict[str, Dict[str, dict]]] = None
+        self._models: Dict[str, Dict[str, BaseModel]] = {kind: {} for kind in self.KINDS}
+        # Documents parsed by a refresh, so materializing them does not read the file again
+        self._bodies: Dict[str, Dict[str, dict]] = {kind: {} for kind in self.KINDS}
+        self._written_ns = 0
+        self._dirty = False
+        self._pack: Optional[RegistryPack] = None
+        # (inode, mtime, size) of the open pack; False until first checked
+        self._pack_stamp: object = False
+
+    @property
+    def pack(self) -> Optional[RegistryPack]:
+        """The packed base layer of the registry, if one exists.
+
+        The pack file is re-stat'ed on every access and reopened when
+        `hpm registry pack` replaced or removed it, so long-lived processes
+        (the daemon) never serve a stale pack.
+        """
+        try:
+            st = (self.registry_path / PACK_FILE).stat()
+            stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+        if stamp != self._pack_stamp:
+            if self._pack is not None:
+                self._pack.close()
+            self._pack = RegistryPack.open(self.registry_path / PACK_FILE) if stamp is not None else None
+            self._pack_stamp = stamp
+            # Models may have been built from the previous pack
+            self._models = {kind: {} for kind in self.KINDS}
+        return self._pack
+
+    def _load(self) -> Dict[str, Dict[str, dict]]:
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {kind: {} for kind in self.KINDS}
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION and data.get("registry") == str(self.registry_path.resolve()):
+                    for kind in self.KINDS:
+                        self._entries[kind] = data.get(kind, {})
+                    self._written_ns = data.get("written_ns", 0)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable registry index {self.index_file}: {e}")
+        return self._entries
+
+    def save(self):
+        """Writes the index back to disk if anything changed."""
+        if not self._dirty or self._entries is None:
+            return
+
+        self._written_ns = time.time_ns()
+        data = {
+            "version": INDEX_VERSION,
+            "registry": str(self.registry_path.resolve()),
+            "written_ns": self._written_ns,
+        }
+        data.update(self._entries)
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                # json.dumps uses the C encoder; json.dump streams through the Python one
+                f.write(json.dumps(data))
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Could not write registry index {self.index_file}: {e}")
+
+    def _refresh(self, kind: str, stats: Iterable[Tuple[str, Path, os.stat_result]]) -> Dict[str, dict]:
+        """Returns index entries for the given files, reparsing only those whose content changed."""
+        entries = self._load()[kind]
+        result: Dict[str, dict] = {}
+        to_read: List[Tuple[str, Path, os.stat_result]] = []
+
+        for name, path, st in stats:
+            entry = entries.get(name)
+            if (
+                entry
+                and entry["mtime_ns"] == st.st_mtime_ns
+                and entry["size"] == st.st_size
+                and st.st_mtime_ns + RACY_WINDOW_NS < self._written_ns
+            ):
+                result[name] = entry
+            else:
+                to_read.append((name, path, st))
+
+        if not to_read:
+            return result
+
+        to_parse = []
+        for (name, path, st), (content, digest) in zip(to_read, self.loader.read([p for _, p, _ in to_read])):
+            entry = entries.get(name)
+            if entry and entry["sha256"] == digest:
+                entry["mtime_ns"] = st.st_mtime_ns
+                entry["size"] = st.st_size
+                result[name] = entry
+            else:
+                to_parse.append((name, path, st, content, digest))
+        self._dirty = True
+
+        if to_parse:
+            logger.debug(f"Parsing {len(to_parse)} '{kind}' registry files")
+            paths = [item[1] for item in to_parse]
+            documents = self.loader.parse([item[3] for item in to_parse], paths)
+            models = self.loader.validate(HEADERS.get(kind, self.KINDS[kind]), documents, paths)
+            for (name, _, st, _, digest), document, model in zip(to_parse, documents, models):
+                entry = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "sha256": digest,
+                    "header": model.model_dump(mode="json"),
+                }
+                entries[name] = entry
+                if kind in HEADERS:
+                    self._models[kind].pop(name, None)
+                    self._bodies[kind][name] = document
+                else:
+                    self._models[kind][name] = model
+                result[name] = entry
+        return result
+
+    def _header(self, kind: str, entry: dict) -> dict:
+        if entry["header"] is None:
+            # Packed by a version of hpm that did not record headers
+            entry["header"] = model_header(kind, self.pack.read_data(entry["offset"]))
+        return entry["header"]
+
+    def _read_bodies(self, kind: str, entries: Dict[str, dict]) -> List[dict]:
+        """Returns the full data of entries from parsed documents, pack records or their YAML files."""
+        bodies: Dict[str, dict] = {}
+        loose = []
+        pack = self.pack
+        for name, entry in entries.items():
+            if kind not in HEADERS:
+                bodies[name] = self._header(kind, entry)
+            elif name in self._bodies[kind]:
+                bodies[name] = self._bodies[kind][name]
+            elif "offset" in entry:
+                bodies[name] = pack.read_data(entry["offset"])
+            else:
+                loose.append(name)
+        if loose:
+            paths = [self.registry_path / kind / f"{name}.yaml" for name in loose]
+            contents = [content for content, _ in self.loader.read(paths)]
+            bodies.update(zip(loose, self.loader.parse(contents, paths)))
+        return [bodies[name] for name in entries]
+
+    def _materialize(self, kind: str, entries: Dict[str, dict]) -> Dict[str, BaseModel]:
+        """Builds models for index entries, validating uncached ones in one batch."""
+        cache = self._models[kind]
+        missing = [name for name in entries if name not in cache]
+        if missing:
+            paths = [self.registry_path / kind / f"{name}.yaml" for name in missing]
+            bodies = self._read_bodies(kind, {name: entries[name] for name in missing})
+            models = self.loader.validate(self.KINDS[kind], bodies, paths)
+            cache.update(zip(missing, models))
+            for name in missing:
+                self._bodies[kind].pop(name, None)
+        return {name: cache[name] for name in entries}
+
+    def _forget(self, kind: str, name: str):
+        if self._load()[kind].pop(name, None) is not None:
+            self._dirty = True
+        self._models[kind].pop(name, None)
+        self._bodies[kind].pop(name, None)
+
+    def _scan(self, kind: str) -> Dict[str, dict]:
+        """Refreshes every file of a kind and drops entries whose file is gone.
+
+        Packed entries without a loose override are included.
+        """
+        directory = self.registry_path / kind
+        stats = []
+        if directory.exists():
+            with os.scandir(directory) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith(".yaml") or not dir_entry.is_file():
+                        continue
+                    stats.append((dir_entry.name[:-len(".yaml")], Path(dir_entry.path), dir_entry.stat()))
+        stats.sort(key=lambda item: item[0])
+
+        entries = self._refresh(kind, stats)
+        for name in list(self._load()[kind]):
+            if name not in entries:
+                self._forget(kind, name)
+        self.save()
+
+        pack = self.pack
+        if pack is not None:
+            for name, entry in pack.headers(kind).items():
+                # A packed entry whose loose file was kept is gone with that file
+                if not entry["loose"]:
+                    entries.setdefault(name, entry)
+        return {name: entries[name] for name in sorted(entries)}
+
+    def _lookup(self, kind: str, names: Iterable[str]) -> Dict[str, dict]:
+        """Refreshes the named files only, falling back to the pack for missing ones."""
+        stats = []
+        packed = {}
+        pack = self.pack
+        for name in names:
+            path = self.registry_path / kind / f"{name}.yaml"
+            try:
+                stats.append((name, path, path.stat()))
+            except FileNotFoundError:
+                self._forget(kind, name)
+                entry = pack.find(kind, name) if pack is not None else None
+                if entry is not None and not entry["loose"]:
+                    packed[name] = entry
+
+        entries = self._refresh(kind, stats)
+        self.save()
+        result = {name: entries[name] for name, _, _ in stats}
+        result.update(packed)
+        return result
+
+    def get_many(self, kind: str, names: Iterable[str]) -> Dict[str, BaseModel]:
+        """Returns the named groups or packages that exist, skipping missing ones."""
+        return self._materialize(kind, self._lookup(kind, names))
+
+    def lazy_manifests(self, names: Optional[Iterable[str]] = None) -> Dict[str, LazyManifest]:
+        """Returns header-only manifest views, for every package or only `names`.
+
+        No manifest body is read unless a view's body fields are accessed.
+        """
+        entries = self._scan("packages") if names is None else self._lookup("packages", names)
+        return {
+            name: LazyManifest(
+                self._header("packages", entry),
+                lambda name=name, entry=entry: self._materialize("packages", {name: entry})[name],
+            )
+            for name, entry in entries.items()
+        }
+
+    def get(self, kind: str, name: str) -> Optional[BaseModel]:
+        """Returns a single group or package by name, or None if it does not exist."""
+        return self.get_many(kind, [name]).get(name)
+
+    def all(self, kind: str) -> Dict[str, BaseModel]:
+        """Returns every group or package in the registry keyed by registry name."""
+        return self._materialize(kind, self._scan(kind))
+
+    def digests(self, kind: str) -> Dict[str, str]:
+        """Returns the content hash of every group or package without building models."""
+        return {name: entry["sha256"] for name, entry in self._scan(kind).items()}
@@ -0,0 +1,240 @@
+import os
+import re
+import json
+import hashlib
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from .models import HPMDependency, Manifest
+from .groups import find_cycles, format_cycle, strongly_connected_components
+
+logger = logging.getLogger(__name__)
+
+RESOLVE_VERSION = 2
+
+_VERSION_RE = re.compile(r"^\s*v?(\d+(?:\.\d+)*)(.*)$")
+_CLAUSE_RE = re.compile(r"(\^|~=|~|==|!=|>=|<=|>|<|=)?\s*v?(\d+(?:\.\d+)*(?:\.\*)?[\w.+-]*)")
+
+# Pre-, post- and dev-release segments as in PEP 440, with its alternative spellings
+_SUFFIX_RE = re.compile(
+    r"^(?:[-_.]?(?P<pre>alpha|beta|preview|pre|rc|a|b|c)[-_.]?(?P<pre_n>\d*))?"
+    r"(?:[-_.]?(?P<post>post|rev|r)[-_.]?(?P<post_n>\d*))?"
+    r"(?:[-_.]?(?P<dev>dev)[-_.]?(?P<dev_n>\d*))?"
+    r"(?:\+[a-z0-9]+(?:[-_.][a-z0-9]+)*)?$",
+    re.IGNORECASE,
+)
+_PRE_RANKS = {"alpha": 0, "a": 0, "beta": 1, "b": 1, "preview": 2, "pre": 2, "rc": 2, "c": 2}
+
+# Release, then (pre, post, dev) ordered as dev < a < b < rc < final < post
+Version = Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]]
+
+
+class ResolutionError(ValueError):
+    """Raised when HPM-to-HPM dependencies cannot be satisfied from the registry."""
+
+
+def parse_version(version: str) -> Version:
+    """Parses a version into a comparable key.
+
+    Pre-release (a/b/rc), post-release and dev segments are compared
+    numerically as in PEP 440: 1.0.dev1 < 1.0a1 < 1.0rc2 < 1.0rc10 < 1.0 <
+    1.0.post1. A local version label (+...) is ignored.
+    """
+    match = _VERSION_RE.match(version)
+    suffix = _SUFFIX_RE.match(match.group(2).strip()) if match else None
+    if not suffix:
+        raise ValueError(f"Invalid version '{version}'")
+    release = [int(part) for part in match.group(1).split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+
+    if suffix["pre"]:
+        pre = (1, _PRE_RANKS[suffix["pre"].lower()], int(suffix["pre_n"] or 0))
+    elif suffix["dev"] and not suffix["post"]:
+        # 1.0.dev1 comes before every pre-release of 1.0
+        pre = (0,)
+    else:
+        pre = (2,)
+    post = (1, int(suffix["post_n"] or 0)) if suffix["post"] else (0,)
+    dev = (0, int(suffix["dev_n"] or 0)) if suffix["dev"] else (1,)
+    return tuple(release), (pre, post, dev)
+
+
+def _is_pre_release(key: Version) -> bool:
+    """True for pre-releases and dev releases."""
+    pre, _, dev = key[1]
+    return pre != (2,) or dev != (1,)
+
+
+def _bump(parts: List[int]) -> Version:
+    return parse_version(".".join(str(p) for p in parts[:-1] + [parts[-1] + 1]))
+
+
+@lru_cache(maxsize=1024)
+def parse_constraint(spec: str) -> Tuple[Tuple[str, object], ...]:
+    """Parses caret (^1.2), tilde (~1.2, ~=1.2), comparison and wildcard constraints.
+
+    Clauses are separated by commas or whitespace and must all hold; "*" or
+    an empty string matches every version.
+    """
+    spec = spec.strip()
+    if spec in ("", "*"):
+        return ()
+    if _CLAUSE_RE.sub("", spec).replace(",", "").strip():
+        raise ValueError(f"Invalid version constraint '{spec}'")
+
+    clauses = []
+    for op, version in _CLAUSE_RE.findall(spec):
+        if version.endswith(".*"):
+            if op not in ("", "=", "==", "!="):
+                raise ValueError(f"Wildcards are only allowed with == and != in '{spec}'")
+            prefix = tuple(int(p) for p in version[:-2].split("."))
+            clauses.append(("!=*" if op == "!=" else "==*", prefix))
+            continue
+
+        parts = [int(p) for p in _VERSION_RE.match(version).group(1).split(".")]
+        lower = parse_version(version)
+        if op == "^":
+            # Bump the first non-zero component (the last one if all are zero)
+            index = next((i for i, p in enumerate(parts) if p != 0), len(parts) - 1)
+            clauses += [(">=", lower), ("<", _bump(parts[:index + 1]))]
+        elif op == "~":
+            clauses += [(">=", lower), ("<", _bump(parts[:2] if len(parts) > 1 else parts))]
+        elif op == "~=":
+            if len(parts) < 2:
+                raise ValueError(f"'~=' needs at least two version components in '{spec}'")
+            clauses += [(">=", lower), ("<", _bump(parts[:-1]))]
+        else:
+            clauses.append(({"": "==", "=": "=="}.get(op, op), lower))
+    return tuple(clauses)
+
+
+def satisfies(version: str, spec: str) -> bool:
+    """True if `version` matches the constraint `spec`."""
+    key = parse_version(version)
+    for op, bound in parse_constraint(spec):
+        if op in ("==*", "!=*"):
+            release = key[0] + (0,) * max(0, len(bound) - len(key[0]))
+            matched = release[:len(bound)] == bound
+            if matched != (op == "==*"):
+                return False
+        elif not {
+            "==": key == bound,
+            "!=": key != bound,
+            ">=": key >= bound,
+            "<=": key <= bound,
+            ">": key > bound,
+            # As in PEP 440, "<2.0" (and so ^1.2) excludes 2.0 pre-releases
+            "<": key < bound and not (key[0] == bound[0] and _is_pre_release(key) and not _is_pre_release(bound)),
+        }[op]:
+            return False
+    return True
+
+
+def hpm_dependencies(manifest: Manifest) -> List[HPMDependency]:
+    """Returns the registry (HPM-to-HPM) dependencies of a manifest; plain strings are left to uv."""
+    return [dep for dep in manifest.dependencies if isinstance(dep, HPMDependency)]
+
+
+class DependencyResolver:
+    """Expands HPM-to-HPM dependencies into an ordered install set.
+
+    The transitive closure is loaded from the registry one layer at a time,
+    every edge's version constraint is checked against the manifest version,
+    and the result is ordered dependencies-first. Results are memoized in
+    .hpm/cache/hpm-deps.json per registry version (hash of all package files)
+    and set of roots.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[List[str]], Dict[str, Manifest]],
+        digests: Callable[[], Dict[str, str]],
+        cache_dir: Path,
+    ):
+        self.load = load
+        self.digests = digests
+        self.cache_file = cache_dir / "hpm-deps.json"
+        # Registry version and memo are read once per resolver instance
+        self._memo: Optional[dict] = None
+
+    def _load_memo(self) -> dict:
+        if self._memo is None:
+            payload = [RESOLVE_VERSION, sorted(self.digests().items())]
+            version = hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+            try:
+                with open(self.cache_file, "r") as f:
+                    memo = json.load(f)
+                if memo["version"] != version:
+                    memo = None
+            except (OSError, ValueError, KeyError):
+                memo = None
+            self._memo = memo or {"version": version, "closures": {}}
+        return self._memo
+
+    def resolve(self, roots: List[Tuple[str, str]]) -> List[str]:
+        """Returns the registry packages needed for `roots` ((name, constraint) pairs), dependencies first."""
+        if not roots:
+            return []
+        memo = self._load_memo()
+        key = json.dumps(sorted(roots))
+        if key in memo["closures"]:
+            return memo["closures"][key]
+
+        order = self._resolve(roots)
+        memo["closures"][key] = order
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                f.write(json.dumps(memo))
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.debug(f"Could not write dependency cache {self.cache_file}: {e}")
+        return order
+
+    def _resolve(self, roots: List[Tuple[str, str]]) -> List[str]:
+        graph: Dict[str, List[str]] = {}
+        versions: Dict[str, str] = {}
+        # (dependent, or "" for roots; dependency; constraint)
+        edges: List[Tuple[str, str, str]] = [("", name, spec) for name, spec in sorted(roots)]
+        layer = list(dict.fromkeys(name for _, name, _ in edges))
+
+        while layer:
+            manifests = self.load(layer)
+            next_layer = []
+            for name in layer:
+                manifest = manifests.get(name)
+                if manifest is None:
+                    dependents = [parent for parent, dep, _ in edges if dep == name]
+                    if any(dependents):
+                        raise ResolutionError(
+                            f"Package '{name}' (required by {', '.join(sorted(filter(None, dependents)))}) not found in registry"
+                        )
+                    raise ResolutionError(f"Package '{name}' not found in registry")
+                versions[name] = manifest.version
+                graph[name] = []
+                for dep in hpm_dependencies(manifest):
+                    graph[name].append(dep.name)
+                    edges.append((name, dep.name, dep.version))
+                    if dep.name not in graph and dep.name not in next_layer:
+                        next_layer.append(dep.name)
+            layer = [name for name in next_layer if name not in graph]
+
+        unsatisfied = []
+        for parent, name, spec in edges:
+            try:
+                ok = satisfies(versions[name], spec)
+            except ValueError as e:
+                raise ResolutionError(f"{parent or 'Selection'}: {e}")
+            if not ok:
+                unsatisfied.append(f"{parent or 'selection'} requires {name} {spec}, registry has {versions[name]}")
+        if unsatisfied:
+            raise ResolutionError("Unsatisfiable HPM dependencies: " + "; ".join(unsatisfied))
+
+        cycles = find_cycles(graph)
+        if cycles:
+            raise ResolutionError("Cyclic HPM dependencies: " + "; ".join(format_cycle(c) for c in cycles))
+        # Tarjan emits components sinks first, i.e. dependencies before dependents
+        return [component[0] for component in strongly_connected_components(graph)]
@@ -0,0 +1,237 @@
+import re
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from .models import HPMDependency, Manifest, RegistryGroup, dependency_name, normalize_name
+from . import fuzzy
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 3
+# Upper bound on trigram candidates re-scored in Python by fuzzy lookups.
+FUZZY_CANDIDATES = 200
+# bm25() column weights: name, options, description, dependencies, entrypoints
+COLUMN_WEIGHTS = (10.0, 5.0, 2.0, 1.0, 1.0)
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _names(kind: str, name: str, model: BaseModel) -> List[str]:
+    """Returns the names a document should be found under by fuzzy lookup."""
+    names = {name, model.name}
+    if kind == "groups":
+        names.update(opt.name for opt in model.options)
+    return sorted(names)
+
+
+def _edges(kind: str, model: BaseModel) -> List[Tuple[str, str]]:
+    """Returns the (relation, normalized target) pairs a document points to."""
+    if kind == "groups":
+        return [("option", normalize_name(opt.name)) for opt in model.options]
+    edges = [("depends", dependency_name(dep)) for dep in model.dependencies]
+    edges.extend(("entrypoint", name) for name in model.entrypoints)
+    return sorted(set(edges))
+
+
+def _document(kind: str, model: BaseModel) -> Dict[str, str]:
+    """Flattens a group or manifest into the searchable text columns."""
+    if kind == "groups":
+        group: RegistryGroup = model
+        return {
+            "name": group.name,
+            "options": " ".join(f"{opt.name} {opt.description or ''}" for opt in group.options),
+            "description": "",
+            "dependencies": "",
+            "entrypoints": "",
+        }
+
+    manifest: Manifest = model
+    deps = [dep.name if isinstance(dep, HPMDependency) else dep for dep in manifest.dependencies]
+    return {
+        "name": manifest.name,
+        "options": "",
+        "description": manifest.description or "",
+        "dependencies": " ".join(deps),
+        "entrypoints": " ".join(f"{name} {cmd}" for name, cmd in manifest.entrypoints.items()),
+    }
+
+
+class SearchIndex:
+    """SQLite index over the registry stored under .hpm/cache.
+
+    Holds an FTS5 full-text index, name trigrams for fuzzy lookup and a
+    reverse index of group options, dependencies and entrypoints. Documents
+    are keyed by (kind, name) together with the content hash of their source
+    file, so only added, changed or removed files touch the index.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.db_path = cache_dir / "search.db"
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Callers serialize access (the daemon serves requests from several threads)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.executescript(
+                """
+                DROP TABLE IF EXISTS docs;
+                DROP TABLE IF EXISTS docs_fts;
+                DROP TABLE IF EXISTS trigrams;
+                DROP TABLE IF EXISTS edges;
+                CREATE TABLE docs (
+                    id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    UNIQUE (kind, name)
+                );
+                CREATE VIRTUAL TABLE docs_fts USING fts5(
+                    name, options, description, dependencies, entrypoints,
+                    tokenize = 'unicode61'
+                );
+                CREATE TABLE trigrams (
+                    trigram TEXT NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    name TEXT NOT NULL
+                );
+                CREATE INDEX trigrams_by_trigram ON trigrams (trigram);
+                CREATE INDEX trigrams_by_doc ON trigrams (doc_id);
+                CREATE TABLE edges (
+                    doc_id INTEGER NOT NULL,
+                    relation TEXT NOT NULL,
+                    target TEXT NOT NULL
+                );
+                CREATE INDEX edges_by_target ON edges (relation, target);
+                CREATE INDEX edges_by_doc ON edges (doc_id);
+                """
+            )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        self._conn = conn
+        return conn
+
+    def update(self, kind: str, digests: Dict[str, str], load: Callable[[List[str]], Dict[str, BaseModel]]):
+        """Brings the documents of one kind in line with the given content hashes.
+
+        `load` is called once with the names of the documents that are new or
+        whose hash changed.
+        """
+        conn = self._connect()
+        indexed = {
+            name: (doc_id, sha256)
+            for doc_id, name, sha256 in conn.execute("SELECT id, name, sha256 FROM docs WHERE kind = ?", (kind,))
+        }
+
+        changed = 0
+        with conn:
+            for name, (doc_id, sha256) in indexed.items():
+                if digests.get(name) != sha256:
+                    conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+                    conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+                    conn.execute("DELETE FROM trigrams WHERE doc_id = ?", (doc_id,))
+                    conn.execute("DELETE FROM edges WHERE doc_id = ?", (doc_id,))
+                    changed += 1
+
+            stale = [name for name, sha256 in digests.items() if name not in indexed or indexed[name][1] != sha256]
+            models = load(stale) if stale else {}
+            for name in stale:
+                sha256 = digests[name]
+                model = models[name]
+                doc = _document(kind, model)
+                cursor = conn.execute("INSERT INTO docs (kind, name, sha256) VALUES (?, ?, ?)", (kind, name, sha256))
+                doc["rowid"] = cursor.lastrowid
+                conn.execute(
+                    "INSERT INTO docs_fts (rowid, name, options, description, dependencies, entrypoints) "
+                    "VALUES (:rowid, :name, :options, :description, :dependencies, :entrypoints)",
+                    doc,
+                )
+                conn.executemany(
+                    "INSERT INTO trigrams (trigram, doc_id, name) VALUES (?, ?, ?)",
+                    [
+                        (trigram, cursor.lastrowid, doc_name)
+                        for doc_name in _names(kind, name, model)
+                        for trigram in fuzzy.trigrams(doc_name)
+                    ],
+                )
+                conn.executemany(
+                    "INSERT INTO edges (doc_id, relation, target) VALUES (?, ?, ?)",
+                    [(cursor.lastrowid, relation, target) for relation, target in _edges(kind, model)],
+                )
+                changed += 1
+
+        if changed:
+            logger.debug(f"Search index: updated {changed} '{kind}' documents")
+
+    def search(self, query: str, limit: int = 50) -> Dict[str, List[str]]:
+        """Returns group and package names matching all query terms, best match first."""
+        results: Dict[str, List[str]] = {"groups": [], "packages": []}
+        terms = TOKEN_RE.findall(query.lower())
+        if not terms:
+            return results
+
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(w) for w in COLUMN_WEIGHTS)
+        rows = self._connect().execute(
+            f"SELECT docs.kind, docs.name FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid "
+            f"WHERE docs_fts MATCH ? ORDER BY bm25(docs_fts, {weights}) LIMIT ?",
+            (match, limit),
+        )
+        for kind, name in rows:
+            results[kind].append(name)
+        return results
+
+    def referrers(self, relation: str, target: str) -> List[str]:
+        """Returns the documents with a `relation` edge to target, sorted by name.
+
+        Relations: "option" (groups offering a package), "depends" (packages
+        depending on a package) and "entrypoint" (packages defining an
+        entrypoint name). Package targets are matched by normalized name.
+        """
+        if relation != "entrypoint":
+            target = normalize_name(target)
+        rows = self._connect().execute(
+            "SELECT docs.name FROM edges JOIN docs ON docs.id = edges.doc_id "
+            "WHERE edges.relation = ? AND edges.target = ? ORDER BY docs.name",
+            (relation, target),
+        )
+        return [name for (name,) in rows]
+
+    def fuzzy_search(
+        self, query: str, kind: Optional[str] = None, limit: int = 10, cutoff: float = fuzzy.DEFAULT_CUTOFF
+    ) -> List[Tuple[str, str, str]]:
+        """Returns (kind, document, matched name) triples for names resembling query.
+
+        Candidates sharing the most trigrams with the query are fetched from the
+        index and re-scored, so the cost does not grow with the registry size.
+        """
+        query_trigrams = sorted(fuzzy.trigrams(query))
+        if not query_trigrams:
+            return []
+
+        placeholders = ", ".join("?" for _ in query_trigrams)
+        sql = (
+            f"SELECT docs.kind, docs.name, trigrams.name, COUNT(*) AS hits FROM trigrams "
+            f"JOIN docs ON docs.id = trigrams.doc_id WHERE trigrams.trigram IN ({placeholders})"
+        )
+        params: list = list(query_trigrams)
+        if kind is not None:
+            sql += " AND docs.kind = ?"
+            params.append(kind)
+        sql += " GROUP BY trigrams.doc_id, trigrams.name ORDER BY hits DESC LIMIT ?"
+        params.append(FUZZY_CANDIDATES)
+
+        best: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        for doc_kind, doc_name, matched, _ in self._connect().execute(sql, params):
+            score = fuzzy.similarity(query, matched)
+            if score >= cutoff and score > best.get((doc_kind, doc_name), (0.0, ""))[0]:
+                best[(doc_kind, doc_name)] = (score, matched)
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0][1]))
+        return [(doc_kind, doc_name, matched) for (doc_kind, doc_name), (_, matched) in ranked[:limit]]
@@ -0,0 +1,120 @@
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from .pack import PACK_FILE
+from .uv_manager import project_venv
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 3
+
+
+def _sha256_file(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class SyncState:
+    """Fingerprint of the inputs of the last successful `hpm sync`.
+
+    Stored in .hpm/state/sync.json. The fingerprint covers the
+    [tool.hpm.groups] table, the registry location and the content of every
+    registry file the sync read (group files, selected manifests and the
+    registry pack), so checking it costs a handful of small file reads
+    instead of a registry load and a uv resolution. Callers add the SHAs
+    pinned for the synced git refs through `extra`.
+    """
+
+    def __init__(self, project_root: Path, registry_path: Path):
+        self.project_root = project_root
+        self.registry_path = registry_path
+        self.state_file = project_root / ".hpm" / "state" / "sync.json"
+
+    def _load(self) -> dict:
+        try:
+            with open(self.state_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") == STATE_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _input_stamps(self, inputs: Iterable[str]) -> Dict[str, Optional[str]]:
+        stamps = {}
+        for rel in inputs:
+            path = self.registry_path / rel
+            if rel == PACK_FILE:
+                # The pack can be large: its stamp stands in for its content
+                try:
+                    st = path.stat()
+                    stamps[rel] = f"{st.st_mtime_ns}:{st.st_size}"
+                except FileNotFoundError:
+                    stamps[rel] = None
+            else:
+                stamps[rel] = _sha256_file(path)
+        return stamps
+
+    def fingerprint(self, groups_config: Dict, inputs: Iterable[str], extra: Optional[Dict] = None) -> str:
+        payload = {
+            "groups": groups_config,
+            "registry": str(self.registry_path.resolve()),
+            "inputs": self._input_stamps(sorted(set(inputs))),
+            "extra": extra or {},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def lock_digest(self) -> Optional[str]:
+        return _sha256_file(self.project_root / "uv.lock")
+
+    def venv_present(self) -> bool:
+        return (project_venv(self.project_root) / "pyvenv.cfg").exists()
+
+    def git_refs(self) -> List[Tuple[str, Optional[str]]]:
+        """The (url, ref) git refs the last sync pinned; their pins belong in the fingerprint."""
+        return [(url, ref) for url, ref in self._load().get("git_refs", [])]
+
+    def environment_consistent(self) -> bool:
+        """True if uv.lock and .venv are as the last sync left them."""
+        state = self._load()
+        return bool(state) and state["lock"] == self.lock_digest() and state["venv"] == self.venv_present()
+
+    def is_fresh(self, groups_config: Dict, extra: Optional[Dict] = None) -> bool:
+        """True if nothing sync depends on changed since it last completed."""
+        state = self._load()
+        if not state:
+            return False
+        if state["lock"] != self.lock_digest() or state["venv"] != self.venv_present():
+            return False
+        return state["fingerprint"] == self.fingerprint(groups_config, state["inputs"], extra)
+
+    def record(
+        self,
+        groups_config: Dict,
+        inputs: List[str],
+        extra: Optional[Dict] = None,
+        git_refs: Optional[List[Tuple[str, Optional[str]]]] = None,
+    ):
+        """Stores the fingerprint after a successful sync."""
+        inputs = sorted(set(inputs))
+        data = {
+            "version": STATE_VERSION,
+            "fingerprint": self.fingerprint(groups_config, inputs, extra),
+            "inputs": inputs,
+            "git_refs": sorted(set(git_refs or []), key=lambda pair: (pair[0], pair[1] or "")),
+            "lock": self.lock_digest(),
+            "venv": self.venv_present(),
+        }
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            logger.debug(f"Could not write sync state {self.state_file}: {e}")
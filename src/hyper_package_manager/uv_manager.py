@@ -1,10 +1,15 @@
+import os
 import subprocess
 import logging
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+def project_venv(project_root: Path) -> Path:
+    """The project's environment directory (honours UV_PROJECT_ENVIRONMENT, relative to the project like uv)."""
+    return project_root / os.environ.get("UV_PROJECT_ENVIRONMENT", ".venv")
+
 class UVManager:
     """Wrapper around uv CLI commands."""
 
@@ -28,12 +33,45 @@ class UVManager:
             logger.error(f"Failed to install {path}: {e}")
             raise
 
-    def sync(self, frozen: bool = False):
-        """Syncs the project environment using uv sync."""
+    def pip_install(self, args: List[str], env: Optional[Dict[str, str]] = None):
+        """Installs requirements (and `-e <path>` pairs) in a single uv pip install call."""
+        logger.info(f"Installing {' '.join(args)}...")
+        cmd = self._get_base_cmd() + ["pip", "install"] + args
+        try:
+            subprocess.run(cmd, check=True, cwd=self.project_root, env=env)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to install requirements: {e}")
+            raise
+
+    def build_wheel(self, source_dir: Path, out_dir: Path, python: Optional[Path] = None):
+        """Builds a wheel of the package in source_dir into out_dir using uv build."""
+        logger.info(f"Building wheel for {source_dir}...")
+        cmd = ["uv", "build", "--wheel", "--out-dir", str(out_dir), str(source_dir)]
+        if python is not None:
+            cmd += ["--python", str(python)]
+        try:
+            subprocess.run(cmd, check=True, cwd=self.project_root)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to build {source_dir}: {e}")
+            raise
+
+    def create_venv(self, path: Path):
+        """Creates the project environment at `path` (with the project's requires-python) using uv venv."""
+        logger.info(f"Creating environment {path}...")
+        try:
+            subprocess.run(["uv", "venv", str(path)], check=True, cwd=self.project_root)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to create environment: {e}")
+            raise
+
+    def sync(self, frozen: bool = False, no_install: Optional[List[str]] = None):
+        """Syncs the project environment using uv sync, leaving out the `no_install` packages."""
         logger.info("Syncing environment with uv...")
         cmd = ["uv", "sync"]
         if frozen:
             cmd.append("--frozen")
+        for name in no_install or []:
+            cmd += ["--no-install-package", name]
         
         try:
             subprocess.run(cmd, check=True, cwd=self.project_root)
@@ -41,13 +79,20 @@ class UVManager:
             logger.error(f"Failed to sync environment: {e}")
             raise
 
-    def run_command(self, command: List[str]):
+    def capture(self, command: List[str]) -> subprocess.CompletedProcess:
+        """Runs a command without raising, capturing stdout and stderr together."""
+        logger.debug(f"Running command: {' '.join(command)}")
+        return subprocess.run(
+            command, cwd=self.project_root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+
+    def run_command(self, command: List[str], env: Optional[Dict[str, str]] = None):
         """Runs a command in the uv environment context."""
         logger.info(f"Running command: {' '.join(command)}")
         # Note: In a real implementation we might want to use os.execvp
         # but for a library/CLI tool subprocess is often safer for tests.
         try:
-            subprocess.run(command, check=True, cwd=self.project_root)
+            subprocess.run(command, check=True, cwd=self.project_root, env=env)
         except subprocess.CalledProcessError as e:
             logger.error(f"Command failed: {e}")
             raise
\ No newline at end of file
@@ -0,0 +1,287 @@
+import os
+import json
+import time
+import logging
+import yaml
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from .models import Manifest, RegistryGroup, normalize_name
+from .loader import RegistryLoader
+from .pack import PACK_FILE, RegistryPack
+from .registry_index import RACY_WINDOW_NS
+from .groups import find_cycles, format_cycle
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_VERSION = 4
+
+
+class ValidationIssue(BaseModel):
+    file: str  # path relative to the registry root
+    message: str
+
+
+def _check_group(name: str, data: Any) -> Tuple[dict, List[str]]:
+    group = RegistryGroup.model_validate(data)
+    errors = []
+    if group.name != name:
+        errors.append(f"Declares name '{group.name}' but the file is named '{name}.yaml'")
+
+    option_names = [opt.name for opt in group.options]
+    seen = set()
+    for opt_name in option_names:
+        if opt_name in seen:
+            errors.append(f"Option '{opt_name}' is listed more than once")
+        seen.add(opt_name)
+    for default in group.default or []:
+        if default not in seen:
+            errors.append(f"Default '{default}' is not one of the group's options")
+    if not group.options and not group.includes:
+        errors.append("Group has neither options nor includes")
+
+    includes = [[inc.group, inc.options] for inc in group.includes]
+    rule_refs = sorted({name for opt in group.options for name in opt.conflicts + opt.requires})
+    return {"name": group.name, "options": option_names, "includes": includes, "rule_refs": rule_refs}, errors
+
+
+def _check_package(name: str, data: Any) -> Tuple[dict, List[str]]:
+    manifest = Manifest.model_validate(data)
+    errors = []
+    if manifest.name != name:
+        errors.append(f"Declares name '{manifest.name}' but the file is named '{name}.yaml'")
+
+    local_paths = []
+    for mode in ("prod", "dev"):
+        source = getattr(manifest.sources, mode)
+        if source is None:
+            continue
+        if source.type == "local":
+            if not source.path:
+                errors.append(f"Local '{mode}' source has no path")
+            else:
+                local_paths.append([mode, source.path])
+        elif source.type == "git" and not source.url:
+            errors.append(f"Git '{mode}' source has no url")
+
+    rule_refs = sorted(set(manifest.conflicts + manifest.requires))
+    return {"name": manifest.name, "local_paths": local_paths, "rule_refs": rule_refs}, errors
+
+
+CHECKS = {"groups": _check_group, "packages": _check_package}
+
+
+def check_file(kind: str, name: str, data: Any) -> Tuple[dict, List[str]]:
+    """Runs the single-file checks; returns the facts needed by cross-file checks and the errors."""
+    if isinstance(data, yaml.YAMLError):
+        return {}, [f"Invalid YAML: {data}"]
+    try:
+        return CHECKS[kind](name, data)
+    except ValidationError as e:
+        return {}, [
+            f"{'.'.join(str(loc) for loc in err['loc']) or '<root>'}: {err['msg']}" for err in e.errors()
+        ]
+
+
+class RegistryValidator:
+    """Validates a registry, caching per-file results by content hash.
+
+    Single-file checks (schema, names, options, sources) only run for files
+    whose content changed since the last run; cross-file checks (option
+    references, duplicate names, local paths) are recomputed every time from
+    the cached per-file facts, which is cheap.
+    """
+
+    def __init__(self, registry_path: Path, cache_dir: Path, loader: Optional[RegistryLoader] = None):
+        self.registry_path = registry_path
+        self.cache_file = cache_dir / "validate.json"
+        self.loader = loader or RegistryLoader()
+
+    def _load_cache(self) -> dict:
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") == VALIDATION_VERSION and data.get("registry") == str(self.registry_path.resolve()):
+                return data
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_cache(self, files: Dict[str, dict], pack: Optional[dict]):
+        data = {
+            "version": VALIDATION_VERSION,
+            "registry": str(self.registry_path.resolve()),
+            "written_ns": time.time_ns(),
+            "files": files,
+            "pack": pack,
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                f.write(json.dumps(data))
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.debug(f"Could not write validation cache {self.cache_file}: {e}")
+
+    def _check_files(self, cached: Dict[str, dict], written_ns: int) -> Tuple[Dict[str, dict], bool]:
+        """Returns per-file results for every loose registry file, re-checking changed ones."""
+        results: Dict[str, dict] = {}
+        stale: List[Tuple[str, str, str, Path, os.stat_result]] = []
+
+        for kind in CHECKS:
+            directory = self.registry_path / kind
+            if not directory.exists():
+                continue
+            with os.scandir(directory) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith(".yaml") or not dir_entry.is_file():
+                        continue
+                    rel = f"{kind}/{dir_entry.name}"
+                    st = dir_entry.stat()
+                    entry = cached.get(rel)
+                    if (
+                        entry
+                        and entry["mtime_ns"] == st.st_mtime_ns
+                        and entry["size"] == st.st_size
+                        and st.st_mtime_ns + RACY_WINDOW_NS < written_ns
+                    ):
+                        results[rel] = entry
+                    else:
+                        stale.append((kind, dir_entry.name[:-len(".yaml")], rel, Path(dir_entry.path), st))
+
+        changed = len(results) != len(cached)
+        if stale:
+            to_check = []
+            for item, (content, digest) in zip(stale, self.loader.read([s[3] for s in stale])):
+                kind, name, rel, path, st = item
+                entry = cached.get(rel)
+                if entry and entry["sha256"] == digest:
+                    entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+                    results[rel] = entry
+                else:
+                    to_check.append((item, content, digest))
+
+            logger.debug(f"Validating {len(to_check)} changed registry files")
+            documents = self.loader.parse([c for _, c, _ in to_check], [i[3] for i, _, _ in to_check], strict=False)
+            for ((kind, name, rel, _, st), _, digest), data in zip(to_check, documents):
+                facts, errors = check_file(kind, name, data)
+                results[rel] = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "sha256": digest,
+                    "facts": facts,
+                    "errors": errors,
+                }
+            changed = True
+
+        return results, changed
+
+    def _check_pack(self, cached: Optional[dict]) -> Tuple[Optional[dict], bool]:
+        """Returns per-entry results for the registry pack, reusing them while the pack is unchanged."""
+        pack_path = self.registry_path / PACK_FILE
+        try:
+            st = pack_path.stat()
+        except FileNotFoundError:
+            return None, cached is not None
+        if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            return cached, False
+
+        files = {}
+        pack = RegistryPack.open(pack_path)
+        if pack is not None:
+            try:
+                for kind in CHECKS:
+                    for name, entry in pack.entries(kind).items():
+                        facts, errors = check_file(kind, name, entry["data"])
+                        files[f"{kind}/{name}.yaml"] = {"facts": facts, "errors": errors, "loose": entry["loose"]}
+            finally:
+                pack.close()
+        return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "files": files}, True
+
+    def validate(self) -> List[ValidationIssue]:
+        """Validates the whole registry and returns every issue found."""
+        cache = self._load_cache()
+        results, files_changed = self._check_files(cache.get("files", {}), cache.get("written_ns", 0))
+        pack, pack_changed = self._check_pack(cache.get("pack"))
+        if files_changed or pack_changed:
+            self._save_cache(results, pack)
+
+        # Loose files override packed entries of the same name; entries packed
+        # with their loose file kept are gone once it is
+        results = dict(results)
+        if pack is not None:
+            for rel, entry in pack["files"].items():
+                if not entry["loose"]:
+                    results.setdefault(rel, entry)
+
+        issues = [
+            ValidationIssue(file=rel, message=message)
+            for rel, entry in results.items()
+            for message in entry["errors"]
+        ]
+        issues.extend(self._cross_check(results))
+        issues.sort(key=lambda issue: (issue.file, issue.message))
+        return issues
+
+    def _cross_check(self, results: Dict[str, dict]) -> List[ValidationIssue]:
+        issues = []
+        package_files = {rel[len("packages/"):-len(".yaml")] for rel in results if rel.startswith("packages/")}
+
+        declared = defaultdict(list)
+        for rel, entry in sorted(results.items()):
+            facts = entry["facts"]
+            if not facts:
+                continue
+            kind = rel.split("/", 1)[0]
+            declared[(kind, normalize_name(facts["name"]))].append(rel)
+
+            for opt_name in dict.fromkeys(facts.get("options", [])):
+                if opt_name not in package_files:
+                    issues.append(ValidationIssue(file=rel, message=f"Option '{opt_name}' has no manifest in packages/"))
+
+            for ref in facts.get("rule_refs", []):
+                if ref not in package_files:
+                    issues.append(ValidationIssue(file=rel, message=f"Conflicts/requires rule names unknown package '{ref}'"))
+
+            for mode, path in facts.get("local_paths", []):
+                if not (self.registry_path / "packages" / path).exists():
+                    issues.append(ValidationIssue(file=rel, message=f"Local '{mode}' source path does not exist: {path}"))
+
+        issues.extend(self._check_includes(results))
+
+        for (kind, name), files in declared.items():
+            if len(files) > 1:
+                for rel in files:
+                    others = ", ".join(f for f in files if f != rel)
+                    issues.append(ValidationIssue(file=rel, message=f"Duplicate {kind[:-1]} name '{name}' (also in {others})"))
+        return issues
+
+    def _check_includes(self, results: Dict[str, dict]) -> List[ValidationIssue]:
+        """Checks meta-group includes: known groups, valid options and no cycles."""
+        issues = []
+        groups = {
+            rel[len("groups/"):-len(".yaml")]: entry["facts"]
+            for rel, entry in results.items()
+            if rel.startswith("groups/") and entry["facts"]
+        }
+        graph = {}
+        for name, facts in groups.items():
+            rel = f"groups/{name}.yaml"
+            graph[name] = []
+            for included, options in facts.get("includes", []):
+                graph[name].append(included)
+                if included not in groups:
+                    issues.append(ValidationIssue(file=rel, message=f"Includes unknown group '{included}'"))
+                    continue
+                for opt_name in options or []:
+                    if opt_name not in groups[included]["options"]:
+                        issues.append(
+                            ValidationIssue(file=rel, message=f"Includes option '{opt_name}' not offered by group '{included}'")
+                        )
+
+        for cycle in find_cycles(graph):
+            for name in dict.fromkeys(cycle):
+                issues.append(ValidationIssue(file=f"groups/{name}.yaml", message=f"Cyclic group includes: {format_cycle(cycle)}"))
+        return issues
@@ -0,0 +1,303 @@
+import os
+import sys
+import re
+import json
+import time
+import shutil
+import fnmatch
+import hashlib
+import logging
+import tempfile
+import sysconfig
+import subprocess
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from .models import WheelEntry
+
+logger = logging.getLogger(__name__)
+
+WHEELHOUSE_VERSION = 3
+ENTRY_FILE = "entry.json"
+# Seconds after which an unfinished build's staging directory is abandoned
+STALE_STAGING = 86400
+# Never part of a package's source, with or without a .gitignore
+ALWAYS_IGNORED = (".git", ".hg", ".venv", "__pycache__", "*.pyc", "*.egg-info")
+# Build output, only at the top of the source root (a subpackage may be named build/)
+TOP_LEVEL_IGNORED = ("build", "dist", ".hpm")
+
+# Entry tag of wheels any Python 3 interpreter can install
+PURE_TAG = "py3-none-any"
+
+# Prints the tag of the interpreter it runs in: wheels are only reused for the same one
+_TAG_SCRIPT = (
+    "import sys, sysconfig; print('-'.join([sys.implementation.cache_tag,"
+    " sysconfig.get_config_var('SOABI') or 'none', sysconfig.get_platform()]))"
+)
+
+_AGE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$", re.IGNORECASE)
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+_AGE_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_SIZE_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+
+
+def parse_age(value: str) -> float:
+    """Parses an age such as "90m", "12h", "30d" or "2w" into seconds."""
+    match = _AGE_RE.match(value)
+    if not match:
+        raise ValueError(f"Invalid age '{value}', expected e.g. 12h, 30d or 2w")
+    return float(match.group(1)) * _AGE_UNITS[match.group(2).lower()]
+
+
+def parse_size(value: str) -> int:
+    """Parses a size such as "500M", "2G" or "1.5GiB" into bytes."""
+    match = _SIZE_RE.match(value)
+    if not match:
+        raise ValueError(f"Invalid size '{value}', expected e.g. 500M or 2G")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def interpreter_tag(python: Optional[Path] = None) -> str:
+    """Interpreter, ABI and platform a wheel is built for, e.g. "cpython-312-cpython-312-x86_64-linux-gnu-linux-x86_64".
+
+    Describes `python` if given, otherwise the running interpreter.
+    """
+    if python is None:
+        return "-".join([sys.implementation.cache_tag, sysconfig.get_config_var("SOABI") or "none", sysconfig.get_platform()])
+    result = subprocess.run([str(python), "-c", _TAG_SCRIPT], stdout=subprocess.PIPE, text=True, check=True)
+    return result.stdout.strip()
+
+
+def is_pure(wheel_name: str) -> bool:
+    """True for a wheel installable on any Python 3 interpreter and platform (e.g. "x-1.0-py3-none-any.whl")."""
+    python, abi, platform = wheel_name[:-len(".whl")].split("-")[-3:]
+    return abi == "none" and platform == "any" and "py3" in python.split(".")
+
+
+def _gitignore_patterns(root: Path) -> List[Tuple[str, bool, bool]]:
+    """Reads root/.gitignore as (pattern, anchored, directory only) triples; negations are not supported."""
+    patterns = []
+    try:
+        lines = (root / ".gitignore").read_text().splitlines()
+    except OSError:
+        return patterns
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(("#", "!")):
+            continue
+        dir_only = line.endswith("/")
+        line = line.strip("/")
+        patterns.append((line, "/" in line, dir_only))
+    return patterns
+
+
+def _build_artifact(rel: str) -> bool:
+    parts = rel.split("/")
+    return any(fnmatch.fnmatch(part, pattern) for part in parts for pattern in ALWAYS_IGNORED) or any(
+        fnmatch.fnmatch(parts[0], pattern) for pattern in TOP_LEVEL_IGNORED
+    )
+
+
+def _ignored(rel: str, is_dir: bool, patterns: List[Tuple[str, bool, bool]]) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    if _build_artifact(rel):
+        return True
+    for pattern, anchored, dir_only in patterns:
+        if dir_only and not is_dir:
+            continue
+        if fnmatch.fnmatch(rel if anchored else name, pattern):
+            return True
+    return False
+
+
+def _git_lines(args: List[str], cwd: Path) -> Optional[List[str]]:
+    """Runs git and returns its output lines (NUL-separated with -z), or None if it fails."""
+    try:
+        result = subprocess.run(["git"] + args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    output = result.stdout.decode()
+    return [line for line in (output.split("\0") if "-z" in args else output.splitlines()) if line]
+
+
+def _git_source_files(root: Path) -> Optional[List[str]]:
+    """Files git considers part of root, or None if git cannot decide.
+
+    git is only trusted when root is the top of its own work tree or has
+    tracked files: a package inside an ignored directory of some other
+    repository would otherwise look empty.
+    """
+    toplevel = _git_lines(["rev-parse", "--show-toplevel"], root)
+    if not toplevel:
+        return None
+    if Path(toplevel[0]).resolve() != root.resolve() and not _git_lines(["ls-files", "-z", "--cached", "--", "."], root):
+        return None
+    return _git_lines(["ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", "."], root)
+
+
+def source_files(root: Path) -> List[str]:
+    """Files of a package tree (relative, sorted) that .gitignore does not exclude.
+
+    In a git work tree git itself decides (tracked plus untracked,
+    non-ignored files); otherwise the tree is walked with the root
+    .gitignore applied.
+    """
+    files = _git_source_files(root)
+    if files is not None:
+        # --cached lists tracked files even if they were deleted; builds
+        # leave build/ and *.egg-info behind that may not be ignored
+        return sorted(rel for rel in set(files) if (root / rel).is_file() and not _build_artifact(rel))
+
+    patterns = _gitignore_patterns(root)
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        base = Path(dirpath).relative_to(root).as_posix()
+        prefix = "" if base == "." else f"{base}/"
+        dirnames[:] = [d for d in dirnames if not _ignored(prefix + d, True, patterns)]
+        files.extend(prefix + f for f in filenames if not _ignored(prefix + f, False, patterns))
+    return sorted(files)
+
+
+def tree_digest(root: Path) -> str:
+    """Content hash of a package tree: relative path and content of every source file."""
+    files = source_files(root)
+    if not files:
+        # An empty digest would be shared by every such tree and never change
+        raise RuntimeError(f"No source files found in {root}, not caching a wheel for it")
+    sha = hashlib.sha256()
+    for rel in files:
+        sha.update(rel.encode() + b"\0" + hashlib.sha256((root / rel).read_bytes()).digest())
+    return sha.hexdigest()
+
+
+class Wheelhouse:
+    """Wheels built once and reused, one directory per entry under `root`.
+
+    Entries are keyed by their source key (`local_key`/`git_key`) and the
+    tag of the wheel that was built: PURE_TAG for pure Python wheels, which
+    every interpreter shares, otherwise the interpreter tag (Python version,
+    ABI and platform) of the environment it was built for, so hosts sharing
+    `root` only get compiled wheels built for their interpreter. Each entry
+    holds the wheel and an entry.json describing its source; the
+    entry file's mtime is bumped on every hit and serves as the last-use time
+    for eviction. Entries are published with an atomic rename of a staging
+    directory in the same directory, so concurrent builders, also on other
+    hosts sharing `root` over NFS, never see a partial entry and the first
+    complete build wins.
+    """
+
+    def __init__(self, root: Path, build: Callable[[Path, Path], None]):
+        self.root = root
+        self.build = build
+
+    @staticmethod
+    def local_key(source_dir: Path) -> str:
+        payload = [WHEELHOUSE_VERSION, "local", tree_digest(source_dir)]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+    @staticmethod
+    def git_key(url: str, sha: str, subdirectory: Optional[str]) -> str:
+        # A commit is immutable: no need to look at the tree
+        payload = [WHEELHOUSE_VERSION, "git", url, sha, (subdirectory or "").strip("/")]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+    @staticmethod
+    def entry_key(key: str, tag: str) -> str:
+        """Directory name of the entry for source `key` with a wheel of entry tag `tag`."""
+        return hashlib.sha256(json.dumps([key, tag]).encode()).hexdigest()
+
+    def _wheel(self, entry_dir: Path) -> Optional[Path]:
+        return next(iter(sorted(entry_dir.glob("*.whl"))), None)
+
+    def get(self, key: str, tag: str) -> Optional[Path]:
+        """Returns a cached wheel of source `key` that an interpreter with `tag` can install and marks it as used, or None."""
+        for entry_tag in (PURE_TAG, tag):
+            entry_dir = self.root / self.entry_key(key, entry_tag)
+            wheel = self._wheel(entry_dir) if entry_dir.is_dir() else None
+            if wheel is not None:
+                try:
+                    os.utime(entry_dir / ENTRY_FILE)
+                except OSError as e:
+                    logger.debug(f"Could not update {entry_dir / ENTRY_FILE}: {e}")
+                return wheel
+        return None
+
+    def put(self, key: str, source_dir: Path, source: str, tag: str) -> Path:
+        """Builds source_dir for an interpreter with `tag` into a new entry of source `key`; returns the wheel.
+
+        The entry is filed under PURE_TAG instead if the build produced a pure wheel.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.root))
+        try:
+            self.build(source_dir, staging)
+            wheels = sorted(staging.glob("*.whl"))
+            if len(wheels) != 1:
+                raise RuntimeError(f"Expected one wheel from {source_dir}, got {len(wheels)}")
+            if is_pure(wheels[0].name):
+                tag = PURE_TAG
+            with open(staging / ENTRY_FILE, "w") as f:
+                json.dump({"version": WHEELHOUSE_VERSION, "source": source, "tag": tag, "created": time.time()}, f)
+            entry_dir = self.root / self.entry_key(key, tag)
+            try:
+                os.rename(staging, entry_dir)
+            except OSError:
+                # Built concurrently by another process
+                if not entry_dir.is_dir():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return self._wheel(entry_dir)
+
+    def entries(self) -> List[WheelEntry]:
+        """All complete entries, most recently used first."""
+        entries = []
+        if not self.root.is_dir():
+            return entries
+        for entry_dir in self.root.iterdir():
+            if entry_dir.name.startswith(".") or not entry_dir.is_dir():
+                continue
+            wheel = self._wheel(entry_dir)
+            try:
+                with open(entry_dir / ENTRY_FILE, "r") as f:
+                    info = json.load(f)
+                last_used = (entry_dir / ENTRY_FILE).stat().st_mtime
+            except (OSError, ValueError):
+                continue
+            if wheel is None:
+                continue
+            entries.append(WheelEntry(
+                key=entry_dir.name,
+                wheel=wheel.name,
+                source=info.get("source", ""),
+                tag=info.get("tag", ""),
+                size=sum(f.stat().st_size for f in entry_dir.iterdir() if f.is_file()),
+                created=info.get("created", last_used),
+                last_used=last_used,
+            ))
+        return sorted(entries, key=lambda e: e.last_used, reverse=True)
+
+    def evict(
+        self, max_age: Optional[float] = None, max_size: Optional[int] = None, dry_run: bool = False
+    ) -> List[WheelEntry]:
+        """Removes entries unused for more than `max_age` seconds, then least recently used ones until at most `max_size` bytes remain."""
+        now = time.time()
+        kept, evicted = [], []
+        for entry in self.entries():
+            (evicted if max_age is not None and now - entry.last_used > max_age else kept).append(entry)
+        if max_size is not None:
+            total = sum(entry.size for entry in kept)
+            while kept and total > max_size:
+                entry = kept.pop()
+                total -= entry.size
+                evicted.append(entry)
+        if not dry_run:
+            for entry in evicted:
+                shutil.rmtree(self.root / entry.key, ignore_errors=True)
+            # Staging directories of builds that died; live builds are younger
+            for staging in self.root.glob(".*"):
+                try:
+                    if staging.is_dir() and now - staging.stat().st_mtime > STALE_STAGING:
+                        shutil.rmtree(staging, ignore_errors=True)
+                except OSError:
+                    pass
+        return evicted
@@ -0,0 +1,82 @@
+import shutil
+import tomllib
+import subprocess
+from pathlib import Path
+
+import pytest
+import tomli_w
+import yaml
+
+
+def git(*args: str, cwd: Path) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=hpm", "-c", "user.email=hpm@example.com", "-c", "init.defaultBranch=main"] + list(args),
+        cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def git_remote(tmp_path: Path):
+    """A bare repository reachable over file://, with a branch, an annotated tag and two package subdirectories."""
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    work = tmp_path / "work"
+    work.mkdir()
+    git("init", "--quiet", cwd=work)
+    (work / "README").write_text("top\n")
+    for package in ("pkg-a", "pkg-b"):
+        (work / package).mkdir()
+        (work / package / "pyproject.toml").write_text(f"[project]\nname = '{package}'\n")
+    git("add", ".", cwd=work)
+    git("commit", "--quiet", "-m", "first", cwd=work)
+    git("tag", "-a", "v1.0", "-m", "release", cwd=work)
+    first = git("rev-parse", "HEAD", cwd=work)
+    (work / "README").write_text("second\n")
+    git("commit", "--quiet", "-am", "second", cwd=work)
+    second = git("rev-parse", "HEAD", cwd=work)
+
+    bare = tmp_path / "remote.git"
+    git("clone", "--quiet", "--bare", str(work), str(bare), cwd=tmp_path)
+    # Serving arbitrary SHAs and partial clones over file:// mirrors what hosted remotes allow
+    git("config", "uploadpack.allowAnySHA1InWant", "true", cwd=bare)
+    git("config", "uploadpack.allowFilter", "true", cwd=bare)
+
+    def push(message: str) -> str:
+        (work / "README").write_text(message + "\n")
+        git("commit", "--quiet", "-am", message, cwd=work)
+        git("push", "--quiet", str(bare), "HEAD:main", cwd=work)
+        return git("rev-parse", "HEAD", cwd=work)
+
+    return {"url": bare.as_uri(), "first": first, "second": second, "push": push}
+
+
+def write_yaml(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+
+def configure(root: Path, **hpm):
+    """Sets [tool.hpm] keys (e.g. groups) in the project's pyproject.toml."""
+    with open(root / "pyproject.toml", "rb") as f:
+        config = tomllib.load(f)
+    config["tool"]["hpm"].update(hpm)
+    with open(root / "pyproject.toml", "wb") as f:
+        tomli_w.dump(config, f)
+
+
+@pytest.fixture
+def hpm_project(tmp_path: Path, monkeypatch):
+    """An empty project whose registry is a loose-file tree under registry/; the working directory."""
+    root = tmp_path / "project"
+    (root / "registry" / "groups").mkdir(parents=True)
+    (root / "registry" / "packages").mkdir()
+    with open(root / "pyproject.toml", "wb") as f:
+        tomli_w.dump({
+            "project": {"name": "project", "version": "0.1.0", "requires-python": ">=3.11", "dependencies": []},
+            "tool": {"hpm": {"registry": "registry"}},
+        }, f)
+    monkeypatch.chdir(root)
+    # Keep shared caches out of the user's home
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return root
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+from hyper_package_manager.core import HPMCore
+from hyper_package_manager.payload import encode_payload
+
+ENV_PYPROJECT = b"[project]\nname = 'hpm-env'\nversion = '0.0.0'\ndependencies = ['numpy']\n"
+LOCK = b"version = 1\n"
+
+
+@pytest.fixture
+def syncs(monkeypatch):
+    """Replaces `uv sync` with one that creates the venv and records the call."""
+    calls = []
+
+    def sync_environment(self, frozen=True):
+        calls.append(self.project_root)
+        self.venv_dir().mkdir(exist_ok=True)
+        (self.venv_dir() / "pyvenv.cfg").write_text("home = /usr/bin\n")
+
+    monkeypatch.setattr(HPMCore, "sync_environment", sync_environment)
+    return calls
+
+
+def test_second_bootstrap_of_the_same_payload_is_a_noop(tmp_path: Path, monkeypatch, syncs):
+    root = tmp_path / "env"
+    root.mkdir()
+    monkeypatch.chdir(root)
+    payload = encode_payload({"pyproject.toml": ENV_PYPROJECT, "uv.lock": LOCK}, codec="gzip")
+
+    assert HPMCore().bootstrap(payload) is False
+    assert (root / "pyproject.toml").read_bytes() == ENV_PYPROJECT
+    assert (root / ".venv" / ".hpm-lock-digest").exists()
+    assert HPMCore().bootstrap(payload) is True
+    assert len(syncs) == 1
+
+    # A new lock replaces the generated project's files and syncs again
+    payload = encode_payload({"pyproject.toml": ENV_PYPROJECT, "uv.lock": LOCK + b"revision = 2\n"}, codec="gzip")
+    assert HPMCore().bootstrap(payload) is False
+    assert len(syncs) == 2
+
+
+def test_existing_project_is_not_clobbered(hpm_project: Path, syncs):
+    own = (hpm_project / "pyproject.toml").read_bytes()
+    payload = encode_payload({"pyproject.toml": ENV_PYPROJECT, "uv.lock": LOCK}, codec="gzip")
+    with pytest.raises(FileExistsError, match="pyproject.toml"):
+        HPMCore().bootstrap(payload)
+    assert (hpm_project / "pyproject.toml").read_bytes() == own
+    assert not (hpm_project / "uv.lock").exists()
+    assert syncs == []
+
+    # A payload of only uv.lock keeps the project's own pyproject.toml
+    assert HPMCore().bootstrap(encode_payload({"uv.lock": LOCK}, codec="gzip")) is False
+    assert (hpm_project / "pyproject.toml").read_bytes() == own
+    assert (hpm_project / "uv.lock").read_bytes() == LOCK
+
+    assert HPMCore().bootstrap(payload, force=True) is False
+    assert (hpm_project / "pyproject.toml").read_bytes() == ENV_PYPROJECT
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from hyper_package_manager import dry_run
+from hyper_package_manager.core import HPMCore
+
+from conftest import configure, write_yaml
+
+
+def test_check_re_pins_moved_branches(hpm_project: Path, git_remote, monkeypatch):
+    locked = []
+
+    def lock_requirements(requirements, requires_python, tmp_root, output_dir=None, **kwargs):
+        locked.append(requirements)
+        return True, "Resolved"
+
+    monkeypatch.setattr(dry_run, "lock_requirements", lock_requirements)
+    write_yaml(hpm_project / "registry" / "groups" / "metrics.yaml", {
+        "name": "metrics", "strategy": "M-of-N", "options": [{"name": "metric-git"}],
+    })
+    write_yaml(hpm_project / "registry" / "packages" / "metric-git.yaml", {
+        "name": "metric-git", "version": "1.0.0",
+        "sources": {"prod": {"type": "git", "url": git_remote["url"], "ref": "main"}},
+    })
+    configure(hpm_project, groups={"metrics": ["metric-git"]})
+
+    first = HPMCore().check()
+    assert first.ok and not first.cached
+    assert first.requirements == [f"git+{git_remote['url']}@{git_remote['second']}"]
+    assert HPMCore().check().cached
+
+    moved = git_remote["push"]("third")
+    third = HPMCore().check()
+    assert not third.cached
+    assert third.requirements == [f"git+{git_remote['url']}@{moved}"]
+    assert len(locked) == 2
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from hyper_package_manager.constraints import ConstraintError, check_constraints
+from hyper_package_manager.core import HPMCore
+from hyper_package_manager.models import Manifest, RegistryGroup
+
+from conftest import write_yaml
+
+
+def manifest(name: str, **rules) -> Manifest:
+    return Manifest.model_validate({"name": name, "version": "1.0.0", "sources": {}, **rules})
+
+
+def test_option_conflicting_with_an_option_of_another_group():
+    groups = {
+        "backend": RegistryGroup.model_validate({
+            "name": "backend", "strategy": "1-of-N", "options": [{"name": "torch-cpu", "conflicts": ["Torch_CUDA"]}],
+        }),
+        "accel": RegistryGroup.model_validate({"name": "accel", "strategy": "1-of-N", "options": [{"name": "torch-cuda"}]}),
+    }
+    manifests = {"torch-cpu": manifest("torch-cpu"), "torch-cuda": manifest("torch-cuda")}
+    assert check_constraints({"backend": ["torch-cpu"], "accel": ["torch-cuda"]}, groups, manifests) == [
+        "'torch-cpu' conflicts with 'torch-cuda' (declared by group 'backend')",
+    ]
+    assert check_constraints({"backend": ["torch-cpu"]}, groups, manifests) == []
+
+
+def test_unmet_requires_counts_hpm_dependencies():
+    groups = {"metrics": RegistryGroup.model_validate({"name": "metrics", "strategy": "M-of-N", "options": [{"name": "bleu"}]})}
+    manifests = {"bleu": manifest("bleu", requires=["tokenizers"]), "tokenizers": manifest("tokenizers")}
+    assert check_constraints({"metrics": ["bleu"]}, groups, manifests) == [
+        "'bleu' requires 'tokenizers', which is not installed (declared by manifest 'bleu')",
+    ]
+    # Satisfied by a dependency of the selection, not only by a selected option
+    assert check_constraints({"metrics": ["bleu"]}, groups, manifests, packages=["tokenizers", "bleu"]) == []
+
+
+def test_add_group_option_rejects_a_conflicting_selection(hpm_project: Path):
+    registry = hpm_project / "registry"
+    for name in ("torch-cpu", "torch-cuda"):
+        write_yaml(registry / "packages" / f"{name}.yaml", {
+            "name": name, "version": "1.0.0", "sources": {"prod": {"type": "local", "path": f"../../{name}"}},
+        })
+    write_yaml(registry / "groups" / "backend.yaml", {
+        "name": "backend", "strategy": "1-of-N", "options": [{"name": "torch-cpu", "conflicts": ["torch-cuda"]}],
+    })
+    write_yaml(registry / "groups" / "accel.yaml", {"name": "accel", "strategy": "1-of-N", "options": [{"name": "torch-cuda"}]})
+
+    hpm = HPMCore()
+    hpm.add_group_option("backend", "torch-cpu")
+    before = (hpm_project / "pyproject.toml").read_bytes()
+    with pytest.raises(ConstraintError) as excinfo:
+        hpm.add_group_option("accel", "torch-cuda")
+    assert excinfo.value.violations == ["'torch-cpu' conflicts with 'torch-cuda' (declared by group 'backend')"]
+    # Nothing is written for a rejected selection
+    assert (hpm_project / "pyproject.toml").read_bytes() == before
@@ -0,0 +1,61 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from hyper_package_manager.core import HPMCore
+from hyper_package_manager.daemon import DaemonClient, RegistryDaemon
+
+from conftest import write_yaml
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_daemon_serves_queries_and_sees_registry_edits(hpm_project: Path, monkeypatch):
+    # Unix socket paths are limited to ~100 bytes; tmp_path can be longer
+    socket_dir = Path(tempfile.mkdtemp(prefix="hpm-"))
+    monkeypatch.setenv("HPM_DAEMON_SOCKET", str(socket_dir / "d.sock"))
+    manifest = hpm_project / "registry" / "packages" / "metric-accuracy.yaml"
+    write_yaml(manifest, {
+        "name": "metric-accuracy", "version": "1.0.0", "description": "Accuracy metric",
+        "sources": {"prod": {"type": "local", "path": "../../metric-accuracy"}},
+    })
+    write_yaml(hpm_project / "registry" / "groups" / "metrics.yaml", {
+        "name": "metrics", "strategy": "M-of-N", "options": [{"name": "metric-accuracy"}],
+    })
+
+    hpm = HPMCore()
+    daemon = RegistryDaemon(hpm)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    client = DaemonClient(daemon.socket_path)
+    try:
+        wait_for(lambda: client.ping() is not None)
+        assert client.ping()["registry"] == str(hpm.registry_path.resolve())
+        assert DaemonClient.for_core(hpm) is not None
+
+        shown = client.request("show", name="metric-accuracy")
+        assert shown["package"]["version"] == "1.0.0"
+        assert client.request("show", name="metrics")["group"]["options"][0]["name"] == "metric-accuracy"
+        found = client.request("search", query="accuracy")
+        assert "metric-accuracy" in found["packages"]
+        assert found["headers"]["metric-accuracy"]["description"] == "Accuracy metric"
+
+        write_yaml(manifest, {
+            "name": "metric-accuracy", "version": "1.1.0", "description": "Top-k accuracy metric",
+            "sources": {"prod": {"type": "local", "path": "../../metric-accuracy"}},
+        })
+        wait_for(lambda: client.request("show", name="metric-accuracy")["package"]["version"] == "1.1.0")
+        found = client.request("search", query="top-k")
+        assert found["headers"]["metric-accuracy"]["description"] == "Top-k accuracy metric"
+    finally:
+        client.request("shutdown")
+        thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not daemon.socket_path.exists()
+    socket_dir.rmdir()
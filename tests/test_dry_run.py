@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from hyper_package_manager.dry_run import relocate_lock_file
+
+WORKDIR = Path("/srv/project/.hpm/tmp/check-1234")
+PROJECT = Path("/srv/project")
+
+
+def test_relocate_lock_paths_to_project_root():
+    lock = (
+        'version = 1\n\n[[package]]\nname = "hpm-env"\nversion = "0.0.0"\nsource = { virtual = "." }\n\n'
+        '[package.metadata]\nrequires-dist = [{ name = "qwen", editable = "../../../packages/qwen" },'
+        ' { name = "abs", directory = "/srv/project/packages/abs" }]\n\n'
+        '[[package]]\nname = "qwen"\nversion = "0.1.0"\nsource = { editable = "../../../packages/qwen" }\n'
+    )
+    relocated = relocate_lock_file(lock, "uv.lock", WORKDIR, PROJECT)
+    assert 'source = { virtual = "." }' in relocated
+    assert 'source = { editable = "packages/qwen" }' in relocated
+    assert '{ name = "abs", directory = "packages/abs" }' in relocated
+    assert "/srv/project" not in relocated and "../" not in relocated
+
+
+def test_relocate_pyproject_sources():
+    pyproject = (
+        '[project]\nname = "hpm-env"\n\n[tool.uv.sources]\n'
+        'qwen = { path = "/srv/project/packages/qwen", editable = true }\n'
+        'shared = { path = "/srv/shared/lib" }\n'
+        'remote = { git = "https://example.com/remote.git", rev = "main" }\n'
+    )
+    relocated = relocate_lock_file(pyproject, "pyproject.toml", WORKDIR, PROJECT)
+    assert 'qwen = { path = "packages/qwen", editable = true }' in relocated
+    assert 'shared = { path = "../shared/lib" }' in relocated
+    assert 'rev = "main"' in relocated
@@ -0,0 +1,20 @@
+from hyper_package_manager.fuzzy import closest, similarity, trigrams, words
+
+
+def test_words_and_trigrams():
+    assert words("VLM-adapter_qwen2") == ["vlm", "adapter", "qwen2"]
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_similarity_tolerates_typos_and_word_order():
+    assert similarity("vlm-adapter-qwen", "vlm-adapter-qwen") == 1.0
+    assert similarity("qwn-adaptr", "vlm-adapter-qwen") > 0.8
+    assert similarity("qwen-adapter-vlm", "vlm-adapter-qwen") == 1.0
+    assert similarity("", "vlm-adapter-qwen") == 0.0
+
+
+def test_closest():
+    candidates = ["vlm-adapter-qwen", "vlm-adapter-llava", "metric-accuracy", "metric-f1"]
+    assert closest("vlm-adaptr-qwen", candidates)[0] == "vlm-adapter-qwen"
+    assert closest("metric-acuracy", candidates, limit=1) == ["metric-accuracy"]
+    assert closest("something-else-entirely", candidates) == []
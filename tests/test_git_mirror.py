@@ -0,0 +1,141 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from hyper_package_manager.git_mirror import GitMirrorStore, GitPins, lock_git_sources, split_git_requirement
+
+from conftest import git
+
+
+def test_split_git_requirement():
+    assert split_git_requirement("git+https://example.com/a.git@main#subdirectory=pkg") == ("https://example.com/a.git", "main")
+    assert split_git_requirement("git+ssh://git@example.com/a.git") == ("ssh://git@example.com/a.git", None)
+    assert split_git_requirement("requests>=2") is None
+
+
+def test_prefetch_mirrors_reachable_urls(tmp_path: Path, git_remote):
+    url = git_remote["url"]
+    mirrors = GitMirrorStore(tmp_path / "cache").prefetch([url, url, "file:///nonexistent/repo.git"])
+    assert list(mirrors) == [url]
+    assert git("rev-parse", "main", cwd=mirrors[url]) == git_remote["second"]
+
+    moved = git_remote["push"]("third")
+    # A new store (hpm invocation) fetches incrementally into the same mirror
+    mirrors = GitMirrorStore(tmp_path / "cache").prefetch([url])
+    assert git("rev-parse", "main", cwd=mirrors[url]) == moved
+
+
+def test_redirect_env_appends_to_existing_config():
+    env = GitMirrorStore.redirect_env({"https://example.com/a.git": Path("/cache/a.git")}, base={"GIT_CONFIG_COUNT": "1"})
+    assert env["GIT_CONFIG_COUNT"] == "2"
+    assert env["GIT_CONFIG_KEY_1"] == "url.file:///cache/a.git.insteadOf"
+    assert env["GIT_CONFIG_VALUE_1"] == "https://example.com/a.git"
+
+
+def test_resolve_branch_tag_and_sha(tmp_path: Path, git_remote):
+    store = GitMirrorStore(tmp_path / "cache")
+    url = git_remote["url"]
+    assert store.resolve(url, "main") == git_remote["second"]
+    assert store.resolve(url) == git_remote["second"]
+    # Annotated tags resolve to the commit, not the tag object
+    assert store.resolve(url, "v1.0") == git_remote["first"]
+    assert store.resolve(url, git_remote["first"]) == git_remote["first"]
+    with pytest.raises(RuntimeError):
+        store.resolve(url, "no-such-branch")
+
+
+def test_mirror_is_fetched_once_per_store(tmp_path: Path, git_remote):
+    url = git_remote["url"]
+    store = GitMirrorStore(tmp_path / "cache")
+    assert store.resolve(url, "main") == git_remote["second"]
+    git_remote["push"]("third")
+    assert store.resolve(url, "main") == git_remote["second"]
+
+
+def test_unreachable_url_is_tried_once_per_store(tmp_path: Path, monkeypatch):
+    calls = []
+    run = subprocess.run
+
+    def counting_run(args, **kwargs):
+        calls.append(args)
+        return run(args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "run", counting_run)
+    url = "file:///nonexistent/repo.git"
+    store = GitMirrorStore(tmp_path / "cache")
+    with pytest.raises(RuntimeError, match="failed"):
+        store.fetch(url)
+    assert len(calls) == 1
+    with pytest.raises(RuntimeError, match="could not be reached earlier"):
+        store.resolve(url, "main")
+    with pytest.raises(RuntimeError, match="could not be reached earlier"):
+        store.ls_remote(url, "main")
+    assert store.prefetch([url]) == {}
+    assert len(calls) == 1
+
+    # ls-remote failures count too
+    other = GitMirrorStore(tmp_path / "cache")
+    with pytest.raises(RuntimeError):
+        other.ls_remote(url, "main")
+    assert other.prefetch([url]) == {}
+    assert len(calls) == 2
+
+
+def test_git_pins_round_trip(tmp_path: Path):
+    pins = GitPins(tmp_path)
+    assert pins.set("https://example.com/a.git", "main", "a" * 40)
+    assert not pins.set("https://example.com/a.git", "main", "a" * 40)
+    pins.save()
+    assert GitPins(tmp_path).get("https://example.com/a.git", "main") == "a" * 40
+    assert GitPins(tmp_path).get("https://example.com/a.git", "dev") is None
+
+
+def test_ls_remote_does_not_mirror(tmp_path: Path, git_remote):
+    store = GitMirrorStore(tmp_path / "cache")
+    url = git_remote["url"]
+    assert store.ls_remote(url, "main") == git_remote["second"]
+    assert store.ls_remote(url, "v1.0") == git_remote["first"]
+    assert store.ls_remote(url) == git_remote["second"]
+    with pytest.raises(RuntimeError):
+        store.ls_remote(url, "missing")
+    assert not store.mirror_path(url).exists()
+
+
+def test_checkout_subdirectory_is_sparse(tmp_path: Path, git_remote):
+    store = GitMirrorStore(tmp_path / "cache")
+    url, sha = git_remote["url"], git_remote["first"]
+    root = store.checkout(url, sha, "pkg-a")
+    assert (root / "pkg-a" / "pyproject.toml").is_file()
+    # Cone mode keeps top-level files, but not sibling directories
+    assert not (root / "pkg-b").exists()
+    assert store.checkout(url, sha, "pkg-a") == root
+    with pytest.raises(RuntimeError):
+        store.checkout(url, sha, "missing")
+    assert not store.checkout_path(url, sha, "missing").exists()
+
+
+def test_lock_git_sources():
+    lock = (
+        b'[[package]]\nname = "a"\nsource = { git = "https://example.com/a.git?subdirectory=pkg&rev=main#'
+        + b"a" * 40
+        + b'" }\n\n[[package]]\nname = "b"\nsource = { registry = "https://pypi.org/simple" }\n'
+    )
+    assert lock_git_sources(lock) == {"a": ("https://example.com/a.git", "a" * 40, "pkg")}
+
+
+def test_checkout_from_mirror(tmp_path: Path, git_remote):
+    store = GitMirrorStore(tmp_path / "cache")
+    url = git_remote["url"]
+    mirror = store.fetch(url)
+    root = store.checkout(url, git_remote["second"], remote=mirror.as_uri())
+    assert (root / "README").read_text() == "second\n"
+
+
+def test_git_timeout_is_reported(monkeypatch):
+    def run(*args, **kwargs):
+        raise subprocess.TimeoutExpired(args[0], kwargs["timeout"])
+
+    monkeypatch.setattr(subprocess, "run", run)
+    with pytest.raises(RuntimeError, match="timed out after 30s"):
+        GitMirrorStore(Path("/nonexistent")).ls_remote("https://unreachable.example.com/a.git", "main")
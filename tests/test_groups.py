@@ -0,0 +1,59 @@
+import pytest
+
+from hyper_package_manager.groups import GroupCycleError, expand_includes, find_cycles, strongly_connected_components
+from hyper_package_manager.models import GroupInclude, RegistryGroup
+
+
+def group(name, includes=(), default=None):
+    return RegistryGroup(
+        name=name,
+        strategy="M-of-N",
+        default=default,
+        includes=[GroupInclude(group=g) if isinstance(g, str) else GroupInclude(group=g[0], options=g[1]) for g in includes],
+    )
+
+
+def test_components_in_reverse_topological_order():
+    graph = {"a": ["b"], "b": ["c"], "c": ["b", "d"], "d": []}
+    components = strongly_connected_components(graph)
+    assert sorted(map(sorted, components)) == [["a"], ["b", "c"], ["d"]]
+    order = [min(component) for component in components]
+    assert order.index("d") < order.index("b") < order.index("a")
+
+
+def test_edges_to_unknown_nodes_are_ignored():
+    assert strongly_connected_components({"a": ["missing"]}) == [["a"]]
+    assert find_cycles({"a": ["missing"]}) == []
+
+
+def test_find_cycles():
+    assert find_cycles({"a": ["b"], "b": ["c"], "c": []}) == []
+    assert find_cycles({"a": ["a"]}) == [["a", "a"]]
+    assert find_cycles({"a": ["b"], "b": ["a"], "c": ["d"], "d": ["e"], "e": ["c"]}) == [["a", "b", "a"], ["c", "d", "e", "c"]]
+
+
+def test_deep_chain_does_not_recurse():
+    graph = {f"g{i}": [f"g{i + 1}"] for i in range(5000)}
+    graph["g5000"] = ["g0"]
+    (cycle,) = find_cycles(graph)
+    assert len(cycle) == 5002 and cycle[0] == cycle[-1] == "g0"
+
+
+def test_expand_includes_is_transitive():
+    groups = {
+        "stack": group("stack", includes=["models", ("metrics", ["f1"])]),
+        "models": group("models", includes=["metrics"], default=["qwen"]),
+        "metrics": group("metrics", default=["accuracy"]),
+    }
+    expansions = expand_includes(groups)
+    assert expansions["metrics"] == {}
+    assert expansions["models"] == {"metrics": ["accuracy"]}
+    assert expansions["stack"] == {"models": ["qwen"], "metrics": ["accuracy", "f1"]}
+
+
+def test_expand_includes_rejects_cycles_and_unknown_groups():
+    with pytest.raises(GroupCycleError) as excinfo:
+        expand_includes({"a": group("a", includes=["b"]), "b": group("b", includes=["a"])})
+    assert excinfo.value.cycles == [["a", "b", "a"]]
+    with pytest.raises(KeyError):
+        expand_includes({"a": group("a", includes=["missing"])})
@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from hyper_package_manager.core import HPMCore
+from hyper_package_manager.uv_manager import UVManager
+
+from conftest import write_yaml
+
+
+def test_unchanged_editable_install_is_skipped(hpm_project: Path, monkeypatch):
+    installs = []
+
+    def pip_install_editable(self, path: Path):
+        # Like uv: a dist-info with a PEP 610 direct_url.json marking the editable install
+        installs.append(path)
+        dist_info = self.project_root / ".venv" / "lib" / "python3.12" / "site-packages" / "plugin-0.1.0.dist-info"
+        dist_info.mkdir(parents=True, exist_ok=True)
+        (dist_info / "direct_url.json").write_text(json.dumps({"url": path.resolve().as_uri(), "dir_info": {"editable": True}}))
+
+    monkeypatch.setattr(UVManager, "pip_install_editable", pip_install_editable)
+    monkeypatch.setattr(UVManager, "pip_install", lambda self, args, env=None: installs.append(args))
+    plugin = hpm_project / "plugin"
+    plugin.mkdir()
+    (plugin / "pyproject.toml").write_text("[project]\nname = 'plugin'\nversion = '0.1.0'\n")
+    write_yaml(plugin / "hpm.yaml", {
+        "name": "plugin", "version": "0.1.0", "sources": {"dev": {"type": "local", "path": ".", "editable": True}},
+    })
+
+    HPMCore().install_plugin(plugin / "hpm.yaml", mode="dev")
+    assert installs == [plugin]
+    HPMCore().install_plugin(plugin / "hpm.yaml", mode="dev")
+    assert installs == [plugin]
+    # Source edits need no reinstall, build file edits do
+    (plugin / "plugin.py").write_text("VALUE = 1\n")
+    HPMCore().install_plugin(plugin / "hpm.yaml", mode="dev")
+    assert installs == [plugin]
+    (plugin / "pyproject.toml").write_text("[project]\nname = 'plugin'\nversion = '0.1.0'\ndependencies = ['numpy']\n")
+    HPMCore().install_plugin(plugin / "hpm.yaml", mode="dev")
+    assert installs == [plugin, plugin]
+    HPMCore().install_plugin(plugin / "hpm.yaml", mode="dev", reinstall=True)
+    assert installs == [plugin, plugin, plugin]
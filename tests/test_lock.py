@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from hyper_package_manager import core
+from hyper_package_manager.core import HPMCore
+
+from conftest import write_yaml
+
+
+def test_lock_cache_hits_until_the_branch_moves(hpm_project: Path, git_remote, monkeypatch):
+    locked = []
+
+    def lock_requirements(requirements, requires_python, tmp_root, output_dir=None, **kwargs):
+        locked.append(requirements)
+        (output_dir / "pyproject.toml").write_text("[project]\nname = 'hpm-env'\n")
+        (output_dir / "uv.lock").write_text("\n".join(requirements) + "\n")
+        return True, "Resolved"
+
+    monkeypatch.setattr(core, "lock_requirements", lock_requirements)
+    write_yaml(hpm_project / "registry" / "packages" / "metric-git.yaml", {
+        "name": "metric-git", "version": "1.0.0",
+        "sources": {"prod": {"type": "git", "url": git_remote["url"], "ref": "main"}},
+    })
+
+    first = HPMCore().lock_environment(["metric-git"])
+    assert (first / "uv.lock").read_text() == f"git+{git_remote['url']}@{git_remote['second']}\n"
+    assert HPMCore().lock_environment(["metric-git"]) == first
+    assert len(locked) == 1
+
+    moved = git_remote["push"]("third")
+    second = HPMCore().lock_environment(["metric-git"])
+    assert second != first
+    assert (second / "uv.lock").read_text() == f"git+{git_remote['url']}@{moved}\n"
+    assert HPMCore().lock_environment(["metric-git"]) == second
+    assert len(locked) == 2
@@ -0,0 +1,32 @@
+import itertools
+
+from hyper_package_manager.matrix import enumerate_combinations
+
+CANDIDATES = {"model": ["a", "b", "c"], "metric": ["x", "y"], "empty": [], "backend": ["p", "q", "r", "s"]}
+
+
+def test_full_cross_product():
+    combinations = enumerate_combinations(CANDIDATES)
+    expected = [
+        {"backend": backend, "metric": metric, "model": model}
+        for backend, metric, model in itertools.product(CANDIDATES["backend"], CANDIDATES["metric"], CANDIDATES["model"])
+    ]
+    assert combinations == expected
+    assert enumerate_combinations({}) == []
+    assert enumerate_combinations({"empty": []}) == []
+
+
+def test_sampling_is_a_deterministic_subset():
+    everything = enumerate_combinations(CANDIDATES)
+    sample = enumerate_combinations(CANDIDATES, sample=5, seed=1)
+    assert len(sample) == 5
+    assert all(combination in everything for combination in sample)
+    assert len({tuple(sorted(c.items())) for c in sample}) == 5
+    assert sample == enumerate_combinations(CANDIDATES, sample=5, seed=1)
+    assert enumerate_combinations(CANDIDATES, sample=100, seed=1) == everything
+
+
+def test_sampling_large_spaces():
+    candidates = {f"group{i}": [str(n) for n in range(10)] for i in range(12)}
+    sample = enumerate_combinations(candidates, sample=3, seed=7)
+    assert len(sample) == 3 and all(len(combination) == 12 for combination in sample)
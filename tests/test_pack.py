@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from hyper_package_manager.pack import RegistryPack, write_pack
+
+
+def records(count):
+    for i in range(count):
+        yield "package", f"pkg-{i}", f"sha-{i}", {"name": f"pkg-{i}"}, {"name": f"pkg-{i}", "version": f"1.0.{i}"}
+    yield "group", "pkg-0", "sha-group", None, {"name": "pkg-0", "strategy": "1-of-N"}
+
+
+def test_lookup(tmp_path: Path):
+    path = tmp_path / "registry.hpmpack"
+    assert write_pack(path, records(200)) == 201
+    pack = RegistryPack.open(path)
+    try:
+        assert pack.get("package", "pkg-42") == {"sha256": "sha-42", "data": {"name": "pkg-42", "version": "1.0.42"}}
+        # Same name, different kind
+        assert pack.get("group", "pkg-0")["data"]["strategy"] == "1-of-N"
+        assert pack.get("package", "pkg-200") is None
+        assert pack.get("group", "pkg-1") is None
+        digests = pack.digests("package")
+        assert len(digests) == 200 and digests["pkg-7"] == "sha-7"
+        assert list(pack.entries("group")) == ["pkg-0"]
+    finally:
+        pack.close()
+
+
+def test_empty_pack(tmp_path: Path):
+    path = tmp_path / "registry.hpmpack"
+    assert write_pack(path, []) == 0
+    pack = RegistryPack.open(path)
+    try:
+        assert pack.get("package", "anything") is None
+        assert pack.digests("package") == {}
+    finally:
+        pack.close()
+
+
+def test_missing_or_invalid_pack(tmp_path: Path):
+    assert RegistryPack.open(tmp_path / "missing.hpmpack") is None
+    (tmp_path / "bad.hpmpack").write_bytes(b"not a pack at all, just some bytes")
+    assert RegistryPack.open(tmp_path / "bad.hpmpack") is None
@@ -0,0 +1,41 @@
+import base64
+
+import pytest
+
+from hyper_package_manager.payload import decode_payload, encode_payload, payload_digest, read_payload, zstandard
+
+FILES = {"pyproject.toml": b"[project]\nname = 'env'\n", "uv.lock": b"version = 1\n" * 100}
+CODECS = ["none", "gzip"] + (["zstd"] if zstandard is not None else [])
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip(codec):
+    data = encode_payload(FILES, codec=codec)
+    assert decode_payload(data) == FILES
+    assert decode_payload(read_payload(base64.b64encode(data))) == FILES
+
+
+def test_encoding_is_deterministic():
+    assert encode_payload(FILES, codec="gzip") == encode_payload(dict(reversed(list(FILES.items()))), codec="gzip")
+    assert payload_digest(FILES) == payload_digest(dict(reversed(list(FILES.items()))))
+    assert payload_digest(FILES) != payload_digest({**FILES, "uv.lock": b""})
+
+
+def test_corruption_is_detected():
+    data = bytearray(encode_payload(FILES, codec="none"))
+    data[-1] ^= 0xFF
+    with pytest.raises(ValueError, match="checksum"):
+        decode_payload(bytes(data))
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_payload(bytes(data[:10]))
+
+
+def test_unexpected_files_are_rejected():
+    with pytest.raises(ValueError, match="Unexpected file"):
+        decode_payload(encode_payload({"setup.py": b"import os"}, codec="none"))
+
+
+def test_bare_lock_files_are_accepted():
+    lock = b'version = 1\n[[package]]\nname = "a"\n'
+    assert decode_payload(read_payload(lock)) == {"uv.lock": lock}
+    assert decode_payload(read_payload(base64.b64encode(lock))) == {"uv.lock": lock}
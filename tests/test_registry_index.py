@@ -0,0 +1,107 @@
+import os
+import json
+from pathlib import Path
+
+import pytest
+
+from hyper_package_manager.core import HPMCore
+from hyper_package_manager.registry_index import RegistryIndex
+
+from conftest import write_yaml
+
+
+def manifest(name: str, **fields) -> dict:
+    return {
+        "name": name, "version": "1.0.0", "entrypoints": {f"{name}-cli": f"{name}:main"},
+        "sources": {"prod": {"type": "local", "path": f"../../{name}"}}, **fields,
+    }
+
+
+def test_index_keeps_headers_and_reads_bodies_on_demand(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    write_yaml(registry / "packages" / "metric-a.yaml", manifest("metric-a"))
+    # Only the header is validated until the body is needed
+    write_yaml(registry / "packages" / "broken.yaml", manifest("broken", sources={"prod": {"url": "https://example.com/broken.git"}}))
+    cache_dir = tmp_path / "index-cache"
+
+    views = RegistryIndex(registry, cache_dir).lazy_manifests()
+    assert views["broken"].entrypoints == {"broken-cli": "broken:main"}
+    with pytest.raises(ValueError, match="broken.yaml"):
+        views["broken"].sources
+    entries = json.loads((cache_dir / "registry-index.json").read_text())["packages"]
+    assert entries["metric-a"]["header"] == {
+        "name": "metric-a", "version": "1.0.0", "description": None, "type": "library",
+        "entrypoints": {"metric-a-cli": "metric-a:main"},
+    }
+
+    # A warm index reads the body from the YAML file
+    view = RegistryIndex(registry, cache_dir).lazy_manifests(["metric-a"])["metric-a"]
+    assert view.version == "1.0.0"
+    assert view.sources.prod.path == "../../metric-a"
+
+
+def test_bodies_of_packed_manifests_come_from_the_pack(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    write_yaml(registry / "packages" / "metric-a.yaml", manifest("metric-a"))
+    write_yaml(registry / "packages" / "metric-b.yaml", manifest("metric-b", dependencies=["numpy>=1.20"]))
+    HPMCore().pack_registry(prune=True)
+    assert not list((registry / "packages").iterdir())
+
+    index = RegistryIndex(registry, tmp_path / "index-cache")
+    views = index.lazy_manifests()
+    assert sorted(views) == ["metric-a", "metric-b"]
+    assert views["metric-b"].entrypoints == {"metric-b-cli": "metric-b:main"}
+    assert views["metric-b"].dependencies == ["numpy>=1.20"]
+    assert index.get("packages", "metric-a").sources.prod.path == "../../metric-a"
+
+
+def test_edit_within_the_same_mtime_is_detected(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    path = registry / "packages" / "metric-a.yaml"
+    write_yaml(path, manifest("metric-a", version="1.0.0"))
+    st = path.stat()
+    assert RegistryIndex(registry, tmp_path / "index-cache").lazy_manifests()["metric-a"].version == "1.0.0"
+
+    # Same size and mtime: only the content hash can tell the files apart
+    write_yaml(path, manifest("metric-a", version="1.0.1"))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert path.stat().st_size == st.st_size
+    assert RegistryIndex(registry, tmp_path / "index-cache").lazy_manifests()["metric-a"].version == "1.0.1"
+
+
+def test_deleted_files_drop_out_of_the_index(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    write_yaml(registry / "packages" / "metric-a.yaml", manifest("metric-a"))
+    write_yaml(registry / "packages" / "metric-b.yaml", manifest("metric-b"))
+    assert sorted(RegistryIndex(registry, tmp_path / "index-cache").all("packages")) == ["metric-a", "metric-b"]
+
+    (registry / "packages" / "metric-b.yaml").unlink()
+    index = RegistryIndex(registry, tmp_path / "index-cache")
+    assert index.get("packages", "metric-b") is None
+    assert list(index.all("packages")) == ["metric-a"]
+    assert list(index.digests("packages")) == ["metric-a"]
+    entries = json.loads((tmp_path / "index-cache" / "registry-index.json").read_text())["packages"]
+    assert list(entries) == ["metric-a"]
+
+
+def test_deleting_a_loose_file_kept_after_packing_removes_the_entry(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    (hpm_project / "metric-c").mkdir()
+    write_yaml(registry / "packages" / "metric-a.yaml", manifest("metric-a"))
+    write_yaml(registry / "packages" / "metric-b.yaml", manifest("metric-b"))
+    HPMCore().pack_registry()
+
+    (registry / "packages" / "metric-b.yaml").unlink()
+    # A rename is a deletion plus a new file
+    (registry / "packages" / "metric-a.yaml").unlink()
+    write_yaml(registry / "packages" / "metric-c.yaml", manifest("metric-c"))
+    index = RegistryIndex(registry, tmp_path / "index-cache")
+    assert list(index.all("packages")) == ["metric-c"]
+    assert list(index.lazy_manifests()) == ["metric-c"]
+    assert index.get("packages", "metric-b") is None
+    assert index.lazy_manifests(["metric-a", "metric-c"]).keys() == {"metric-c"}
+    assert HPMCore().validate_registry() == []
+
+    # Entries whose loose file was pruned stay in the pack
+    HPMCore().pack_registry(prune=True)
+    assert list(RegistryIndex(registry, tmp_path / "index-cache").all("packages")) == ["metric-c"]
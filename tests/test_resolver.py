@@ -0,0 +1,145 @@
+from pathlib import Path
+
+import pytest
+
+from hyper_package_manager.models import HPMDependency, Manifest, ManifestSources
+from hyper_package_manager.resolver import DependencyResolver, ResolutionError, parse_constraint, parse_version, satisfies
+
+
+@pytest.mark.parametrize(
+    "spec, matching, failing",
+    [
+        ("^1.2.3", ["1.2.3", "1.9", "1.99.0"], ["1.2.2", "2.0.0", "0.9"]),
+        ("^1.2", ["1.2", "1.2.0", "1.5.1"], ["1.1.9", "2.0"]),
+        ("^1", ["1.0.0", "1.9.9"], ["0.9.9", "2.0.0"]),
+        # The first non-zero component is the "major" below 1.0
+        ("^0.2.3", ["0.2.3", "0.2.9"], ["0.2.2", "0.3.0", "1.0.0"]),
+        ("^0.2", ["0.2.0", "0.2.5"], ["0.1.9", "0.3"]),
+        ("^0.0.3", ["0.0.3"], ["0.0.2", "0.0.4", "0.1.0"]),
+        ("^0.0", ["0.0.0", "0.0.5"], ["0.1.0"]),
+        ("^0", ["0.0.1", "0.9.9"], ["1.0.0"]),
+    ],
+)
+def test_caret(spec, matching, failing):
+    for version in matching:
+        assert satisfies(version, spec), f"{version} should satisfy {spec}"
+    for version in failing:
+        assert not satisfies(version, spec), f"{version} should not satisfy {spec}"
+
+
+@pytest.mark.parametrize(
+    "spec, matching, failing",
+    [
+        ("~1.2.3", ["1.2.3", "1.2.9"], ["1.2.2", "1.3.0"]),
+        ("~1.2", ["1.2.0", "1.2.7"], ["1.1.9", "1.3"]),
+        ("~1", ["1.0", "1.9.9"], ["0.9", "2.0"]),
+        ("~0.2.1", ["0.2.1", "0.2.5"], ["0.3.0"]),
+        # PEP 440 compatible release bumps the next-to-last component
+        ("~=1.2", ["1.2", "1.9.1"], ["1.1", "2.0"]),
+        ("~=1.2.3", ["1.2.3", "1.2.10"], ["1.3.0", "1.2.2"]),
+    ],
+)
+def test_tilde(spec, matching, failing):
+    for version in matching:
+        assert satisfies(version, spec), f"{version} should satisfy {spec}"
+    for version in failing:
+        assert not satisfies(version, spec), f"{version} should not satisfy {spec}"
+
+
+def test_comparisons_and_wildcards():
+    assert satisfies("1.5", ">=1.2, <2")
+    assert satisfies("1.5", ">=1.2 <2")
+    assert not satisfies("2.0", ">=1.2,<2")
+    assert satisfies("1.0", "==1.0.0") and satisfies("1.0.0", "=1")
+    assert satisfies("1.2.7", "==1.2.*") and not satisfies("1.3.0", "==1.2.*")
+    assert satisfies("1.3.0", "!=1.2.*") and not satisfies("1.2", "!=1.2.*")
+    assert satisfies("1", "1.0.*")
+    assert satisfies("v2.1", ">=2")
+    assert all(satisfies("0.0.1", spec) for spec in ("", "*", "  "))
+
+
+def test_pre_releases():
+    assert parse_version("1.0.0rc1") < parse_version("1.0.0") < parse_version("1.0.1a1")
+    assert parse_version("1.0.0-alpha") == parse_version("1.0alpha")
+    assert satisfies("1.0.0rc1", "<1.0.1") and satisfies("1.0.0rc1", "<=1.0.0")
+    assert not satisfies("1.0.0rc1", ">=1.0.0")
+    assert satisfies("1.3.0b2", "^1.2")
+    assert satisfies("2.0.0rc1", ">=2.0.0rc1")
+    # A pre-release of the excluded upper bound is not in the range
+    assert not satisfies("2.0.0rc1", "^1.2")
+    assert not satisfies("0.3.0a1", "~0.2")
+    assert not satisfies("2.0a1", "<2")
+    assert satisfies("2.0a1", "<2.0b1")
+
+
+def test_post_dev_and_numeric_pre_releases():
+    ordered = ["1.0.dev1", "1.0a1", "1.0b2", "1.0rc2", "1.0rc10", "1.0", "1.0.post1.dev1", "1.0.post1", "1.0.post2", "1.0.1"]
+    keys = [parse_version(v) for v in ordered]
+    assert keys == sorted(keys)
+    assert parse_version("1.0.0-rc.10") == parse_version("1.0rc10")
+    assert parse_version("1.0-post1") == parse_version("1.0.post1")
+    assert parse_version("1.0+local.7") == parse_version("1.0")
+    assert satisfies("1.0.post1", ">=1.0") and not satisfies("1.0.post1", "<1.0")
+    assert satisfies("1.0.post1", "<1.0.1")
+    assert satisfies("1.0rc10", ">=1.0rc2")
+    assert not satisfies("1.0.dev1", "<1.0")
+    with pytest.raises(ValueError):
+        parse_version("1.0-snapshot")
+
+
+def test_unsatisfiable_ranges_match_nothing():
+    for spec in (">=2, <1", ">1.0, <1.0", "^1.2, ^2", "==1.2.*, !=1.2.*", "~1.2, >=1.3"):
+        assert not any(satisfies(v, spec) for v in ("0.1", "1.0", "1.2", "1.2.5", "1.3", "2.0", "2.5")), spec
+
+
+@pytest.mark.parametrize("spec", ["^", "latest", ">=1.0 || <0.5", "~=1", ">=1.*", "^1.*"])
+def test_invalid_constraints(spec):
+    with pytest.raises(ValueError):
+        parse_constraint(spec)
+
+
+def manifest(name, version, *deps):
+    return Manifest(
+        name=name,
+        version=version,
+        sources=ManifestSources(),
+        dependencies=[HPMDependency(name=dep, version=spec) for dep, spec in deps],
+    )
+
+
+def resolver(tmp_path: Path, *manifests):
+    registry = {m.name: m for m in manifests}
+    return DependencyResolver(
+        load=lambda names: {name: registry[name] for name in names if name in registry},
+        digests=lambda: {m.name: m.version for m in manifests},
+        cache_dir=tmp_path,
+    )
+
+
+def test_resolve_orders_dependencies_first(tmp_path: Path):
+    r = resolver(
+        tmp_path,
+        manifest("app", "1.0", ("lib", "^0.2"), ("core", ">=1")),
+        manifest("lib", "0.2.5", ("core", "~1.4")),
+        manifest("core", "1.4.2"),
+    )
+    order = r.resolve([("app", "*")])
+    assert sorted(order) == ["app", "core", "lib"]
+    assert order.index("core") < order.index("lib") < order.index("app")
+    assert (tmp_path / "hpm-deps.json").exists()
+
+
+def test_resolve_rejects_unsatisfiable_and_missing(tmp_path: Path):
+    r = resolver(tmp_path, manifest("app", "1.0", ("lib", "^0.3")), manifest("lib", "0.2.5"))
+    with pytest.raises(ResolutionError, match="app requires lib \\^0.3, registry has 0.2.5"):
+        r.resolve([("app", "*")])
+    with pytest.raises(ResolutionError, match="selection requires app >=2"):
+        r.resolve([("app", ">=2")])
+    with pytest.raises(ResolutionError, match="'missing' \\(required by app\\) not found"):
+        resolver(tmp_path, manifest("app", "1.0", ("missing", "*"))).resolve([("app", "*")])
+
+
+def test_resolve_rejects_cycles(tmp_path: Path):
+    r = resolver(tmp_path, manifest("a", "1.0", ("b", "*")), manifest("b", "1.0", ("a", "^1")))
+    with pytest.raises(ResolutionError, match="Cyclic HPM dependencies: a -> b -> a"):
+        r.resolve([("a", "*")])
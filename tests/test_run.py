@@ -0,0 +1,30 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from hyper_package_manager.core import HPMCore
+from hyper_package_manager.uv_manager import UVManager
+
+from conftest import write_yaml
+
+
+@pytest.mark.parametrize("exec_mode", [False, True], ids=["child", "exec"])
+def test_entrypoint_runs_with_the_venv_activated(hpm_project: Path, monkeypatch, exec_mode: bool):
+    calls = []
+    monkeypatch.setattr(os, "execvpe", lambda file, args, env: calls.append((args, env)))
+    monkeypatch.setattr(UVManager, "run_command", lambda self, command, env=None: calls.append((command, env)))
+    monkeypatch.setenv("PYTHONHOME", "/elsewhere")
+    venv_bin = hpm_project / ".venv" / "bin"
+    venv_bin.mkdir(parents=True)
+    (venv_bin / "serve").write_text("#!/bin/sh\n")
+    write_yaml(hpm_project / "hpm.yaml", {
+        "name": "plugin", "version": "0.1.0", "sources": {}, "entrypoints": {"api": "serve --port 8000"},
+    })
+
+    HPMCore().run_entrypoint(hpm_project / "hpm.yaml", "api", exec_mode=exec_mode)
+    [(command, env)] = calls
+    assert command == [str(venv_bin / "serve"), "--port", "8000"]
+    assert env["VIRTUAL_ENV"] == str(hpm_project / ".venv")
+    assert env["PATH"].split(os.pathsep)[0] == str(venv_bin)
+    assert "PYTHONHOME" not in env
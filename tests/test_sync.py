@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+import tomli_w
+
+from hyper_package_manager.core import HPMCore
+from hyper_package_manager.uv_manager import UVManager
+
+from conftest import configure, write_yaml
+
+
+def test_sync_removes_packages_by_the_name_uv_added(hpm_project: Path, monkeypatch):
+    commands = []
+
+    def run_command(self, command, env=None):
+        # Like uv: unnamed requirements are added under the name the built
+        # distribution declares
+        commands.append(command)
+        if command[1] != "add":
+            return
+        with open(self.project_root / "pyproject.toml", "rb") as f:
+            config = tomllib.load(f)
+        config["project"]["dependencies"].append("metric-a-impl")
+        path = os.path.relpath(command[-1], self.project_root)
+        config["tool"].setdefault("uv", {})["sources"] = {"metric-a-impl": {"path": path}}
+        with open(self.project_root / "pyproject.toml", "wb") as f:
+            tomli_w.dump(config, f)
+
+    monkeypatch.setattr(UVManager, "run_command", run_command)
+    monkeypatch.setattr(HPMCore, "sync_environment", lambda self, frozen=True: None)
+    (hpm_project / "metric-a").mkdir()
+    write_yaml(hpm_project / "registry" / "groups" / "metrics.yaml", {
+        "name": "metrics", "strategy": "M-of-N", "options": [{"name": "metric-a"}],
+    })
+    write_yaml(hpm_project / "registry" / "packages" / "metric-a.yaml", {
+        "name": "metric-a", "version": "1.0.0",
+        "sources": {"prod": {"type": "local", "path": "../../metric-a"}},
+    })
+    configure(hpm_project, groups={"metrics": ["metric-a"]})
+
+    HPMCore().sync()
+    with open(hpm_project / "pyproject.toml", "rb") as f:
+        assert tomllib.load(f)["tool"]["hpm"]["dists"] == {"metric-a": "metric-a-impl"}
+
+    configure(hpm_project, groups={"metrics": []})
+    plan = HPMCore().sync()
+    assert plan.removals == ["metric-a"]
+    assert commands[-1] == ["uv", "remove", "--no-sync", "metric-a-impl"]
+    with open(hpm_project / "pyproject.toml", "rb") as f:
+        assert tomllib.load(f)["tool"]["hpm"]["dists"] == {}
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from hyper_package_manager.pack import PACK_FILE, write_pack
+from hyper_package_manager.sync_state import SyncState
+
+from conftest import write_yaml
+
+GROUPS = {"metrics": ["metric-a"]}
+MANAGED = {"managed": {"metric-a": "/registry/metric-a"}}
+INPUTS = [PACK_FILE, "groups/metrics.yaml", "packages/metric-a.yaml"]
+
+
+@pytest.fixture
+def state(hpm_project: Path) -> SyncState:
+    """A recorded sync of GROUPS/MANAGED over INPUTS, with a uv.lock and a .venv."""
+    registry = hpm_project / "registry"
+    write_yaml(registry / "groups" / "metrics.yaml", {"name": "metrics", "strategy": "M-of-N", "options": [{"name": "metric-a"}]})
+    write_yaml(registry / "packages" / "metric-a.yaml", {"name": "metric-a", "version": "1.0.0", "sources": {}})
+    (hpm_project / "uv.lock").write_text("version = 1\n")
+    (hpm_project / ".venv").mkdir()
+    (hpm_project / ".venv" / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    state = SyncState(hpm_project, registry)
+    state.record(GROUPS, INPUTS, extra=MANAGED)
+    assert state.is_fresh(GROUPS, extra=MANAGED)
+    return state
+
+
+def test_groups_change_invalidates(state: SyncState):
+    assert not state.is_fresh({"metrics": ["metric-a", "metric-b"]}, extra=MANAGED)
+
+
+def test_managed_set_change_invalidates(state: SyncState):
+    assert not state.is_fresh(GROUPS, extra={"managed": {}})
+    assert not state.is_fresh(GROUPS, extra={**MANAGED, "git": {"https://example.com/a.git@main": "0" * 40}})
+
+
+def test_uv_lock_change_invalidates(state: SyncState, hpm_project: Path):
+    (hpm_project / "uv.lock").write_text("version = 1\nrevision = 2\n")
+    assert not state.is_fresh(GROUPS, extra=MANAGED)
+    assert not state.environment_consistent()
+
+
+def test_venv_removal_invalidates(state: SyncState, hpm_project: Path):
+    (hpm_project / ".venv" / "pyvenv.cfg").unlink()
+    assert not state.is_fresh(GROUPS, extra=MANAGED)
+
+
+def test_registry_change_invalidates(state: SyncState, hpm_project: Path):
+    write_yaml(hpm_project / "registry" / "packages" / "metric-a.yaml", {"name": "metric-a", "version": "1.0.1", "sources": {}})
+    assert not state.is_fresh(GROUPS, extra=MANAGED)
+
+
+def test_registry_pack_change_invalidates(state: SyncState, hpm_project: Path):
+    write_pack(hpm_project / "registry" / PACK_FILE, [])
+    assert not state.is_fresh(GROUPS, extra=MANAGED)
+
+
+def test_unrelated_registry_files_do_not_invalidate(state: SyncState, hpm_project: Path):
+    write_yaml(hpm_project / "registry" / "packages" / "metric-b.yaml", {"name": "metric-b", "version": "1.0.0", "sources": {}})
+    assert state.is_fresh(GROUPS, extra=MANAGED)
@@ -0,0 +1,66 @@
+import os
+from pathlib import Path
+
+from hyper_package_manager.validation import RegistryValidator
+
+from conftest import write_yaml
+
+
+def package(name: str, path: str = "../../src") -> dict:
+    return {"name": name, "version": "1.0.0", "sources": {"prod": {"type": "local", "path": path}}}
+
+
+def issues(registry: Path, cache_dir: Path):
+    return [(issue.file, issue.message) for issue in RegistryValidator(registry, cache_dir).validate()]
+
+
+def test_cached_result_is_rechecked_after_an_edit(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    (hpm_project / "src").mkdir()
+    path = registry / "packages" / "metric-a.yaml"
+    write_yaml(path, package("metric-a"))
+    st = path.stat()
+    assert issues(registry, tmp_path / "cache") == []
+    assert (tmp_path / "cache" / "validate.json").exists()
+
+    # Same size and mtime as the cached-valid version
+    write_yaml(path, package("metric-b"))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert issues(registry, tmp_path / "cache") == [
+        ("packages/metric-a.yaml", "Declares name 'metric-b' but the file is named 'metric-a.yaml'"),
+    ]
+
+
+def test_duplicate_normalized_names(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    (hpm_project / "src").mkdir()
+    write_yaml(registry / "packages" / "metric-a.yaml", package("metric-a"))
+    write_yaml(registry / "packages" / "Metric_A.yaml", package("Metric_A"))
+    assert issues(registry, tmp_path / "cache") == [
+        ("packages/Metric_A.yaml", "Duplicate package name 'metric-a' (also in packages/metric-a.yaml)"),
+        ("packages/metric-a.yaml", "Duplicate package name 'metric-a' (also in packages/Metric_A.yaml)"),
+    ]
+
+
+def test_missing_local_paths(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    write_yaml(registry / "packages" / "metric-a.yaml", package("metric-a", path="../../missing"))
+    assert issues(registry, tmp_path / "cache") == [
+        ("packages/metric-a.yaml", "Local 'prod' source path does not exist: ../../missing"),
+    ]
+    # Cross-file checks are recomputed from cached facts
+    (hpm_project / "missing").mkdir()
+    assert issues(registry, tmp_path / "cache") == []
+
+
+def test_include_cycles(hpm_project: Path, tmp_path: Path):
+    registry = hpm_project / "registry"
+    (hpm_project / "src").mkdir()
+    write_yaml(registry / "packages" / "metric-a.yaml", package("metric-a"))
+    write_yaml(registry / "groups" / "base.yaml", {
+        "name": "base", "strategy": "M-of-N", "options": [{"name": "metric-a"}], "includes": [{"group": "suite"}],
+    })
+    write_yaml(registry / "groups" / "suite.yaml", {"name": "suite", "strategy": "M-of-N", "includes": [{"group": "base"}]})
+    found = issues(registry, tmp_path / "cache")
+    assert [file for file, _ in found] == ["groups/base.yaml", "groups/suite.yaml"]
+    assert all(message.startswith("Cyclic group includes: ") for _, message in found)
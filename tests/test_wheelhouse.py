@@ -0,0 +1,98 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from hyper_package_manager.wheelhouse import ENTRY_FILE, PURE_TAG, Wheelhouse, parse_age, parse_size, tree_digest
+
+from conftest import git
+
+
+def make_package(root: Path) -> Path:
+    (root / "pkg").mkdir(parents=True)
+    (root / "pyproject.toml").write_text("[project]\nname = 'pkg'\nversion = '0.1.0'\n")
+    (root / "pkg" / "__init__.py").write_text("VALUE = 1\n")
+    (root / ".gitignore").write_text("*.log\nscratch/\n")
+    (root / "run.log").write_text("first run\n")
+    return root
+
+
+@pytest.mark.parametrize("in_git", [False, True], ids=["walk", "git"])
+def test_tree_digest_ignores_ignored_files_only(tmp_path: Path, in_git: bool):
+    root = make_package(tmp_path / "pkg-src")
+    if in_git:
+        git("init", "-q", cwd=root)
+        git("add", "pyproject.toml", "pkg", ".gitignore", cwd=root)
+    digest = tree_digest(root)
+
+    (root / "run.log").write_text("second run\n")
+    (root / "scratch").mkdir()
+    (root / "scratch" / "notes.txt").write_text("notes\n")
+    (root / "pkg" / "__pycache__").mkdir()
+    (root / "pkg" / "__pycache__" / "x.pyc").write_bytes(b"\0")
+    (root / "build").mkdir()
+    (root / "build" / "lib.py").write_text("stale\n")
+    assert tree_digest(root) == digest
+
+    (root / "pkg" / "__init__.py").write_text("VALUE = 2\n")
+    assert tree_digest(root) != digest
+    (root / "pkg" / "__init__.py").write_text("VALUE = 1\n")
+    assert tree_digest(root) == digest
+    # New (untracked, not ignored) files are part of the source too
+    (root / "pkg" / "extra.py").write_text("")
+    assert tree_digest(root) != digest
+
+
+def test_parse_age_and_size():
+    assert parse_age("90") == 90 and parse_age("90m") == 5400 and parse_age("2w") == 2 * 604800
+    assert parse_size("500") == 500 and parse_size("2K") == 2048 and parse_size("1.5GiB") == 3 << 29
+    for parse, value in ((parse_age, "soon"), (parse_age, "3y"), (parse_size, "big"), (parse_size, "1X")):
+        with pytest.raises(ValueError):
+            parse(value)
+
+
+def test_evict_by_age_then_size(tmp_path: Path):
+    def build(source_dir: Path, out_dir: Path):
+        size = int((source_dir / "size").read_text())
+        (out_dir / f"{source_dir.name}-0.1.0-py3-none-any.whl").write_bytes(b"\0" * size)
+
+    wheelhouse = Wheelhouse(tmp_path / "wheels", build)
+    now = time.time()
+    # name -> (wheel size, hours since last use)
+    for name, (size, hours) in {"old": (100, 48), "big": (3000, 3), "mid": (600, 2), "new": (600, 1)}.items():
+        source = tmp_path / name
+        source.mkdir()
+        (source / "size").write_text(str(size))
+        wheelhouse.put(name, source, name, "cpython-312")
+        used = now - hours * 3600
+        os.utime(tmp_path / "wheels" / Wheelhouse.entry_key(name, PURE_TAG) / ENTRY_FILE, (used, used))
+
+    assert [e.source for e in wheelhouse.entries()] == ["new", "mid", "big", "old"]
+    preview = wheelhouse.evict(max_age=parse_age("1d"), max_size=parse_size("2K"), dry_run=True)
+    assert [e.source for e in preview] == ["old", "big"]
+    assert len(wheelhouse.entries()) == 4
+
+    evicted = wheelhouse.evict(max_age=parse_age("1d"), max_size=parse_size("2K"))
+    assert [e.source for e in evicted] == ["old", "big"]
+    assert [e.source for e in wheelhouse.entries()] == ["new", "mid"]
+    # 1K only holds the most recently used entry
+    assert [e.source for e in wheelhouse.evict(max_size=parse_size("1K"))] == ["mid"]
+    assert [e.source for e in wheelhouse.entries()] == ["new"]
+
+
+@pytest.mark.parametrize("wheel_tag, shared", [("py3-none-any", True), ("py2.py3-none-any", True), ("cp312-cp312-linux_x86_64", False)])
+def test_only_pure_wheels_are_shared_across_interpreters(tmp_path: Path, wheel_tag: str, shared: bool):
+    builds = []
+
+    def build(source_dir: Path, out_dir: Path):
+        builds.append(source_dir)
+        (out_dir / f"pkg-0.1.0-{wheel_tag}.whl").write_bytes(b"wheel")
+
+    wheelhouse = Wheelhouse(tmp_path / "wheels", build)
+    key = Wheelhouse.local_key(make_package(tmp_path / "pkg-src"))
+    wheel = wheelhouse.put(key, tmp_path / "pkg-src", "pkg-src", "cpython-312-x86_64-linux-gnu")
+    assert wheelhouse.get(key, "cpython-312-x86_64-linux-gnu") == wheel
+    assert (wheelhouse.get(key, "cpython-313-aarch64-linux-gnu") == wheel) is shared
+    assert [e.tag for e in wheelhouse.entries()] == [PURE_TAG if shared else "cpython-312-x86_64-linux-gnu"]
+    assert len(builds) == 1